@@ -3,12 +3,31 @@ import sys
 import discord
 from topgg import DBLClient
 from cogs.manage_vcs.renamer import TempChannelRenamer
+from cogs.manage_vcs.reconciler import TempChannelReconciler
+from cogs.manage_vcs.reaper import TempChannelReaper
+from cogs.manage_vcs.warm_pool import SpareChannelPool
+from cogs.manage_vcs.grace import EmptyChannelGrace
+from cogs.manage_vcs.churn import ChurnLimiter
+from cogs.manage_vcs.overwrite_templates import OverwriteTemplates
 from bot.events.ready import on_ready
 from bot.events.guild_join import on_guild_join
+from bot.events.guild_remove import on_guild_remove
+from bot.events.members import on_member_join, on_member_remove
 from bot.events.errors import on_application_command_error
 from bot.events.close import close
+from bot.tasks.scheduler import TaskScheduler
+from bot.counters import GuildCounters
+from bot.http_session import HttpSession
+from bot.metrics import metrics, MetricsServer
+from bot.tracing import Tracer
+from bot.guild_actors import GuildActors
+from bot.rest_scheduler import RestScheduler
+from bot.interaction_outbox import InteractionOutbox
+from cogs.control_vc.profanity import ProfanityFilter
+from cogs.control_vc.state_updater import ChannelStateUpdater
 from database.database import Database
 from database.repositories import Repositories
+from database.maintenance import DatabaseMaintenance
 
 
 class Bot(discord.AutoShardedBot):
@@ -23,9 +42,29 @@ class Bot(discord.AutoShardedBot):
         self.logger = logger
         self.settings = settings
 
+        # Enabled before anything else so the database and services pick it up
+        metrics.enabled = settings.get("metrics", {}).get("enabled", False)
+
         self.db = Database()
         self.repos = Repositories(self.db)
+        self.DatabaseMaintenance = DatabaseMaintenance(self)
         self.TempChannelRenamer = TempChannelRenamer(self)
+        self.TempChannelReconciler = TempChannelReconciler(self)
+        self.TempChannelReaper = TempChannelReaper(self)
+        self.SpareChannelPool = SpareChannelPool(self)
+        self.EmptyChannelGrace = EmptyChannelGrace(self)
+        self.ChurnLimiter = ChurnLimiter(self)
+        self.OverwriteTemplates = OverwriteTemplates(self)
+        self.ChannelStateUpdater = ChannelStateUpdater(self)
+        self.TaskScheduler = TaskScheduler(self)
+        self.GuildActors = GuildActors(self)
+        self.RestScheduler = RestScheduler(self)
+        self.InteractionOutbox = InteractionOutbox(self)
+        self.GuildCounters = GuildCounters(self)
+        self.HttpSession = HttpSession(self)
+        self.ProfanityFilter = ProfanityFilter(self)
+        self.MetricsServer = MetricsServer(self)
+        self.Tracer = Tracer(self)
 
         # Set later in on_ready()
         self.ready = False
@@ -65,5 +104,14 @@ class Bot(discord.AutoShardedBot):
     async def on_guild_join(self, guild):
         await on_guild_join(self, guild)
 
+    async def on_guild_remove(self, guild):
+        await on_guild_remove(self, guild)
+
+    async def on_member_join(self, member):
+        await on_member_join(self, member)
+
+    async def on_member_remove(self, member):
+        await on_member_remove(self, member)
+
     async def on_application_command_error(self, ctx, exception):
         await on_application_command_error(self, ctx, exception)
@@ -0,0 +1,50 @@
+# Running totals of guilds and members the bot can see
+# - Kept up-to-date from guild join/remove and member join/remove events
+# - Periodically resynced from the cache in case an event is missed
+# - Reading them is O(1) so formatting the status or posting to top.gg never walks every guild
+class GuildCounters:
+    def __init__(self, bot):
+        self.bot = bot
+
+        self.guild_count = 0
+        self.member_count = 0
+
+        # guild_id - member count last added for the guild, so a removed guild subtracts what it added
+        self.guild_members = {}
+
+    def resync(self):
+        """
+        Recounts totals from the cache. This is a full pass over every guild so should be run rarely.
+        """
+        guild_members = {guild.id: guild.member_count or 0 for guild in self.bot.guilds}
+        drift = sum(guild_members.values()) - self.member_count
+
+        self.guild_members = guild_members
+        self.guild_count = len(guild_members)
+        self.member_count = sum(guild_members.values())
+        self.bot.logger.debug(f"Resynced counters to {self.guild_count} guilds and {self.member_count} members (drift {drift})")
+
+    def add_guild(self, guild):
+        if guild.id in self.guild_members:
+            return
+        self.guild_members[guild.id] = guild.member_count or 0
+        self.guild_count += 1
+        self.member_count += self.guild_members[guild.id]
+
+    def remove_guild(self, guild):
+        if guild.id not in self.guild_members:
+            return
+        self.guild_count -= 1
+        self.member_count -= self.guild_members.pop(guild.id)
+
+    def add_member(self, member):
+        if member.guild.id not in self.guild_members:
+            return
+        self.guild_members[member.guild.id] += 1
+        self.member_count += 1
+
+    def remove_member(self, member):
+        if member.guild.id not in self.guild_members:
+            return
+        self.guild_members[member.guild.id] -= 1
+        self.member_count -= 1
@@ -4,6 +4,15 @@ import discord
 async def close(bot):
     bot.logger.info(f'Logging out {bot.user}')
 
+    # Stop background tasks so they don't run against a closing connection
+    await bot.TaskScheduler.stop()
+    await bot.SpareChannelPool.close()
+    await bot.EmptyChannelGrace.close()
+    await bot.ChannelStateUpdater.close()
+    await bot.InteractionOutbox.close()
+    await bot.GuildActors.close()
+    bot.repos.lifecycle_journal.flush()
+
     # Update all control messages with a disabled button saying its expired
     for temp_channel_id in bot.repos.temp_channels.get_ids():
         temp_channel = bot.get_channel(temp_channel_id)
@@ -23,3 +32,10 @@ async def close(bot):
                 await control_message.edit(view=view)
 
     await bot.BotLogService.send(event="stop", message=f"Bot {bot.user.mention} stopping.")
+
+    # Send guild log events still waiting in the queue
+    await bot.GuildLogService.close()
+
+    await bot.Tracer.export()
+    await bot.HttpSession.close()
+    await bot.MetricsServer.close()
@@ -3,6 +3,8 @@ import discord
 
 async def on_guild_join(self, guild):
     # This event is triggered when the bot joins a new guild
+    self.GuildCounters.add_guild(guild)
+
     for channel in guild.text_channels:
         if channel.permissions_for(guild.me).send_messages:
             embed = discord.Embed(
@@ -0,0 +1,10 @@
+from bot.guild_purge import purge_guilds
+
+
+async def on_guild_remove(self, guild):
+    # This event is triggered when the bot is removed from a guild, or the guild is deleted
+    self.GuildCounters.remove_guild(guild)
+
+    # Nothing in the guild can be reached anymore, drop its rows and state
+    summary = purge_guilds(self, [guild.id])
+    self.logger.debug(f"Purged data of removed guild {guild.id} {summary}")
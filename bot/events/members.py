@@ -0,0 +1,6 @@
+async def on_member_join(self, member):
+    self.GuildCounters.add_member(member)
+
+
+async def on_member_remove(self, member):
+    self.GuildCounters.remove_member(member)
@@ -1,5 +1,6 @@
 from bot.logging import BotLogService, GuildLogService
 from bot.tasks import background
+from bot.tasks.startup import reconcile_on_startup
 
 
 async def on_ready(bot):
@@ -11,8 +12,13 @@ async def on_ready(bot):
     bot.BotLogService = BotLogService(bot)
     bot.GuildLogService = GuildLogService(bot)
 
+    # Clean up rows orphaned while offline so background tasks don't waste work on them
+    await reconcile_on_startup(bot)
+
     # Start background tasks
     await background.create_tasks(bot)
+    await bot.MetricsServer.start()
+    bot.ready = True
 
     # Login notification
     bot.logger.info(f"Logged in as {bot.user}")
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from bot.metrics import metrics
+
+OPS = metrics.counter("guild_actor_ops_total", "Lifecycle operations run through guild actors, by kind and result")
+WAIT_SECONDS = metrics.histogram("guild_actor_wait_seconds", "Time lifecycle operations waited in their guild's queue, by kind")
+RUN_SECONDS = metrics.histogram("guild_actor_run_seconds", "Time lifecycle operations took to run, by kind")
+
+
+class GuildActor:
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.worker = None  # asyncio.Task() running the queue
+
+
+# - Serializes channel lifecycle operations (create, delete, reap, ownership changes) per guild
+# - Operations for one guild run one at a time in the order they arrived, different guilds run in parallel
+# - Queues are bounded, callers wait for space rather than the queue growing without limit
+# - A guild's worker exits once its queue has been idle for idle_seconds
+# - An operation already running in a guild's actor may call run() for the same guild, it runs inline
+# - Use: result = await bot.GuildActors.run(guild.id, "create", create_on_join, member, before, after, bot)
+class GuildActors:
+    def __init__(self, bot, queue_size=64, idle_seconds=60.0):
+        self.bot = bot
+        self.queue_size = queue_size
+        self.idle_seconds = idle_seconds
+        self.actors = {}  # guild_id - GuildActor()
+
+        metrics.gauge("guild_actors", "Guilds with a running lifecycle actor", func=lambda: len(self.actors))
+        metrics.gauge("guild_actor_queued", "Lifecycle operations waiting in guild queues", func=lambda: sum(actor.queue.qsize() for actor in self.actors.values()))
+
+    async def run(self, guild_id, kind, func, *args, **kwargs):
+        """
+        Runs await func(*args, **kwargs) in the guild's actor and returns its result or raises its exception.
+        kind: short name of the operation for logs and metrics
+        """
+        actor = self.actors.get(guild_id)
+        if actor is not None and actor.worker is asyncio.current_task():
+            return await func(*args, **kwargs)
+
+        if actor is None:
+            actor = self.actors[guild_id] = GuildActor(self.queue_size)
+        if actor.worker is None or actor.worker.done():
+            actor.worker = asyncio.create_task(self._work(guild_id, actor))
+
+        future = asyncio.get_running_loop().create_future()
+        await actor.queue.put((kind, func, args, kwargs, future, time.perf_counter()))
+        return await future
+
+    async def _work(self, guild_id, actor):
+        while True:
+            try:
+                item = await asyncio.wait_for(actor.queue.get(), timeout=self.idle_seconds)
+            except asyncio.TimeoutError:
+                if actor.queue.empty():
+                    if self.actors.get(guild_id) is actor:
+                        self.actors.pop(guild_id)
+                    return
+                continue
+
+            kind, func, args, kwargs, future, queued = item
+            if future.done():  # Caller gave up
+                continue
+
+            start = time.perf_counter()
+            WAIT_SECONDS.observe(start - queued, kind=kind)
+            try:
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                OPS.inc(kind=kind, result="failed")
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                OPS.inc(kind=kind, result="done")
+                if not future.done():
+                    future.set_result(result)
+            RUN_SECONDS.observe(time.perf_counter() - start, kind=kind)
+
+    def forget(self, guild_id):
+        # Cancels the guild's queued operations and its worker, which cancels the running one unless it is the caller
+        actor = self.actors.pop(guild_id, None)
+        if actor is None:
+            return
+        while not actor.queue.empty():
+            *_item, future, _queued = actor.queue.get_nowait()
+            future.cancel()
+        if actor.worker and not actor.worker.done() and actor.worker is not asyncio.current_task():
+            actor.worker.cancel()
+
+    async def close(self):
+        workers = [actor.worker for actor in self.actors.values() if actor.worker and not actor.worker.done()]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.actors.clear()
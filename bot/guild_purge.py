@@ -0,0 +1,79 @@
+import time
+from cogs.manage_vcs.lifecycle import reserved_numbers
+
+
+# Removes everything kept for guilds the bot is no longer in
+# - purge_guilds() deletes their rows from every table and drops their in-memory state from each service
+# - Run from on_guild_remove, and by compact_database() on a schedule for removals missed while offline,
+#   which then has bot.DatabaseMaintenance vacuum and analyze
+# - Use: purge_guilds(bot, [guild.id])
+def purge_guilds(bot, guild_ids):
+    """
+    Returns a dict with counts of what was removed.
+    """
+    guild_ids = list(guild_ids)
+    summary = {"guilds": len(guild_ids), "temp_channels": 0, "creator_channels": 0, "spare_channels": 0}
+    if not guild_ids:
+        return summary
+
+    temp_channel_ids = []
+    creator_ids = []
+    for guild_id in guild_ids:
+        temp_channel_ids.extend(bot.repos.temp_channels.get_ids(guild_id=guild_id))
+        creator_ids.extend(bot.repos.creator_channels.get_ids(guild_id=guild_id))
+    guild_id_set = set(guild_ids)
+    spare_channel_ids = [channel_id for guild_id, channel_id, _creator_id in bot.repos.spare_channels.get_all() if guild_id in guild_id_set]
+    summary["temp_channels"] = len(temp_channel_ids)
+    summary["creator_channels"] = len(creator_ids)
+    summary["spare_channels"] = len(spare_channel_ids)
+
+    bot.repos.temp_channels.remove_guilds(guild_ids)
+    bot.repos.creator_channels.remove_guilds(guild_ids)  # Also drops their overwrite templates
+    bot.repos.spare_channels.remove_guilds(guild_ids)
+    bot.repos.guild_settings.remove_guilds(guild_ids)
+    bot.repos.lifecycle_journal.remove_guilds(guild_ids)
+
+    for channel_id in temp_channel_ids:
+        bot.TempChannelRenamer.forget(channel_id)
+        bot.TempChannelReconciler.forget(channel_id)
+        bot.EmptyChannelGrace.forget(channel_id)
+        bot.ChannelStateUpdater.forget(channel_id)
+    for channel_id in temp_channel_ids + spare_channel_ids:
+        bot.TempChannelReaper.release_lease(channel_id)
+    for creator_id in creator_ids:
+        bot.SpareChannelPool.forget(creator_id)
+        reserved_numbers.pop(creator_id, None)
+
+    for guild_id in guild_ids:
+        bot.ChurnLimiter.forget_guild(guild_id)
+        bot.OverwriteTemplates.invalidate_guild(guild_id)
+        bot.GuildActors.forget(guild_id)
+        bot.RestScheduler.forget_guild(guild_id)
+        bot.Tracer.forget_guild(guild_id)
+        if bot.GuildLogService:
+            bot.GuildLogService.invalidate(guild_id)
+
+    return summary
+
+
+async def compact_database(bot):
+    """
+    Purges guilds that have rows but are no longer in the cache, then vacuums and analyzes the database.
+    Returns a dict with counts of what was done.
+    """
+    start = time.perf_counter()
+    stored_guild_ids = (
+        bot.repos.temp_channels.get_guild_ids()
+        | bot.repos.creator_channels.get_guild_ids()
+        | bot.repos.spare_channels.get_guild_ids()
+        | bot.repos.guild_settings.get_guild_ids()
+    )
+    # Unavailable guilds are still cached, only guilds the bot has left are missing
+    gone_guild_ids = [guild_id for guild_id in stored_guild_ids if guild_id is not None and bot.get_guild(guild_id) is None]
+
+    summary = purge_guilds(bot, gone_guild_ids)
+    summary["purge"] = round(time.perf_counter() - start, 4)
+    summary.update(await bot.DatabaseMaintenance.optimize())
+    summary["duration"] = round(time.perf_counter() - start, 4)
+    bot.logger.info(f"Database compaction completed {summary}")
+    return summary
@@ -0,0 +1,30 @@
+import aiohttp
+
+
+# Shared aiohttp session for calls to external APIs (not Discord)
+# - Connections are pooled and kept alive so each call doesn't open a new TLS connection
+# - Created on first use inside the running loop and closed with the bot
+# - Use: session = bot.HttpSession.get()
+class HttpSession:
+    def __init__(self, bot, limit=20, keepalive_timeout=60.0, timeout=10.0):
+        self.bot = bot
+        self.limit = limit  # Maximum open connections across all hosts
+        self.keepalive_timeout = keepalive_timeout  # Seconds an idle connection is kept open
+        self.timeout = timeout  # Default total timeout of a request, can be overridden per call
+
+        self.session = None
+
+    def get(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self.bot.logger.debug("Created pooled HTTP session")
+        return self.session
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
@@ -0,0 +1,135 @@
+import asyncio
+import discord
+from bot.metrics import metrics
+
+ACK_SECONDS = metrics.histogram("interaction_ack_seconds", "Time from an interaction being created to it being acknowledged")
+OUTBOX = metrics.counter("interaction_outbox_total", "Follow-up work run by the interaction outbox, by kind and result")
+
+
+# - Lets interaction handlers acknowledge first and leave slow follow-up work (embed refreshes, name updates) behind
+# - acknowledge() defers the interaction unless it was already responded to and reports how long that took.
+#   Past ack_budget_seconds it is logged, Discord fails interactions not acknowledged within 3 seconds
+# - run() enforces the budget for the handler's remaining work: it runs inline while the interaction is within
+#   ack_budget_seconds of being created, past it the work is queued and the handler returns straight away
+# - submit() queues follow-up work on a bounded queue ran by a few background workers
+# - Failed work is retried with backoff up to max_attempts, a missing channel or message is not retried
+# - When the queue is full new work is dropped rather than holding up the handler
+# - Settings in settings.json "interaction_outbox"
+# - Use: await acknowledge(bot, interaction, ephemeral=True); await bot.InteractionOutbox.run(interaction, "rename", follow_up)
+#        bot.InteractionOutbox.submit("info_embed", update_info_embed, bot, channel)
+class InteractionOutbox:
+    def __init__(self, bot):
+        self.bot = bot
+        settings = self.bot.settings.get("interaction_outbox", {})
+
+        self.size = settings.get("size", 256)
+        self.worker_count = settings.get("workers", 4)
+        self.max_attempts = settings.get("max_attempts", 3)
+        self.ack_budget = settings.get("ack_budget_seconds", 2.0)
+
+        self.queue = None  # asyncio.Queue() of (kind, func, args, kwargs, attempt), made on first use
+        self.workers = []  # asyncio.Task()
+        self.retries = set()  # asyncio.TimerHandle() of work waiting to be retried
+
+        metrics.gauge("interaction_outbox_queued", "Follow-up work waiting in the interaction outbox", func=lambda: self.queue.qsize() if self.queue else 0)
+
+    async def run(self, interaction, kind, func, *args, **kwargs):
+        """
+        Awaits func(*args, **kwargs) inline if the interaction is still within ack_budget_seconds of being created,
+        otherwise queues it like submit().
+        Returns True if it ran inline.
+        """
+        if interaction_age(interaction) < self.ack_budget:
+            OUTBOX.inc(kind=kind, result="inline")
+            await func(*args, **kwargs)
+            return True
+        self.bot.logger.debug(f"Interaction {interaction.id} is past its ack budget, queued {kind}")
+        self.submit(kind, func, *args, **kwargs)
+        return False
+
+    def submit(self, kind, func, *args, **kwargs):
+        """
+        Queues await func(*args, **kwargs) to run in the background.
+        kind: short name of the work for logs and metrics
+        Returns False if the outbox was full and the work was dropped.
+        """
+        return self._put((kind, func, args, kwargs, 1))
+
+    def _put(self, item):
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.size)
+        self.workers = [worker for worker in self.workers if not worker.done()]
+        while len(self.workers) < self.worker_count:
+            self.workers.append(asyncio.create_task(self._work()))
+
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            OUTBOX.inc(kind=item[0], result="dropped")
+            self.bot.logger.warning(f"Interaction outbox full, dropped {item[0]}")
+            return False
+        return True
+
+    async def _work(self):
+        while True:
+            item = await self.queue.get()
+            kind, func, args, kwargs, attempt = item
+            try:
+                await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                raise
+            except (discord.NotFound, discord.Forbidden) as e:
+                OUTBOX.inc(kind=kind, result="failed")
+                self.bot.logger.debug(f"Interaction outbox {kind} can't be done, handled. {e}")
+            except Exception as e:
+                if attempt >= self.max_attempts:
+                    OUTBOX.inc(kind=kind, result="failed")
+                    self.bot.logger.error(f"Interaction outbox {kind} failed after {attempt} attempts, handled. {e}")
+                else:
+                    OUTBOX.inc(kind=kind, result="retried")
+                    self._retry_later(2 ** attempt, (kind, func, args, kwargs, attempt + 1))
+            else:
+                OUTBOX.inc(kind=kind, result="done")
+            finally:
+                self.queue.task_done()
+
+    def _retry_later(self, delay, item):
+        def retry():
+            self.retries.discard(handle)
+            self._put(item)
+        handle = asyncio.get_running_loop().call_later(delay, retry)
+        self.retries.add(handle)
+
+    async def close(self, timeout=5.0):
+        # Gives queued work a moment to finish, then drops the rest
+        for handle in self.retries:
+            handle.cancel()
+        self.retries.clear()
+        if self.queue is not None:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.bot.logger.warning(f"Interaction outbox closed with {self.queue.qsize()} queued")
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers.clear()
+
+
+def interaction_age(interaction):
+    # Seconds since Discord created the interaction
+    return (discord.utils.utcnow() - interaction.created_at).total_seconds()
+
+
+async def acknowledge(bot, interaction, ephemeral=False):
+    """
+    Defers the interaction unless it was already responded to.
+    """
+    if interaction.response.is_done():
+        return
+    await interaction.response.defer(ephemeral=ephemeral)
+
+    elapsed = interaction_age(interaction)
+    ACK_SECONDS.observe(elapsed)
+    if elapsed > bot.InteractionOutbox.ack_budget:
+        bot.logger.warning(f"Interaction {interaction.id} took {elapsed:.2f}s to acknowledge")
@@ -1,6 +1,19 @@
+import asyncio
+import atexit
+import gzip
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import time
 from datetime import datetime
 from config.paths import LOG_DIR
+from bot.metrics import metrics
+
+LOG_EVENTS = metrics.counter("log_events_total", "Events sent to bot and guild log channels, by service and event")
+LOG_MESSAGES = metrics.counter("log_messages_total", "Discord messages sent by the guild log dispatcher, by result")
 
 
 # Sends Discord messages to log events for the bot itself
@@ -22,43 +35,204 @@ class BotLogService:
             return
 
         await self.channel.send(message, embed=embed)
+        LOG_EVENTS.inc(service="bot", event=event)
 
 
 # Sends Discord messages to log events relevant to a single guild for moderation purposes
 # Channel stored in database
+# - Whether an event is logged is checked from cached settings before callers build anything, see is_enabled()
+# - Events are queued per log channel and sent in the background, packing up to 10 embeds per message
+# - This keeps busy log channels under message rate limits without stalling the caller
 class GuildLogService:
     def __init__(self, bot):
         self.bot = bot
 
+        self.settings_cache = {}  # guild_id - (expiry time, logs_channel_id, enabled_log_events)
+        self.settings_ttl = 300.0  # Also invalidated when the guild's log settings are edited
+
+        self.queues = {}  # log channel_id - [(message, embed)]
+        self.flushers = {}  # log channel_id - asyncio.Task()
+        self.flush_interval = 2.0  # Seconds events are collected before being sent together
+        self.closing = asyncio.Event()  # Set on close, flushers then send what's left without waiting
+
+        metrics.gauge("guild_log_queued", "Guild log events waiting to be sent", func=lambda: sum(len(queue) for queue in self.queues.values()))
+
+    def invalidate(self, guild_id):
+        self.settings_cache.pop(guild_id, None)
+
+    def _get_channel(self, event: str, guild):
+        """
+        Returns the log channel for the event, or None if logging it is disabled.
+        """
+        cached = self.settings_cache.get(guild.id)
+        if cached is None or cached[0] <= time.monotonic():
+            settings = self.bot.repos.guild_settings.get(guild.id)
+            cached = (time.monotonic() + self.settings_ttl, settings["logs_channel_id"], set(settings["enabled_log_events"]))
+            self.settings_cache[guild.id] = cached
+
+        _expiry, logs_channel_id, enabled_log_events = cached
+        # Checks if logging the event is enabled in database.db
+        if not logs_channel_id or event not in enabled_log_events:
+            return None
+        return self.bot.get_channel(logs_channel_id)
+
+    def is_enabled(self, event: str, guild) -> bool:
+        return self._get_channel(event, guild) is not None
+
     async def send(self, event: str, guild, message="", embed=None):
-        settings = self.bot.repos.guild_settings.get(guild.id)
-        channel = self.bot.get_channel(settings["logs_channel_id"])
+        channel = self._get_channel(event, guild)
         if not channel:
             return
 
-        # Checks if logging the event is enabled in database.db
-        if not event in settings["enabled_log_events"]:
+        self.queues.setdefault(channel.id, []).append((message, embed))
+        LOG_EVENTS.inc(service="guild", event=event)
+        if channel.id not in self.flushers or self.flushers[channel.id].done():
+            self.flushers[channel.id] = asyncio.create_task(self._flusher(channel))
+
+    async def _flusher(self, channel):
+        # Sends batches until the channel's queue is empty then exits
+        while self.queues.get(channel.id):
+            if not self.closing.is_set():
+                try:
+                    await asyncio.wait_for(self.closing.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            await self._send_batch(channel)
+        self.queues.pop(channel.id, None)
+        self.flushers.pop(channel.id, None)
+
+    async def _send_batch(self, channel):
+        queue = self.queues.get(channel.id, [])
+
+        # Discord allows 10 embeds, 6000 embed characters and 2000 content characters per message
+        contents = []
+        embeds = []
+        embed_chars = 0
+        while queue:
+            message, embed = queue[0]
+            if embed is not None and (len(embeds) >= 10 or embed_chars + len(embed) > 6000):
+                break
+            if message and len("\n".join(contents + [message])) > 2000:
+                break
+            queue.pop(0)
+            if message:
+                contents.append(message)
+            if embed is not None:
+                embeds.append(embed)
+                embed_chars += len(embed)
+
+        # An oversized entry is sent on its own so it can't block the queue
+        if not contents and not embeds and queue:
+            message, embed = queue.pop(0)
+            contents = [message[:2000]] if message else []
+            embeds = [embed] if embed is not None else []
+
+        if not contents and not embeds:
             return
-
-        await channel.send(message, embed=embed)
+        try:
+            await channel.send("\n".join(contents), embeds=embeds)
+            LOG_MESSAGES.inc(result="sent")
+        except Exception as e:
+            LOG_MESSAGES.inc(result="failed")
+            self.bot.logger.debug(f"Failed to send {len(embeds)} guild log embeds to {channel.id}, dropped. {e}")
+
+    async def close(self):
+        # Wakes the flushers so they send anything still queued, then waits for them to finish
+        self.closing.set()
+        await asyncio.gather(*self.flushers.values(), return_exceptions=True)
+        # Queues whose flusher already died
+        for channel_id in list(self.queues):
+            channel = self.bot.get_channel(channel_id)
+            while channel and self.queues.get(channel_id):
+                await self._send_batch(channel)
+        self.queues.clear()
+        self.flushers.clear()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+    guild_id and channel_id are included when passed with extra={"guild_id": ..., "channel_id": ...}
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in ("guild_id", "channel_id"):
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def log_context(channel):
+    """
+    Returns extra for a log call about a channel, so JSON logs include its guild_id and channel_id.
+    Use: bot.logger.debug("...", extra=log_context(channel))
+    """
+    return {"guild_id": channel.guild.id, "channel_id": channel.id}
+
+
+def _gzip_rotator(source, dest):
+    # Compresses a rotated log file
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def rotating_file_handler(path, log_settings) -> logging.Handler:
+    """
+    Returns a file handler for path that rotates by size (or time if "when" is set) and gzips old files.
+    log_settings: settings.json "logging"
+    """
+    backup_count = log_settings.get("backup_count", 5)
+    if log_settings.get("when"):
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            filename=path, when=log_settings["when"], backupCount=backup_count, encoding='utf-8'
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            filename=path, maxBytes=log_settings.get("max_bytes", 10_000_000), backupCount=backup_count, encoding='utf-8'
+        )
+    if log_settings.get("compress", True):
+        file_handler.namer = lambda name: name + ".gz"
+        file_handler.rotator = _gzip_rotator
+    return file_handler
 
 
 # Creates loggers for debug and info for the program itself
+# - Loggers only put records on a queue, a listener thread does the formatting and writing
+#   so logging never blocks the event loop on disk or console IO
+# - The log file rotates by size (or time if "when" is set) and old files are gzipped
 def setup_program_loggers(settings) -> logging.Logger:
     discord_debug = settings["debug"].get("discord", False)
     bot_debug = settings["debug"].get("bot", False)
+    log_settings = settings.get("logging", {})
 
     # File handler (shared)
-    log_name = datetime.now()
-    log_name = log_name.strftime("%Y-%m-%d-%H-%M-%S")
     LOG_DIR.mkdir(parents=True, exist_ok=True)
-    file_handler = logging.FileHandler(filename=LOG_DIR / f"{log_name}.log", encoding='utf-8', mode='w')
-    file_handler.setFormatter(logging.Formatter('%(asctime)s:%(levelname)s:%(name)s: %(message)s'))
+    file_handler = rotating_file_handler(LOG_DIR / "bot.log", log_settings)
+    if log_settings.get("json", False):
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter('%(asctime)s:%(levelname)s:%(name)s: %(message)s'))
 
     # Console handler (shared)
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(logging.Formatter('%(levelname)s:%(name)s: %(message)s'))
 
+    # Both handlers run on the listener's thread
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flushes anything still queued on exit
+
     # Pycord library logger
     discord_logger = logging.getLogger('discord')
     discord_logger.setLevel(logging.DEBUG if discord_debug else logging.INFO)
@@ -67,11 +241,9 @@ def setup_program_loggers(settings) -> logging.Logger:
     logger = logging.getLogger('bot')
     logger.setLevel(logging.DEBUG if bot_debug else logging.INFO)
 
-    # Attach handlers to the loggers
-    discord_logger.addHandler(file_handler)
-    discord_logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Attach the queue to the loggers
+    discord_logger.addHandler(queue_handler)
+    logger.addHandler(queue_handler)
 
     logger.info("Bot logger initialized")
     logger.debug("Bot logger debug mode active")
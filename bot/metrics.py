@@ -0,0 +1,197 @@
+import math
+import time
+from aiohttp import web
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in items) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, registry, name, help_text):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.values = {}  # label key - value
+
+    def inc(self, amount=1, **labels):
+        if not self.registry.enabled:
+            return
+        key = _label_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, registry, name, help_text, func=None):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.func = func  # Optional callable returning the value, read only when rendered
+        self.values = {}  # label key - value
+
+    def set(self, value, **labels):
+        if not self.registry.enabled:
+            return
+        self.values[_label_key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        if not self.registry.enabled:
+            return
+        key = _label_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        values = dict(self.values)
+        if self.func is not None:
+            values[()] = self.func()
+        for key, value in values.items():
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+    def __init__(self, registry, name, help_text, buckets=None):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets) if buckets else self.default_buckets
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+        self.values = {}  # label key - [bucket counts, sum, count]
+
+    def observe(self, value, **labels):
+        if not self.registry.enabled:
+            return
+        key = _label_key(labels)
+        entry = self.values.get(key)
+        if entry is None:
+            entry = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[0][i] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+        self.start = None
+
+    def __enter__(self):
+        if self.histogram.registry.enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+# Counters, gauges and histograms of bot internals in Prometheus text format
+# - Disabled by default, every update then returns after a single attribute check
+# - Metrics are declared once at import time: QUERIES = metrics.counter("name", "help")
+# - Use: QUERIES.inc(op="select"), with HISTOGRAM.time(stage="x"): ..., GAUGE.set(3)
+class MetricsRegistry:
+    def __init__(self, prefix="robotnic_"):
+        self.prefix = prefix
+        self.enabled = False
+        self.metrics = {}  # name - metric
+
+    def _add(self, metric):
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text):
+        return self._add(Counter(self, self.prefix + name, help_text))
+
+    def gauge(self, name, help_text, func=None):
+        return self._add(Gauge(self, self.prefix + name, help_text, func))
+
+    def histogram(self, name, help_text, buckets=None):
+        return self._add(Histogram(self, self.prefix + name, help_text, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+# Optional local HTTP endpoint serving the registry at /metrics
+# Settings in settings.json "metrics", only started if enabled
+class MetricsServer:
+    def __init__(self, bot):
+        self.bot = bot
+        self.settings = self.bot.settings.get("metrics", {})
+        self.runner = None
+
+    async def start(self):
+        if not self.settings.get("enabled", False) or self.runner is not None:
+            return
+
+        async def handle(request):
+            return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+
+        host = self.settings.get("host", "127.0.0.1")
+        port = self.settings.get("port", 9108)
+        await web.TCPSite(self.runner, host, port).start()
+        self.bot.logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+
+    async def close(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
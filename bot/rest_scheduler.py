@@ -0,0 +1,109 @@
+import asyncio
+import heapq
+import itertools
+from bot.metrics import metrics
+
+GRANTED = metrics.counter("rest_slots_total", "REST slots granted, by priority and whether the caller had to queue")
+WAIT_SECONDS = metrics.histogram("rest_slot_wait_seconds", "Time callers queued for a REST slot, by priority")
+
+# Priorities, lower runs first
+CRITICAL = 0  # Getting a joining user into a channel: create, move
+NORMAL = 1  # Owner actions and deletes: limits, permissions, bans
+COSMETIC = 2  # Can lag without anyone waiting on it: renames, embed refreshes, warm pool upkeep
+
+PRIORITY_NAMES = {CRITICAL: "critical", NORMAL: "normal", COSMETIC: "cosmetic"}
+
+
+class _Slot:
+    def __init__(self, scheduler, guild_id, priority):
+        self.scheduler = scheduler
+        self.guild_id = guild_id
+        self.priority = priority
+
+    async def __aenter__(self):
+        await self.scheduler.acquire(self.guild_id, self.priority)
+
+    async def __aexit__(self, *exc):
+        self.scheduler.release()
+        return False
+
+
+# - Limits how many REST calls from channel management are in flight at once, shared by every guild
+# - When all slots are busy, callers queue by priority, then by weighted fair queuing between guilds.
+#   A guild with a burst of calls queues behind its own earlier calls, not in front of other guilds
+# - Some slots are kept for CRITICAL calls only, so cosmetic work stuck behind a rate limit can't block creations
+# - Guild weights (default 1) in settings.json "rest_scheduler" "guild_weights", higher gets a larger share
+# - Use: async with bot.RestScheduler.slot(guild.id, CRITICAL): await guild.create_voice_channel(...)
+class RestScheduler:
+    def __init__(self, bot):
+        self.bot = bot
+        settings = self.bot.settings.get("rest_scheduler", {})
+
+        self.concurrency = settings.get("concurrency", 8)
+        self.critical_reserved = min(settings.get("critical_reserved", 2), self.concurrency - 1)
+        self.guild_weights = {int(guild_id): weight for guild_id, weight in settings.get("guild_weights", {}).items()}
+
+        self.running = 0
+        self.queues = {priority: [] for priority in PRIORITY_NAMES}  # priority - heap of (finish, seq, future, queued)
+        self.virtual_time = {priority: 0.0 for priority in PRIORITY_NAMES}
+        self.guild_finish = {priority: {} for priority in PRIORITY_NAMES}  # priority - {guild_id: last virtual finish}
+        self.sequence = itertools.count()
+
+        metrics.gauge("rest_slots_running", "REST slots in use", func=lambda: self.running)
+        metrics.gauge("rest_slots_queued", "Callers queued for a REST slot", func=lambda: sum(len(queue) for queue in self.queues.values()))
+
+    def slot(self, guild_id, priority=NORMAL):
+        return _Slot(self, guild_id, priority)
+
+    def forget_guild(self, guild_id):
+        for finish_times in self.guild_finish.values():
+            finish_times.pop(guild_id, None)
+
+    def _limit(self, priority):
+        return self.concurrency if priority == CRITICAL else self.concurrency - self.critical_reserved
+
+    async def acquire(self, guild_id, priority=NORMAL):
+        if self.running < self._limit(priority) and not any(self.queues[p] for p in PRIORITY_NAMES if p <= priority):
+            self.running += 1
+            GRANTED.inc(priority=PRIORITY_NAMES[priority], queued="no")
+            return
+
+        # Virtual finish time, a guild's calls are spaced 1/weight apart so they interleave with other guilds'
+        weight = self.guild_weights.get(guild_id, 1)
+        start = max(self.virtual_time[priority], self.guild_finish[priority].get(guild_id, 0.0))
+        finish = start + 1.0 / weight
+        self.guild_finish[priority][guild_id] = finish
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self.queues[priority], (finish, next(self.sequence), future, loop.time()))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just as the caller was cancelled, hand the slot on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        GRANTED.inc(priority=PRIORITY_NAMES[priority], queued="yes")
+
+    def release(self):
+        self.running -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        loop = asyncio.get_event_loop()
+        for priority in sorted(PRIORITY_NAMES):
+            queue = self.queues[priority]
+            while queue and self.running < self._limit(priority):
+                finish, _seq, future, queued = heapq.heappop(queue)
+                self.virtual_time[priority] = finish
+                if future.cancelled():
+                    continue
+                self.running += 1
+                WAIT_SECONDS.observe(loop.time() - queued, priority=PRIORITY_NAMES[priority])
+                future.set_result(None)
+            if not queue:
+                # Idle, forget finish times so they don't grow forever
+                self.guild_finish[priority].clear()
+            if queue:
+                return
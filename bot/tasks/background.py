@@ -1,100 +1,82 @@
 import discord
-import asyncio
-from cogs.manage_vcs.update_name import update_channel_name_and_control_msg
+from bot import guild_purge
 
 
 async def create_tasks(bot):
-    tasks = []
-    current_module = __import__(__name__)
-
-    # These are the functions in this file that will run periodically in bot.loop
-    functions = [update_temp_channel_names, update_presence, clear_empty_temp_channels]
-    for func in functions:
-        tasks.append(bot.loop.create_task(func(bot)))
-
-    bot.logger.debug(f"Created {len(tasks)} coroutine tasks")
-    return tasks
+    # These are the functions in this file that will run periodically through bot.TaskScheduler
+    scheduler = bot.TaskScheduler
+    scheduler.add("update_temp_channel_names", update_temp_channel_names, interval=90)  # 1.5 minutes
+    scheduler.add("update_presence", update_presence, interval=3600, jitter=0.0)  # 1 hour
+    scheduler.add("clear_empty_temp_channels", clear_empty_temp_channels, interval=300, initial_delay=30)  # 5 minutes
+    scheduler.add("resync_counters", resync_counters, interval=21600, initial_delay=21600)  # 6 hours
+    scheduler.add("export_traces", export_traces, interval=60)  # 1 minute
+    scheduler.add("prune_churn_history", prune_churn_history, interval=600)  # 10 minutes
+    scheduler.add("maintain_spare_channels", maintain_spare_channels, interval=60, initial_delay=60)  # 1 minute
+    scheduler.add("compact_database", compact_database, interval=21600, initial_delay=600)  # 6 hours
+    if bot.DatabaseMaintenance.backups_kept > 0:
+        scheduler.add("backup_database", backup_database, interval=bot.DatabaseMaintenance.backup_interval, initial_delay=300)
+    scheduler.start()
+
+    bot.logger.debug(f"Created {len(scheduler.tasks)} scheduled tasks")
+    return list(scheduler.tasks.values())
 
 
 # Technically shouldn't be required as manage_vcs.update_name.update_channel_name_and_control_msg is run every time a user leaves a vc
-# This is here in case of desync. Hopefully can be removed once the bot is tested properly
+# This is here in case of desync. Only channels whose name, control message or members drifted are acted on
 async def update_temp_channel_names(bot):
-    await bot.wait_until_ready()  # Ensure the bot is fully connected
-    while not bot.is_closed():  # Run on a schedule
-        try:
-            bot.logger.debug(f"Updating all temp channel names on schedule")
-            temp_channel_ids = bot.repos.temp_channels.get_ids()
-            await update_channel_name_and_control_msg(bot, temp_channel_ids)
-        except Exception as e:
-            bot.logger.error(f"Error in {__name__} task: {e}")
-        await asyncio.sleep(90)  # 1.5 minutes (90 seconds)
+    bot.logger.debug(f"Reconciling temp channel names on schedule")
+    await bot.TempChannelReconciler.run()
 
 
 async def update_presence(bot):
-    await bot.wait_until_ready()  # Ensure the bot is fully connected
-    while not bot.is_closed():  # Run on a schedule
-        try:
-            status_text = bot.settings["status"].get("text", "")
+    status_text = bot.settings["status"].get("text", "")
 
-            # Create variables if needed
-            server_count = len(bot.guilds)  # Always needed as used in top.gg post
-            if "{member_count}" in status_text:
-                member_count = 0
-                for guild in bot.guilds:
-                    member_count += guild.member_count
+    # Counters are kept up-to-date by events so reading them is cheap
+    server_count = bot.GuildCounters.guild_count  # Always needed as used in top.gg post
+    member_count = bot.GuildCounters.member_count
 
-            # Formate from settings
-            status = status_text.format(**locals())
-            await bot.change_presence(activity=discord.Game(status))
-            bot.logger.debug(f"Updated presence to \'{status}\'")
+    # Formate from settings
+    status = status_text.format(server_count=server_count, member_count=member_count)
+    await bot.change_presence(activity=discord.Game(status))
+    bot.logger.debug(f"Updated presence to \'{status}\'")
 
-            # Post guild count to TopGG
-            if bot.topgg_client:
-                await bot.topgg_client.post_guild_count()
-                bot.logger.debug(f"Posted Guild Count to TOPGG; {server_count}")
+    # Post guild count to TopGG
+    if bot.topgg_client:
+        await bot.topgg_client.post_guild_count(guild_count=server_count, shard_count=bot.shard_count)
+        bot.logger.debug(f"Posted Guild Count to TOPGG; {server_count}")
 
-        except Exception as e:
-            bot.logger.error(f"Error in {__name__} task: {e}")
 
-        await asyncio.sleep(3600)  # 1 hour (3600 seconds)
+# Emptiness comes from cached voice states, channels still being created hold a lease and are skipped
+async def clear_empty_temp_channels(bot):
+    bot.logger.debug("Clearing empty temp channels...")
+    await bot.TempChannelReaper.run()
 
 
-# Known bug that if this triggers while a user is creating a temp channel and is yet to be moved, this may delete the channel and cause an error
-async def clear_empty_temp_channels(bot):
-    await bot.wait_until_ready()  # Ensure the bot is fully connected
-    while not bot.is_closed():  # Run on a schedule
-        try:
-            bot.logger.debug("Clearing empty temp channels...")
-
-            temp_channel_ids = bot.repos.temp_channels.get_ids()
-            # creator_channel_ids = bot.db.get_creator_channel_ids()
-
-            # Cleanup deleted creator channels
-            # for channel_id in creator_channel_ids:
-            #     channel = bot.get_channel(channel_id)
-            #     if channel is None:
-            #         bot.logger.debug(f"Removing unfound/deleted creator channel from database")
-            #         bot.db.remove_creator_channel(channel_id)
-
-            # Clean up empty temp channels
-            for channel_id in temp_channel_ids:
-                channel = bot.get_channel(channel_id)
-                if channel is None:
-                    bot.logger.debug(f"Removing unfound/deleted temp channel from database")
-                    bot.repos.temp_channels.remove(channel_id)
-                    continue
-
-                # Having member intent should mean this is not needed
-                if not channel.guild.chunked:  # Only chunk if not already done
-                    bot.logger.debug(f"Fetching all members for guild {channel.guild.name} to populate cache")
-                    await channel.guild.chunk()
-
-                if len(channel.members) == 0:
-                    bot.logger.debug(f"Deleting empty temp channel \'{channel.name}\'")
-                    await channel.delete()
-                    bot.repos.temp_channels.remove(channel.id)
-
-        except Exception as e:
-            bot.logger.error(f"Error in {__name__} task: {e}")
-
-        await asyncio.sleep(300)  # 5 minutes (300 seconds)
+# Exact recount in case a member or guild event was missed
+async def resync_counters(bot):
+    bot.GuildCounters.resync()
+
+
+# Appends finished traces to logs/traces.jsonl, does nothing if tracing is off
+async def export_traces(bot):
+    await bot.Tracer.export()
+
+
+# Tops up warm pools of active creators and reaps spares of idle ones
+async def maintain_spare_channels(bot):
+    await bot.SpareChannelPool.run()
+
+
+# Forgets churn limiter history of users who stopped creating channels
+async def prune_churn_history(bot):
+    bot.ChurnLimiter.prune()
+
+
+# Purges data of guilds the bot has left while offline or missed, then vacuums and analyzes the database
+async def compact_database(bot):
+    await guild_purge.compact_database(bot)
+
+
+# Online backup to backups/, copied a few pages at a time in a thread, older backups are rotated out
+async def backup_database(bot):
+    await bot.DatabaseMaintenance.backup()
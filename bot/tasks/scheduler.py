@@ -0,0 +1,129 @@
+import asyncio
+import random
+import time
+from bot.metrics import metrics
+
+TASK_SECONDS = metrics.histogram(
+    "task_run_seconds", "Time taken by each run of a scheduled task",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0),
+)
+TASK_EVENTS = metrics.counter("task_events_total", "Scheduled task failures, skipped runs and restarts")
+
+
+class PeriodicTask:
+    def __init__(self, name, func, interval, jitter, initial_delay, min_backoff, max_backoff):
+        self.name = name
+        self.func = func  # async func(bot) run once per interval
+        self.interval = interval
+        self.jitter = jitter  # Fraction of the interval to randomly add or remove each run
+        self.initial_delay = initial_delay
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        self.loop_task = None  # Supervising asyncio.Task()
+        self.run_task = None  # asyncio.Task() of the current run
+
+        self.runs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.skipped = 0
+        self.restarts = 0
+        self.last_duration = None
+
+    def next_delay(self):
+        # After a failure the task is restarted sooner, backing off while it keeps failing
+        if self.consecutive_failures:
+            backoff = self.min_backoff * 2 ** (self.consecutive_failures - 1)
+            return min(backoff, self.max_backoff, self.interval)
+        return self.interval + random.uniform(-self.jitter, self.jitter) * self.interval
+
+
+# - Runs async functions periodically in bot.loop
+# - Each task has its own interval and jitter so tasks don't all fire together
+# - If a run is still going when the next is due, the next is skipped rather than stacked
+# - Failed runs are logged with a traceback and retried with exponential backoff
+# - Run durations are observed in the task_run_seconds metrics histogram, labelled by task
+# - Use: bot.TaskScheduler.add("name", func, interval=60) then bot.TaskScheduler.start()
+class TaskScheduler:
+    def __init__(self, bot):
+        self.bot = bot
+        self.tasks = {}  # name - PeriodicTask()
+
+    def add(self, name, func, interval, jitter=0.1, initial_delay=0.0, min_backoff=5.0, max_backoff=300.0):
+        self.tasks[name] = PeriodicTask(name, func, interval, jitter, initial_delay, min_backoff, max_backoff)
+        return self.tasks[name]
+
+    def start(self):
+        for task in self.tasks.values():
+            if task.loop_task is None or task.loop_task.done():
+                task.loop_task = self.bot.loop.create_task(self._supervise(task))
+        self.bot.logger.debug(f"Scheduled {len(self.tasks)} periodic tasks")
+
+    async def stop(self):
+        pending = []
+        for task in self.tasks.values():
+            for asyncio_task in (task.loop_task, task.run_task):
+                if asyncio_task and not asyncio_task.done():
+                    asyncio_task.cancel()
+                    pending.append(asyncio_task)
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self):
+        return {
+            name: {
+                "runs": task.runs,
+                "failures": task.failures,
+                "skipped": task.skipped,
+                "restarts": task.restarts,
+                "last_duration": task.last_duration,
+            }
+            for name, task in self.tasks.items()
+        }
+
+    async def _supervise(self, task):
+        # Restarts the ticking loop if it ever dies unexpectedly
+        while not self.bot.is_closed():
+            try:
+                await self._tick(task)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                task.restarts += 1
+                TASK_EVENTS.inc(task=task.name, event="restarted")
+                delay = min(task.min_backoff * 2 ** (task.restarts - 1), task.max_backoff)
+                self.bot.logger.exception(f"[SCHEDULER] Task {task.name} loop died. Restarting in {delay:.1f} seconds.")
+                await asyncio.sleep(delay)
+
+    async def _tick(self, task):
+        await self.bot.wait_until_ready()  # Ensure the bot is fully connected
+        await asyncio.sleep(task.initial_delay)
+        while not self.bot.is_closed():
+            started = time.monotonic()
+            if task.run_task and not task.run_task.done():
+                task.skipped += 1
+                TASK_EVENTS.inc(task=task.name, event="skipped")
+                self.bot.logger.warning(f"[SCHEDULER] Task {task.name} is still running, skipping this run.")
+            else:
+                task.run_task = asyncio.create_task(self._run(task))
+                # Wait for quick runs so a failure's backoff applies to the next delay
+                await asyncio.wait({task.run_task}, timeout=task.interval)
+            await asyncio.sleep(max(0.0, task.next_delay() - (time.monotonic() - started)))
+
+    async def _run(self, task):
+        start = time.perf_counter()
+        try:
+            await task.func(self.bot)
+            task.consecutive_failures = 0
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            task.failures += 1
+            task.consecutive_failures += 1
+            TASK_EVENTS.inc(task=task.name, event="failed")
+            self.bot.logger.exception(f"[SCHEDULER] Task {task.name} failed ({task.consecutive_failures} in a row).")
+        finally:
+            task.runs += 1
+            task.last_duration = time.perf_counter() - start
+            TASK_SECONDS.observe(task.last_duration, task=task.name)
+            self.bot.logger.debug(f"[SCHEDULER] Task {task.name} ran in {task.last_duration:.4f} seconds.")
@@ -0,0 +1,178 @@
+import time
+from cogs.control_vc.views.control_view import ControlView
+from database.lifecycle_journal_repo import ADDED
+
+# A channel found by planned name must have been created this soon before its journal entry or later
+JOURNAL_CLOCK_SKEW = 5.0
+
+
+async def send_missing_control_message(bot, channel, owner):
+    """
+    Sends the control message unless the bot already has a message at the top of the channel.
+    Returns True if it was sent.
+    """
+    async for message in channel.history(limit=10, oldest_first=True):
+        if message.author.id == bot.user.id:
+            return False
+    await ControlView(bot, channel).send_initial_message(owner)
+    return True
+
+
+async def recover_lifecycle_journal(bot, summary):
+    """
+    Finishes or undoes temp channel creations that were cut off by the last shutdown or crash.
+    - Created and tracked but maybe missing its control message: the control message is sent
+    - Created but never tracked, found by id (spares) or by planned name, category and time:
+      adopted as a temp channel of the journaled creator and owner if someone is in it, otherwise deleted
+    Entries for guilds that are unavailable, or whose orphan could not be deleted, are kept for the next startup.
+    The rest are cleared in one transaction.
+    """
+    tracked_ids = set(bot.repos.temp_channels.get_ids())
+    spare_ids = {channel_id for _guild_id, channel_id, _creator_id in bot.repos.spare_channels.get_all()}
+    done_ids = []
+    orphans_by_guild = {}  # guild_id - [channel]
+    orphan_ops = {}  # op_id - [channel_id] that must be deleted before the entry is cleared
+
+    for op_id, guild_id, creator_id, member_id, channel_id, step, planned_name, category_id, started in bot.repos.lifecycle_journal.get_all():
+        summary["journal_entries"] += 1
+        guild = bot.get_guild(guild_id)
+        if guild is not None and guild.unavailable:
+            continue
+        if guild is None:
+            done_ids.append(op_id)
+            continue
+
+        if step == ADDED and channel_id in tracked_ids:
+            done_ids.append(op_id)
+            channel = guild.get_channel(channel_id)
+            if channel is None or not channel.voice_states:  # Removed by the rest of startup reconciliation
+                continue
+            try:
+                owner = guild.get_member(member_id) or channel.members[0]
+                if await send_missing_control_message(bot, channel, owner):
+                    summary["journal_completed"] += 1
+            except Exception as e:
+                bot.logger.debug(f"Failed to complete journaled creation of {channel_id}, handled. {e}")
+            continue
+
+        # Never tracked, the channel is an orphan if it was created at all
+        if channel_id is not None:
+            candidates = [guild.get_channel(channel_id)]
+        else:
+            candidates = [
+                channel for channel in guild.voice_channels
+                if channel.name == planned_name and channel.category_id == category_id
+                and channel.created_at.timestamp() >= started - JOURNAL_CLOCK_SKEW
+            ]
+        orphan_ops[op_id] = []
+        for channel in candidates:
+            if channel is None or channel.id in tracked_ids or channel.id in spare_ids:
+                continue
+
+            # Someone is in it, most likely the member who was moved in, so it is kept as their temp channel
+            if channel.voice_states:
+                members = channel.members
+                owner = guild.get_member(member_id)
+                owner = owner if owner in members else members[0]
+                number = max(bot.repos.temp_channels.get_counts(creator_id), default=0) + 1
+                bot.repos.temp_channels.add(guild_id, channel.id, creator_id, owner.id, 0, number, False)
+                tracked_ids.add(channel.id)
+                summary["journal_adopted"] += 1
+                try:
+                    await send_missing_control_message(bot, channel, owner)
+                except Exception as e:
+                    bot.logger.debug(f"Failed to send control message in adopted channel {channel.id}, handled. {e}")
+                continue
+
+            orphans_by_guild.setdefault(guild_id, []).append(channel)
+            orphan_ops[op_id].append(channel.id)
+
+    deleted_ids = set()
+    results = await bot.TempChannelReaper.delete_channels(orphans_by_guild, deleted_ids)
+    summary["journal_rolled_back"] = results["deleted"]
+
+    # Entries whose orphan survived (failed, or someone joined meanwhile) are retried on the next startup
+    done_ids.extend(op_id for op_id, channel_ids in orphan_ops.items() if deleted_ids.issuperset(channel_ids))
+    bot.repos.lifecycle_journal.remove_many(done_ids)
+
+
+# Run once in on_ready before background tasks start
+# - Creations left in the lifecycle journal are completed or rolled back first
+# - Diffs every creator and temp channel row against the gateway cache in bulk
+# - Rows of deleted channels or guilds the bot has left are purged in one transaction each
+# - Empty temp channels are deleted through the reaper with bounded concurrency
+# - Derived in-memory state is then rebuilt from the cleaned database
+async def reconcile_on_startup(bot):
+    start = time.perf_counter()
+    summary = {
+        "temp_rows": 0,
+        "creator_rows": 0,
+        "left_guild": 0,
+        "missing_channel": 0,
+        "empty_deleted": 0,
+        "empty_failed": 0,
+        "unavailable_guild": 0,
+        "spare_missing": 0,
+        "journal_entries": 0,
+        "journal_completed": 0,
+        "journal_adopted": 0,
+        "journal_rolled_back": 0,
+    }
+
+    # Creations cut off by the last shutdown are finished or undone before the tables are diffed
+    await recover_lifecycle_journal(bot, summary)
+
+    # Temp channels
+    purge_ids = []
+    empty_by_guild = {}  # guild_id - [channel]
+    for guild_id, channel_id in bot.repos.temp_channels.get_guild_channel_ids():
+        summary["temp_rows"] += 1
+        guild = bot.get_guild(guild_id)
+        if guild is None:
+            summary["left_guild"] += 1
+            purge_ids.append(channel_id)
+            continue
+        if guild.unavailable:  # Channels aren't cached, leave for the reaper
+            summary["unavailable_guild"] += 1
+            continue
+
+        channel = guild.get_channel(channel_id)
+        if channel is None:
+            summary["missing_channel"] += 1
+            purge_ids.append(channel_id)
+            continue
+
+        if not channel.voice_states:
+            empty_by_guild.setdefault(guild_id, []).append(channel)
+
+    bot.repos.temp_channels.remove_many(purge_ids)
+
+    # Creator channels
+    purge_ids = []
+    for guild_id, channel_id in bot.repos.creator_channels.get_guild_channel_ids():
+        summary["creator_rows"] += 1
+        guild = bot.get_guild(guild_id)
+        if guild is None:
+            summary["left_guild"] += 1
+            purge_ids.append(channel_id)
+        elif not guild.unavailable and guild.get_channel(channel_id) is None:
+            summary["missing_channel"] += 1
+            purge_ids.append(channel_id)
+
+    bot.repos.creator_channels.remove_many(purge_ids)
+
+    results = await bot.TempChannelReaper.delete_channels(empty_by_guild)
+    summary["empty_deleted"] = results["deleted"]
+    summary["empty_failed"] = results["failed"]
+
+    # Spare channels left from the last run are kept and reused
+    summary["spare_missing"] = bot.SpareChannelPool.load()
+
+    # Rebuild derived state from the cleaned database
+    bot.repos.temp_channels.fix_count()
+    bot.TempChannelReconciler.snapshots.clear()
+    bot.GuildCounters.resync()
+
+    summary["duration"] = round(time.perf_counter() - start, 4)
+    bot.logger.info(f"Startup reconciliation completed {summary}")
+    return summary
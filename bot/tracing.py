@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import deque
+from config.paths import LOG_DIR
+from bot.logging import rotating_file_handler
+from bot.metrics import metrics
+
+STAGE_SECONDS = metrics.histogram("trace_stage_seconds", "Time taken by each traced stage, by trace kind and stage")
+LATENCY_SECONDS = metrics.histogram("trace_latency_seconds", "Time from the start of a trace to a marked point, by trace kind and mark")
+
+
+class Span:
+    __slots__ = ("name", "start", "end", "error")
+
+    def __init__(self, name, start):
+        self.name = name
+        self.start = start  # Seconds since the trace started
+        self.end = None
+        self.error = None
+
+    @property
+    def duration(self):
+        return self.end - self.start if self.end is not None else None
+
+
+class _SpanContext:
+    __slots__ = ("trace", "span")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.span = Span(name, time.perf_counter() - trace.started)
+
+    def __enter__(self):
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.end = time.perf_counter() - self.trace.started
+        if exc_type is not None:
+            self.span.error = exc_type.__name__
+        self.trace.spans.append(self.span)
+        return False
+
+
+class Trace:
+    sampled = True
+
+    def __init__(self, kind, guild_id, started=None):
+        self.kind = kind
+        self.guild_id = guild_id
+        self.started = started if started is not None else time.perf_counter()
+        self.wall_time = time.time()
+        self.spans = []
+        self.marks = {}  # name - seconds since the trace started
+
+    def span(self, name):
+        return _SpanContext(self, name)
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter() - self.started
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "guild_id": self.guild_id,
+            "time": self.wall_time,
+            "marks": {name: round(seconds, 6) for name, seconds in self.marks.items()},
+            "spans": [
+                {"name": span.name, "start": round(span.start, 6), "duration": round(span.duration, 6), "error": span.error}
+                for span in self.spans
+            ],
+        }
+
+
+class _NullSpanContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _NullTrace:
+    # Stands in for unsampled traces so callers never need to check
+    sampled = False
+    _span = _NullSpanContext()
+
+    def span(self, name):
+        return self._span
+
+    def mark(self, name):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+# Span based tracing of multistep operations, eg. creating a temp channel
+# - Sampled per guild, settings in settings.json "tracing". Unsampled traces are a shared no-op object
+# - Finished traces are kept in memory for /trace and appended to logs/traces.jsonl by a scheduled task,
+#   which rotates and compresses like logs/bot.log (settings.json "logging")
+# - Use: trace = bot.Tracer.start("create_on_join", guild)
+#        with trace.span("create_voice_channel"): ...
+#        trace.mark("moved")
+#        bot.Tracer.finish(trace)
+class Tracer:
+    def __init__(self, bot):
+        self.bot = bot
+        self.settings = self.bot.settings.get("tracing", {})
+
+        self.sample_rate = self.settings.get("sample_rate", 0.0)
+        # guild_id - sample rate, overrides sample_rate for those guilds
+        self.guild_sample_rates = {int(guild_id): rate for guild_id, rate in self.settings.get("guild_sample_rates", {}).items()}
+
+        max_traces = self.settings.get("max_traces", 500)
+        self.traces = deque(maxlen=max_traces)  # Finished traces, newest last
+        self.unexported = deque(maxlen=max_traces)  # Finished traces not yet written to file
+
+        self.export_path = LOG_DIR / "traces.jsonl"
+        self.export_logger = None  # logging.Logger() writing to export_path, made on first export
+
+    def start(self, kind, guild, started=None):
+        """
+        Returns a new Trace() if this guild is sampled, otherwise NULL_TRACE.
+        started: perf_counter() time the operation really began, eg. when the event arrived.
+        """
+        rate = self.guild_sample_rates.get(guild.id, self.sample_rate)
+        if rate <= 0.0 or (rate < 1.0 and random.random() >= rate):
+            return NULL_TRACE
+        return Trace(kind, guild.id, started)
+
+    def finish(self, trace):
+        if not trace.sampled:
+            return
+        self.traces.append(trace)
+        self.unexported.append(trace)
+        for span in trace.spans:
+            STAGE_SECONDS.observe(span.duration, kind=trace.kind, stage=span.name)
+        for name, seconds in trace.marks.items():
+            LATENCY_SECONDS.observe(seconds, kind=trace.kind, mark=name)
+
+    def forget_guild(self, guild_id):
+        for traces in (self.traces, self.unexported):
+            kept = [trace for trace in traces if trace.guild_id != guild_id]
+            traces.clear()
+            traces.extend(kept)
+
+    def distributions(self, kind, guild_id=None):
+        """
+        Returns {name: {"count", "p50", "p95", "max"}} of every mark and span of recent traces.
+        Marks are prefixed with "to_" so they sort apart from stages.
+        """
+        samples = {}  # name - [seconds]
+        for trace in self.traces:
+            if trace.kind != kind or (guild_id is not None and trace.guild_id != guild_id):
+                continue
+            for name, seconds in trace.marks.items():
+                samples.setdefault(f"to_{name}", []).append(seconds)
+            for span in trace.spans:
+                samples.setdefault(span.name, []).append(span.duration)
+
+        result = {}
+        for name, values in samples.items():
+            values.sort()
+            result[name] = {
+                "count": len(values),
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+                "max": values[-1],
+            }
+        return result
+
+    async def export(self):
+        """
+        Appends traces finished since the last export to logs/traces.jsonl, one JSON object per line.
+        The file is rotated by the same handler settings as logs/bot.log so it can't grow without bound.
+        """
+        if not self.unexported:
+            return 0
+        lines = [json.dumps(trace.to_dict()) for trace in self.unexported]
+        self.unexported.clear()
+
+        def write():
+            if self.export_logger is None:
+                self.export_path.parent.mkdir(parents=True, exist_ok=True)
+                file_handler = rotating_file_handler(self.export_path, self.bot.settings.get("logging", {}))
+                file_handler.setFormatter(logging.Formatter("%(message)s"))
+                self.export_logger = logging.getLogger("bot.traces")
+                self.export_logger.propagate = False  # Kept out of logs/bot.log and the console
+                self.export_logger.setLevel(logging.INFO)
+                self.export_logger.addHandler(file_handler)
+            for line in lines:
+                self.export_logger.info(line)
+
+        await asyncio.to_thread(write)
+        return len(lines)
@@ -1,13 +1,49 @@
+import hashlib
+import json
 from cogs.control_vc.embeds import ChannelInfoEmbed
+from bot.rest_scheduler import COSMETIC
 
 
-async def update_info_embed(bot, channel, title=None, user_limit=None):
+def embed_fingerprint(embed):
+    """
+    Returns a short stable hash of an embed's visible content.
+    Built from the same fields whether the embed was made locally or read back from a message.
+    """
+    payload = {
+        "title": embed.title,
+        "description": embed.description,
+        "color": embed.colour.value if embed.colour else None,
+        "footer": embed.footer.text if embed.footer else None,
+        "fields": [(field.name, field.value, field.inline) for field in embed.fields],
+    }
+    return hashlib.sha1(json.dumps(payload, default=str).encode("utf-8")).hexdigest()
+
+
+async def update_info_embed(bot, channel, title=None, user_limit=None, embed=None):
+    """
+    Edits the info embed of the channel's control message, unless it already shows the same content.
+    Returns True if the message was edited.
+    """
+    # A prebuilt info embed may be passed in if it was already made for something else
+    if embed is None:
+        embed = ChannelInfoEmbed(bot, channel, title, user_limit)
+
     control_message = None
     async for message in channel.history(limit=1, oldest_first=True):
         control_message = message
     if control_message is None:
         print("Failed to find control message")
-        return
+        return False
     embeds = control_message.embeds
-    embeds[1] = ChannelInfoEmbed(bot, channel, title, user_limit)
-    await control_message.edit(embeds=embeds)
+
+    # Already showing it, eg. the first reconcile after a restart
+    edited = False
+    if embed_fingerprint(embeds[1]) != embed_fingerprint(embed):
+        embeds[1] = embed
+        async with bot.RestScheduler.slot(channel.guild.id, COSMETIC):
+            await control_message.edit(embeds=embeds)
+        edited = True
+
+    # Lets the reconciler know the control message is up-to-date
+    bot.TempChannelReconciler.record_embed(channel.id, embed)
+    return edited
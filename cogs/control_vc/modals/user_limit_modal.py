@@ -1,5 +1,7 @@
 import discord
 from cogs.control_vc.embed_updates import update_info_embed
+from cogs.manage_vcs.desired_state import reconcile_channel
+from bot.interaction_outbox import acknowledge
 
 
 class UserLimitModal(discord.ui.Modal):
@@ -19,27 +21,32 @@ class UserLimitModal(discord.ui.Modal):
         self.add_item(self.user_limit)
 
     async def callback(self, interaction: discord.Interaction):
-        user_limit = self.user_limit.value or str(self.channel.user_limit)
+        await acknowledge(self.bot, interaction, ephemeral=True)
+
+        # Runs inline within the interaction's ack budget, otherwise it is queued on the outbox
+        async def follow_up():
+            user_limit = self.user_limit.value or str(self.channel.user_limit)
+
+            if not user_limit.isnumeric():
+                embed = discord.Embed(
+                    title="Invalid Input",
+                    description="User limit must be a number.",
+                    color=discord.Color.red()
+                )
+                embed.set_footer(text="This message will disappear in 15 seconds.")
+                await interaction.followup.send(embed=embed, ephemeral=True, delete_after=15)
+                return
+
+            # Update the channel user limit, nothing is sent if it is unchanged
+            if await reconcile_channel(self.bot, self.channel, user_limit=int(user_limit)):
+                self.bot.InteractionOutbox.submit("info_embed", update_info_embed, self.bot, self.channel, user_limit=user_limit)  # Only required if limit is displayed in info embed. hardcoded on/off atm
 
-        if not user_limit.isnumeric():
             embed = discord.Embed(
-                title="Invalid Input",
-                description="User limit must be a number.",
-                color=discord.Color.red()
+                title="Changes Saved",
+                description=f"Channel limit changed to {user_limit}",
+                color=discord.Color.blue()
             )
             embed.set_footer(text="This message will disappear in 15 seconds.")
-            await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=15)
-            return
-
-        # Update the channel user limit
-        if user_limit != self.channel.user_limit:
-            await self.channel.edit(user_limit=int(user_limit))
-        await update_info_embed(self.bot, self.channel, user_limit=user_limit)  # Only required if limit is displayed in info embed. hardcoded on/off atm
-
-        embed = discord.Embed(
-            title="Changes Saved",
-            description=f"Channel limit changed to {user_limit}",
-            color=discord.Color.blue()
-        )
-        embed.set_footer(text="This message will disappear in 15 seconds.")
-        await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=15)
+            await interaction.followup.send(embed=embed, ephemeral=True, delete_after=15)
+
+        await self.bot.InteractionOutbox.run(interaction, "user_limit", follow_up)
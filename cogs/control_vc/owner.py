@@ -14,12 +14,16 @@ async def is_owner(view, interaction):
     owner_id = view.bot.repos.temp_channels.get_info(interaction.channel.id).owner_id
 
     # If owner isn't connected. Make interacting user owner and update info embed
+    # The check and set have no await between them so the claim is already atomic, it isn't queued in the guild's
+    # actor as that could hold it behind creations and miss the interaction's 3 second deadline
     if owner_id is None or owner_id not in connected_user_ids:
         view.bot.repos.temp_channels.set_owner_id(interaction.channel.id, interaction.user.id)
-        await update_info_embed(view.bot, interaction.channel)
+        owner_id = interaction.user.id
+        # In the background, the callback still has to respond to the interaction
+        view.bot.InteractionOutbox.submit("info_embed", update_info_embed, view.bot, interaction.channel)
 
     # If owner is connected and isn't interacting user return false
-    elif owner_id != interaction.user.id:
+    if owner_id != interaction.user.id:
         view.bot.logger.debug(f"User ({interaction.user}) interacted with control message that they don't own.")
         await interaction.response.send_message(f"You do not own this temporary channel {interaction.user.mention}!", ephemeral=True, delete_after=15)
         return False
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections import OrderedDict
+import aiohttp
+from cogs.control_vc.profanity_matcher import ProfanityMatcher, Verdict, normalize
+from bot.metrics import metrics
+
+PROFANITY_CHECKS = metrics.counter("profanity_checks_total", "Profanity checks, by where the verdict came from")
+
+PROFANITY_API_URL = "https://vector.profanity.dev"
+
+
+async def check_profanity(bot, text: str, timeout: float = 3.0) -> dict | None:
+    """
+    Asks the remote profanity API about text using the bot's pooled HTTP session.
+    Returns the API's response, or None if it failed or took longer than timeout seconds.
+    """
+    session = bot.HttpSession.get()
+    try:
+        async with session.post(
+            PROFANITY_API_URL,
+            json={"message": text},
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        bot.logger.warning(f"Profanity API failed, skipping check. {e!r}")
+        return None
+
+
+class VerdictCache:
+    """
+    Bounded LRU cache of remote verdicts keyed by normalized name. Entries expire after ttl seconds.
+    """
+
+    def __init__(self, max_size=5000, ttl=3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key - (expires, result)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.entries.pop(key, None)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def put(self, key, result):
+        self.entries[key] = (time.monotonic() + self.ttl, dict(result))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CircuitBreaker:
+    """
+    Stops calling the remote API after repeated failures.
+    - closed: calls go through
+    - open: calls are skipped until reset_timeout has passed
+    - half_open: one trial call is let through, success closes and failure re-opens
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, logger, failure_threshold=3, reset_timeout=60.0):
+        self.logger = logger
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self):
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self.logger.info("Profanity API circuit half open, trying one request")
+            return True
+        return self.state == self.CLOSED
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            self.logger.info("Profanity API circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.logger.warning(f"Profanity API circuit open for {self.reset_timeout} seconds after {self.failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+# Checks channel names for profanity
+# - Unambiguous profanity is blocked locally by ProfanityMatcher in microseconds
+# - Every other name is sent to the remote API, which judges it in context
+# - Remote verdicts are cached by normalized name, and a circuit breaker skips the API while it is failing
+# - When the API can't be asked, fail_closed decides whether a name the matcher was unsure about is blocked,
+#   names with no listed word in them are let through
+# - Use: result = await bot.ProfanityFilter.check(name), result["isProfanity"] is always set
+class ProfanityFilter:
+    def __init__(self, bot):
+        self.bot = bot
+        self.matcher = ProfanityMatcher()
+        self.cache = VerdictCache()
+        self.breaker = CircuitBreaker(bot.logger)
+
+        metrics.gauge("profanity_cache_hit_rate", "Hit rate of the remote profanity verdict cache", func=lambda: self.cache.hit_rate)
+        metrics.gauge("profanity_breaker_open", "1 if the profanity API circuit breaker is not closed", func=lambda: int(self.breaker.state != CircuitBreaker.CLOSED))
+
+    async def check(self, text: str, fail_closed: bool = False) -> dict:
+        verdict, word = self.matcher.check(text)
+        if verdict == Verdict.PROFANE:
+            return {"isProfanity": True, "flaggedFor": word, "source": "local"}
+
+        key = normalize(text)
+        result = self.cache.get(key)
+        if result is not None:
+            result["source"] = "cache"
+            return result
+
+        result = None
+        if self.breaker.allow():
+            self.bot.logger.debug(f"Asking remote API about '{text}' (matcher {verdict.name}, contains '{word}')")
+            # Recorded in finally so an unexpected error or a cancelled caller still resolves a half open trial,
+            # otherwise the breaker would stay half open with its trial taken and never allow another call
+            succeeded = False
+            try:
+                result = await check_profanity(self.bot, text)
+                succeeded = result is not None and "isProfanity" in result
+            finally:
+                if succeeded:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure()
+            if not succeeded:
+                result = None
+
+        if result is None:
+            if fail_closed and verdict == Verdict.UNSURE:
+                return {"isProfanity": True, "flaggedFor": f"{word} (profanity service unavailable)", "source": "failed"}
+            return {"isProfanity": False, "source": "failed"}
+
+        self.cache.put(key, result)
+        result["source"] = "remote"
+        return result
+
+    def stats(self):
+        return {
+            "cache_hit_rate": round(self.cache.hit_rate, 4),
+            "cache_size": len(self.cache.entries),
+            "breaker_state": self.breaker.state,
+            "breaker_failures": self.breaker.failures,
+        }
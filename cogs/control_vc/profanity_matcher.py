@@ -0,0 +1,171 @@
+import unicodedata
+from collections import deque
+from enum import Enum
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# Characters commonly swapped in for letters to dodge filters
+LEET_MAP = str.maketrans({
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g",
+    "@": "a", "$": "s", "!": "i", "|": "i", "+": "t", "€": "e", "¡": "i",
+})
+
+# Letters from other scripts that look identical to latin ones and survive NFKD
+CONFUSABLES_MAP = str.maketrans({
+    "а": "a", "в": "b", "е": "e", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p",
+    "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ѕ": "s", "ј": "j",
+    "α": "a", "β": "b", "ε": "e", "ι": "i", "κ": "k", "ν": "v", "ο": "o", "ρ": "p", "τ": "t", "υ": "u", "χ": "x",
+})
+
+
+class Verdict(Enum):
+    CLEAN = 0  # No listed word found, the remote API still decides
+    PROFANE = 1  # Certainly profane, no remote check needed
+    UNSURE = 2  # Listed word found that may be innocent in context, the remote API decides
+
+
+def normalize(text):
+    """
+    Folds text to lowercase latin letters and digits separated by single spaces.
+    Handles fancy unicode letters, accents, homoglyphs and leetspeak.
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = text.casefold().translate(CONFUSABLES_MAP).translate(LEET_MAP)
+    text = "".join(char if char.isalnum() else " " for char in text)
+    return " ".join(text.split())
+
+
+def collapse(text):
+    # Squashes repeated letters so "fuuuck" and "fuck" look the same
+    return "".join(char for i, char in enumerate(text) if i == 0 or char != text[i - 1])
+
+
+def load_words(filename):
+    words = set()
+    with open(DATA_DIR / filename, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                words.add(normalize(line).replace(" ", ""))
+    return words
+
+
+class AhoCorasick:
+    """
+    Multi-pattern automaton. Finds every occurrence of every pattern in a single pass over the text.
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]  # state - {char: state}
+        self.fail = [0]
+        self.output = [()]  # state - patterns ending at this state
+
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state] += (pattern,)
+
+        # Breadth first to set failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] += self.output[self.fail[next_state]]
+
+    def search(self, text):
+        """
+        Yields (start, end, pattern) for every match, end is exclusive.
+        """
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for pattern in self.output[state]:
+                yield i - len(pattern) + 1, i + 1, pattern
+
+
+class ProfanityMatcher:
+    """
+    Fast pre-filter that blocks unambiguous profanity locally, everything else is left to the remote API.
+    - A whole word (after normalizing) that is listed is PROFANE
+    - Single letters spelling out a listed word ("f u c k") are PROFANE
+    - An ambiguous word, innocent in some names ("Dick's room", "Nazi Zombies"), is UNSURE even as a whole word
+    - A listed word hidden inside other text ("class", "pen is") is UNSURE
+    - Anything else is CLEAN
+    """
+
+    def __init__(self, words=None, allowed=None, ambiguous=None):
+        self.ambiguous = ambiguous if ambiguous is not None else load_words("profanity_ambiguous.txt")
+        # Ambiguous words are still searched for, they just never decide a name locally
+        self.words = (words if words is not None else load_words("profanity_words.txt")) | self.ambiguous
+        self.allowed = allowed if allowed is not None else load_words("profanity_allowed.txt")
+
+        # pattern - listed word. Stretched forms are only searched for when long enough to not be
+        # inside everyday words, "ass" squashes to "as"
+        self.patterns = {word: word for word in self.words}
+        self.collapsed_words = {}
+        for word in self.words:
+            self.collapsed_words[collapse(word)] = word
+            if len(collapse(word)) >= 4:
+                self.patterns.setdefault(collapse(word), word)
+        self.automaton = AhoCorasick(self.patterns)
+
+    def check(self, text):
+        """
+        Returns (Verdict, matched word or None).
+        """
+        tokens = [token for token in normalize(text).split(" ") if token and token not in self.allowed]
+
+        # Whole words, including stretched ones like "fuuuck"
+        unsure = None
+        for token in tokens:
+            word = None
+            if token in self.words:
+                word = token
+            else:
+                collapsed = collapse(token)
+                if collapsed != token and collapsed in self.collapsed_words:
+                    word = self.collapsed_words[collapsed]
+            if word in self.ambiguous:
+                unsure = unsure or word
+            elif word is not None:
+                return Verdict.PROFANE, word
+
+        # Words split up or hidden inside other text
+        # Offsets of token boundaries in the joined text so spelt out words can be recognised
+        joined = ""
+        boundaries = {0: 0}  # offset - index of the token starting there
+        for i, token in enumerate(tokens):
+            joined += token
+            boundaries[len(joined)] = i + 1
+
+        for start, end, pattern in self.automaton.search(joined):
+            if start in boundaries and end in boundaries and self.patterns[pattern] not in self.ambiguous:
+                spanned = tokens[boundaries[start]:boundaries[end]]
+                if len(spanned) > 1 and all(len(token) <= 2 for token in spanned):
+                    return Verdict.PROFANE, self.patterns[pattern]
+            unsure = unsure or self.patterns[pattern]
+
+        # Stretched words hidden inside other text
+        if not unsure:
+            for _start, _end, pattern in self.automaton.search(collapse(joined)):
+                unsure = self.patterns[pattern]
+                break
+
+        if unsure:
+            return Verdict.UNSURE, unsure
+        return Verdict.CLEAN, None
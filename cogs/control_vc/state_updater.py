@@ -0,0 +1,71 @@
+import asyncio
+import discord
+from cogs.control_vc.enums import ChannelState
+from cogs.control_vc.views.control_view import update_overwrites
+from bot.metrics import metrics
+
+STATE_CHANGES = metrics.counter("channel_state_changes_total", "Lock/hide/public changes, by whether they were requested or applied")
+
+# Default role overwrite for each channel state
+STATE_PERMISSIONS = {
+    ChannelState.PUBLIC.value: {"view_channel": True, "connect": True},
+    ChannelState.LOCKED.value: {"view_channel": True, "connect": False},
+    ChannelState.HIDDEN.value: {"view_channel": False, "connect": False},
+}
+
+
+# - Coalesces lock/hide/public changes per channel, a burst of clicks applies only the last state chosen
+# - The state is saved straight away, the overwrite and control message are updated once the clicks settle
+# - Only one worker per channel, clicks while it is applying are picked up when it finishes
+# - Use: await bot.ChannelStateUpdater.change(view, channel, ChannelState.LOCKED.value)
+class ChannelStateUpdater:
+    def __init__(self, bot):
+        self.bot = bot
+
+        self.pending_state = {}  # channel_id - (ControlView(), state value) to apply next
+        self.workers = {}  # channel_id - asyncio.Task()
+
+        # Clicks closer together than this are applied as one change
+        self.settle_seconds = 1.0
+
+        metrics.gauge("channel_state_pending", "Channels with a state change waiting to be applied", func=lambda: len(self.pending_state))
+
+    async def change(self, view, channel, state_value):
+        self.bot.repos.temp_channels.change_state(channel.id, state_value)
+        STATE_CHANGES.inc(stage="requested")
+
+        self.pending_state[channel.id] = (view, state_value)
+        if channel.id not in self.workers or self.workers[channel.id].done():
+            self.workers[channel.id] = asyncio.create_task(self._worker(channel))
+
+    async def _worker(self, channel):
+        try:
+            while channel.id in self.pending_state:
+                await asyncio.sleep(self.settle_seconds)
+                view, state_value = self.pending_state.pop(channel.id)
+
+                try:
+                    await update_overwrites(self.bot, channel, discord.PermissionOverwrite(**STATE_PERMISSIONS[state_value]))
+                    await view.recreate_items()
+                    STATE_CHANGES.inc(stage="applied")
+                except discord.NotFound:
+                    # Channel deleted while the change was waiting
+                    self.pending_state.pop(channel.id, None)
+                except Exception as e:
+                    self.bot.logger.error(f"Failed to apply state of channel {channel.id}, handled. {e}")
+        finally:
+            self.workers.pop(channel.id, None)
+
+    def forget(self, channel_id):
+        worker = self.workers.pop(channel_id, None)
+        if worker and not worker.done():
+            worker.cancel()
+        self.pending_state.pop(channel_id, None)
+
+    async def close(self):
+        # States are already saved, only the overwrites and control messages are left as they were
+        tasks = list(self.workers.values())
+        for task in tasks:
+            task.cancel()
+        self.pending_state.clear()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,4 +1,7 @@
 import discord
+from bot.rest_scheduler import NORMAL
+from cogs.manage_vcs.desired_state import reconcile_channel
+from bot.interaction_outbox import acknowledge
 
 
 class BanUserView(discord.ui.View):
@@ -14,40 +17,52 @@ class BanUserView(discord.ui.View):
         max_values=25
     )
     async def ban_select_callback(self, select, interaction: discord.Interaction):
-        ban_perms = {
-            "connect": False,
-            "view_channel": False
-        }
-
-        owner_id = self.bot.repos.temp_channels.get_info(self.channel.id).owner_id
-        connected_members = self.channel.members
-        affected = []
-
-        for target in select.values:
-            if not target:
-                continue
-
-            if isinstance(target, discord.Member) and target.id == owner_id:
-                continue
-
-            await self.channel.set_permissions(target, **ban_perms)
-            affected.append(target)
-
-            if isinstance(target, discord.Member) and target in connected_members:
-                await target.move_to(None)
-
-        if affected:
-            embed = discord.Embed(
-                title="Banned!",
-                description=f"Banned {len(affected)} member(s)/role(s) from your channel.",
-                color=0x00FF00
-            )
-            embed.set_footer(text="This message will disappear in 10 seconds.")
-            await interaction.response.send_message(
-                embed=embed,
-                ephemeral=True,
-                delete_after=10
-            )
+        await acknowledge(self.bot, interaction, ephemeral=True)
+
+        # Runs inline within the interaction's ack budget, otherwise it is queued on the outbox
+        async def follow_up():
+            ban_perms = {
+                "connect": False,
+                "view_channel": False
+            }
+
+            owner_id = self.bot.repos.temp_channels.get_info(self.channel.id).owner_id
+            connected_members = self.channel.members
+            affected = []
+
+            for target in select.values:
+                if not target:
+                    continue
+
+                if isinstance(target, discord.Member) and target.id == owner_id:
+                    continue
+
+                affected.append(target)
+
+            # All bans go out as one change to the channel's overwrites
+            await reconcile_channel(self.bot, self.channel, overwrite_updates={
+                target: discord.PermissionOverwrite(**ban_perms) for target in affected
+            })
+
+            for target in affected:
+                if isinstance(target, discord.Member) and target in connected_members:
+                    async with self.bot.RestScheduler.slot(self.channel.guild.id, NORMAL):
+                        await target.move_to(None)
+
+            if affected:
+                embed = discord.Embed(
+                    title="Banned!",
+                    description=f"Banned {len(affected)} member(s)/role(s) from your channel.",
+                    color=0x00FF00
+                )
+                embed.set_footer(text="This message will disappear in 10 seconds.")
+                await interaction.followup.send(
+                    embed=embed,
+                    ephemeral=True,
+                    delete_after=10
+                )
+
+        await self.bot.InteractionOutbox.run(interaction, "ban", follow_up)
 
     # ---- ALLOW SELECT ----
     @discord.ui.mentionable_select(
@@ -56,32 +71,41 @@ class BanUserView(discord.ui.View):
         max_values=25
     )
     async def allow_select_callback(self, select, interaction: discord.Interaction):
-        allow_perms = {
-            "connect": True,
-            "view_channel": True
-        }
-
-        affected = []
-
-        for target in select.values:
-            if not target:
-                continue
-
-            await self.channel.set_permissions(target, **allow_perms)
-            affected.append(target)
-
-        if affected:
-            embed = discord.Embed(
-                title="Allowed!",
-                description=f"Allowed {len(affected)} member(s)/role(s) in your channel.",
-                color=0x00FF00
-            )
-            embed.set_footer(text="This message will disappear in 10 seconds.")
-            await interaction.response.send_message(
-                embed=embed,
-                ephemeral=True,
-                delete_after=10
-            )
+        await acknowledge(self.bot, interaction, ephemeral=True)
+
+        # Runs inline within the interaction's ack budget, otherwise it is queued on the outbox
+        async def follow_up():
+            allow_perms = {
+                "connect": True,
+                "view_channel": True
+            }
+
+            affected = []
+
+            for target in select.values:
+                if not target:
+                    continue
+
+                affected.append(target)
+
+            await reconcile_channel(self.bot, self.channel, overwrite_updates={
+                target: discord.PermissionOverwrite(**allow_perms) for target in affected
+            })
+
+            if affected:
+                embed = discord.Embed(
+                    title="Allowed!",
+                    description=f"Allowed {len(affected)} member(s)/role(s) in your channel.",
+                    color=0x00FF00
+                )
+                embed.set_footer(text="This message will disappear in 10 seconds.")
+                await interaction.followup.send(
+                    embed=embed,
+                    ephemeral=True,
+                    delete_after=10
+                )
+
+        await self.bot.InteractionOutbox.run(interaction, "allow", follow_up)
 
     async def send_initial_message(self, interaction: discord.Interaction):
         embed = discord.Embed(
@@ -8,20 +8,18 @@ from cogs.control_vc.modals.user_limit_modal import UserLimitModal
 from cogs.control_vc.modals.change_name_modal import ChangeNameModal
 from cogs.control_vc.views.give_ownership import GiveOwnershipView
 from cogs.control_vc.views.ban_user import BanUserView
+from bot.rest_scheduler import NORMAL, COSMETIC
+from cogs.manage_vcs.desired_state import reconcile_channel
+from bot.interaction_outbox import acknowledge
 
 
 async def update_overwrites(bot, channel, new_overwrite):
-    # Gets the default_role_id as stored by the creator channel db
+    # The default role comes from the creator's cached overwrite template
     creator_id = bot.repos.temp_channels.get_info(channel.id).creator_id
-    default_role_id = bot.repos.creator_channels.get_info(creator_id).default_role_id
-    if default_role_id is None:
-        default_role = channel.guild.default_role
-    else:
-        default_role = channel.guild.get_role(default_role_id)
+    default_role = bot.OverwriteTemplates.default_role(creator_id, channel.guild)
 
-    overwrites = channel.overwrites
-    overwrites[default_role] = new_overwrite
-    await channel.edit(overwrites=overwrites)
+    # Only the default role's overwrite is sent, and nothing if it already matches
+    await reconcile_channel(bot, channel, overwrite_updates={default_role: new_overwrite})
 
 
 class ControlView(View):
@@ -45,7 +43,8 @@ class ControlView(View):
 
         is_mention_owner = self.bot.repos.guild_settings.get(self.temp_channel.guild.id)["mention_owner_bool"]
 
-        self.control_message = await self.temp_channel.send(embeds=embeds, view=self)
+        async with self.bot.RestScheduler.slot(self.temp_channel.guild.id, NORMAL):
+            self.control_message = await self.temp_channel.send(embeds=embeds, view=self)
 
         if is_mention_owner:
             await self.temp_channel.send(f"{owner_member.mention}, this is *your* vc. Use the message above to control it.", delete_after=1)
@@ -252,7 +251,8 @@ class ControlView(View):
                 self.add_item(StateDropdown())
 
     async def update_view(self):
-        await self.control_message.edit(view=self, embeds=self.control_message.embeds)
+        async with self.bot.RestScheduler.slot(self.temp_channel.guild.id, COSMETIC):
+            await self.control_message.edit(view=self, embeds=self.control_message.embeds)
 
     async def recreate_items(self):
         self.clear_items()
@@ -277,29 +277,17 @@ class ControlView(View):
 
     # --- Callbacks ---
     async def public_button_callback(self, interaction: discord.Interaction):
-        self.bot.repos.temp_channels.change_state(interaction.channel.id, ChannelState.PUBLIC.value)
-
-        new_overwrite = discord.PermissionOverwrite(view_channel=True, connect=True)
-        await update_overwrites(self.bot, interaction.channel, new_overwrite)
-        await self.recreate_items()
-        # Acknowledge without sending a message
-        await interaction.response.defer()
+        # Acknowledge without sending a message before anything else, the change is applied in the background
+        await acknowledge(self.bot, interaction)
+        await self.bot.ChannelStateUpdater.change(self, interaction.channel, ChannelState.PUBLIC.value)
 
     async def lock_button_callback(self, interaction: discord.Interaction):
-        self.bot.repos.temp_channels.change_state(interaction.channel.id, ChannelState.LOCKED.value)
-
-        new_overwrite = discord.PermissionOverwrite(view_channel=True, connect=False)
-        await update_overwrites(self.bot, interaction.channel, new_overwrite)
-        await self.recreate_items()
-        await interaction.response.defer()
+        await acknowledge(self.bot, interaction)
+        await self.bot.ChannelStateUpdater.change(self, interaction.channel, ChannelState.LOCKED.value)
 
     async def hide_button_callback(self, interaction: discord.Interaction):
-        self.bot.repos.temp_channels.change_state(interaction.channel.id, ChannelState.HIDDEN.value)
-
-        new_overwrite = discord.PermissionOverwrite(view_channel=False, connect=False)
-        await update_overwrites(self.bot, interaction.channel, new_overwrite)
-        await self.recreate_items()
-        await interaction.response.defer()
+        await acknowledge(self.bot, interaction)
+        await self.bot.ChannelStateUpdater.change(self, interaction.channel, ChannelState.HIDDEN.value)
 
     async def name_button_callback(self, interaction: discord.Interaction):
         if not await is_owner(self, interaction):
@@ -316,37 +304,41 @@ class ControlView(View):
     async def clear_button_callback(self, interaction: discord.Interaction):
         if not await is_owner(self, interaction):
             return
-        await interaction.response.defer(ephemeral=True)
-
-        excluded_message_ids = []
-        if interaction.message:
-            excluded_message_ids.append(interaction.message.id)
-
-        # Fetch messages from the channel
-        messages_to_delete = []
-        async for message in interaction.channel.history(limit=None):
-            if message.id not in excluded_message_ids:
-                messages_to_delete.append(message)
-
-        # Bulk delete the filtered messages
-        if messages_to_delete:
-            try:
-                await interaction.channel.delete_messages(messages_to_delete)
-            except Exception as e:
-                await interaction.followup.send(f"Failed, {e}", ephemeral=True, delete_after=15)
+        await acknowledge(self.bot, interaction, ephemeral=True)
+
+        # Runs inline within the interaction's ack budget, otherwise it is queued on the outbox
+        async def follow_up():
+            excluded_message_ids = []
+            if interaction.message:
+                excluded_message_ids.append(interaction.message.id)
+
+            # Fetch messages from the channel
+            messages_to_delete = []
+            async for message in interaction.channel.history(limit=None):
+                if message.id not in excluded_message_ids:
+                    messages_to_delete.append(message)
+
+            # Bulk delete the filtered messages
+            if messages_to_delete:
+                try:
+                    await interaction.channel.delete_messages(messages_to_delete)
+                except Exception as e:
+                    await interaction.followup.send(f"Failed, {e}", ephemeral=True, delete_after=15)
+
+            embed = discord.Embed(
+                title="Messages Deleted",
+                description=f"Deleted `{len(messages_to_delete)}` messages.",
+                color=discord.Color.red()
+            )
+            embed.set_footer(text="This message will disappear in 15 seconds.")
+            await interaction.followup.send(embed=embed, ephemeral=True, delete_after=15)
 
-        embed = discord.Embed(
-            title="Messages Deleted",
-            description=f"Deleted `{len(messages_to_delete)}` messages.",
-            color=discord.Color.red()
-        )
-        embed.set_footer(text="This message will disappear in 15 seconds.")
-        await interaction.followup.send(embed=embed, ephemeral=True, delete_after=15)
+        await self.bot.InteractionOutbox.run(interaction, "clear", follow_up)
 
     async def delete_button_callback(self, interaction: discord.Interaction):
         if not await is_owner(self, interaction):
             return
-        await interaction.response.defer(ephemeral=True)
+        await acknowledge(self.bot, interaction, ephemeral=True)
 
         # Ask for confirmation
         embed = discord.Embed(
@@ -366,18 +358,23 @@ class ControlView(View):
             confirmation_message = await self.bot.wait_for("message", check=check, timeout=60)
 
             # Delete the channel from the database and then delete the channel
-            try:
-                await interaction.channel.delete()
-            except discord.NotFound as e:
-                self.bot.logger.debug(f"Channel not found removing temp channel, handled. {e}")
-            except discord.Forbidden as e:
-                self.bot.logger.debug(f"Permission error removing temp channel, handled by sending a message notifying of lack of perms. {e}")
-                await interaction.channel.send(f"Sorry {interaction.user.mention}, I do not have permission to delete this channel.", delete_after=300)
-                return
-            except Exception as e:
-                self.bot.logger.error(f"Unknown error removing temp channel, handled. {e}")
-
-            self.bot.repos.temp_channels.remove(interaction.channel.id)
+            # Run in the guild's actor so it can't overlap the reaper or a leave deleting the same channel
+            async def delete():
+                try:
+                    async with self.bot.RestScheduler.slot(interaction.guild.id, NORMAL):
+                        await interaction.channel.delete()
+                except discord.NotFound as e:
+                    self.bot.logger.debug(f"Channel not found removing temp channel, handled. {e}")
+                except discord.Forbidden as e:
+                    self.bot.logger.debug(f"Permission error removing temp channel, handled by sending a message notifying of lack of perms. {e}")
+                    await interaction.channel.send(f"Sorry {interaction.user.mention}, I do not have permission to delete this channel.", delete_after=300)
+                    return
+                except Exception as e:
+                    self.bot.logger.error(f"Unknown error removing temp channel, handled. {e}")
+
+                self.bot.repos.temp_channels.remove(interaction.channel.id)
+
+            await self.bot.GuildActors.run(interaction.guild.id, "delete", delete)
         except asyncio.TimeoutError:
             try:
                 # If the user does not respond in time, send a timeout message
@@ -394,14 +391,14 @@ class ControlView(View):
     async def give_button_callback(self, interaction: discord.Interaction):
         if not await is_owner(self, interaction):
             return
-        await interaction.response.defer(ephemeral=True)
+        await acknowledge(self.bot, interaction, ephemeral=True)
 
         await GiveOwnershipView(self.bot, interaction.channel).send_initial_message(interaction)
 
     async def ban_button_callback(self, interaction: discord.Interaction):
         if not await is_owner(self, interaction):
             return
-        await interaction.response.defer(ephemeral=True)
+        await acknowledge(self.bot, interaction, ephemeral=True)
 
         await BanUserView(self.bot, interaction.channel).send_initial_message(interaction)
 
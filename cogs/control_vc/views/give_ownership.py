@@ -1,6 +1,8 @@
 import discord
 from cogs.control_vc.embed_updates import update_info_embed
 from cogs.manage_vcs.update_name import update_channel_name_and_control_msg
+from cogs.manage_vcs.desired_state import reconcile_channel
+from bot.interaction_outbox import acknowledge
 
 
 class GiveOwnershipView(discord.ui.View):
@@ -40,50 +42,62 @@ class GiveOwnershipView(discord.ui.View):
 
                 super().__init__(placeholder="Select user to transfer ownership to", options=options, min_values=1, max_values=1)
 
-            async def callback(self, interaction: discord.Interaction):
+            async def give(self, selected_member):
+                # Run in the guild's actor so ownership can't change under a delete or another transfer
+                if selected_member is None:
+                    self.bot.repos.temp_channels.set_owner_id(self.channel.id, None)
+                    return
+
                 owner_perms = {'connect': True, 'view_channel': True}
-                if self.values[0] == "None":
-                    selected_member = None
+                await reconcile_channel(self.bot, self.channel, overwrite_updates={
+                    selected_member: discord.PermissionOverwrite(**owner_perms)
+                })
+                self.bot.repos.temp_channels.set_owner_id(self.channel.id, selected_member.id)
 
-                    embed = discord.Embed(
-                        title="Channel available to Claim!",
-                        description=f"Ownership of your channel has been removed.",
-                        color=0x00ff00
-                    )
-                    embed.set_footer(text="This message will disappear in 20 seconds.")
-                    await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=20)
+            async def callback(self, interaction: discord.Interaction):
+                await acknowledge(self.bot, interaction, ephemeral=True)
 
-                    self.bot.repos.temp_channels.set_owner_id(self.channel.id, None)
+                # Runs inline within the interaction's ack budget, otherwise it is queued on the outbox
+                async def follow_up():
+                    if self.values[0] == "None":
+                        selected_member = None
+
+                        embed = discord.Embed(
+                            title="Channel available to Claim!",
+                            description=f"Ownership of your channel has been removed.",
+                            color=0x00ff00
+                        )
+                        embed.set_footer(text="This message will disappear in 20 seconds.")
+                        await interaction.followup.send(embed=embed, ephemeral=True, delete_after=20)
 
-                    await update_info_embed(self.bot, self.channel)
+                        await self.bot.GuildActors.run(self.channel.guild.id, "give", self.give, None)
 
-                else:
-                    selected_member = interaction.guild.get_member(int(self.values[0]))
+                        self.bot.InteractionOutbox.submit("info_embed", update_info_embed, self.bot, self.channel)
 
-                if selected_member:
-                    await self.channel.set_permissions(
-                        selected_member,
-                        **owner_perms
-                    )
+                    else:
+                        selected_member = interaction.guild.get_member(int(self.values[0]))
 
-                    self.bot.repos.temp_channels.set_owner_id(self.channel.id, selected_member.id)
-                    await update_channel_name_and_control_msg(self.bot, [self.channel.id])
+                    if selected_member:
+                        await self.bot.GuildActors.run(self.channel.guild.id, "give", self.give, selected_member)
+                        self.bot.InteractionOutbox.submit("update_name", update_channel_name_and_control_msg, self.bot, [self.channel.id])
 
-                    embed = discord.Embed(
-                        title="Transferred!",
-                        description=f"Ownership of your channel was successfully transferred to {selected_member.mention}.",
-                        color=0x00ff00
-                    )
-                    embed.set_footer(text="This message will disappear in 20 seconds.")
-                    await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=20)
+                        embed = discord.Embed(
+                            title="Transferred!",
+                            description=f"Ownership of your channel was successfully transferred to {selected_member.mention}.",
+                            color=0x00ff00
+                        )
+                        embed.set_footer(text="This message will disappear in 20 seconds.")
+                        await interaction.followup.send(embed=embed, ephemeral=True, delete_after=20)
 
-                    embed = discord.Embed(
-                        title="Channel Ownership",
-                        description=f"You now own this channel! Use the above buttons to manage it as you wish.",
-                        color=discord.Color.blue()
-                    )
-                    embed.set_footer(text="This message will disappear in 60 seconds.")
-                    await self.channel.send(f"{selected_member.mention}", embed=embed, delete_after=60)
+                        embed = discord.Embed(
+                            title="Channel Ownership",
+                            description=f"You now own this channel! Use the above buttons to manage it as you wish.",
+                            color=discord.Color.blue()
+                        )
+                        embed.set_footer(text="This message will disappear in 60 seconds.")
+                        await self.channel.send(f"{selected_member.mention}", embed=embed, delete_after=60)
+
+                await self.bot.InteractionOutbox.run(interaction, "give", follow_up)
 
         self.add_item(SelectUserMenu(bot, self.channel))
 
@@ -13,6 +13,29 @@ class GeneralCCog(commands.Cog):
     async def ping(self, ctx):
         await ctx.respond(f"Pong! Latency is {self.bot.latency}")
 
+    @discord.slash_command(description="Shows how long recent temp channel creations took in this server.")
+    @discord.default_permissions(administrator=True)
+    async def trace(self, ctx):
+        distributions = self.bot.Tracer.distributions("create_on_join", guild_id=ctx.guild_id)
+        if not distributions:
+            await ctx.respond("No temp channel creations have been traced in this server recently.", ephemeral=True)
+            return
+
+        # Marks first (time since joining the creator), then stages slowest first
+        names = sorted(distributions, key=lambda name: (not name.startswith("to_"), -distributions[name]["p50"]))
+        lines = [f"{'stage':<22}{'n':>5}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for name in names:
+            d = distributions[name]
+            lines.append(f"{name:<22}{d['count']:>5}{d['p50'] * 1000:>7.0f}ms{d['p95'] * 1000:>7.0f}ms{d['max'] * 1000:>7.0f}ms")
+
+        embed = discord.Embed(
+            title="Temp Channel Creation Latency",
+            description="```\n" + "\n".join(lines) + "\n```",
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text="to_moved and to_final_name are measured from joining the creator channel.")
+        await ctx.respond(embed=embed, ephemeral=True)
+
     @discord.slash_command(description="Get support using Robotnic or support the creator.")
     async def support(self, ctx):
         embeds = [
@@ -0,0 +1,128 @@
+import time
+from collections import deque
+from bot.metrics import metrics
+from bot.rest_scheduler import CRITICAL
+
+SUPPRESSED = metrics.counter("churn_suppressed_total", "Creator joins that did not create a channel as the user was over the churn limit, by action")
+
+
+# - Limits how many temp channels one user can create in a guild within a sliding window
+# - Thresholds are per guild: guild_settings churn_limit (0 is unlimited, the default) and churn_window seconds
+# - Thresholds are cached so creator joins don't query the database, invalidated when /settings churn_limit edits them
+# - Only channels that were actually created count, failed creations and channels reclaimed from grace don't
+# - A user over the limit is moved into their most recent temp channel if it still exists, otherwise told to wait.
+#   If that channel is held by EmptyChannelGrace it is unhidden once they are in
+# - Use: if bot.ChurnLimiter.allow(member): create then record_channel(member, channel),
+#   else: await bot.ChurnLimiter.suppress(member, before, after)
+class ChurnLimiter:
+    def __init__(self, bot):
+        self.bot = bot
+        self.history = {}  # (guild_id, user_id) - deque of monotonic times a channel was created
+        self.windows = {}  # (guild_id, user_id) - window in seconds the history was kept for
+        self.recent_channels = {}  # (guild_id, user_id) - id of the last temp channel created
+
+        self.settings_cache = {}  # guild_id - (expiry time, churn_limit, churn_window)
+        self.settings_ttl = 300.0  # Also invalidated when the guild's churn limit is edited
+
+    def invalidate(self, guild_id):
+        self.settings_cache.pop(guild_id, None)
+
+    def _get_settings(self, guild_id):
+        """
+        Returns the guild's (churn_limit, churn_window).
+        """
+        cached = self.settings_cache.get(guild_id)
+        if cached is None or cached[0] <= time.monotonic():
+            settings = self.bot.repos.guild_settings.get_churn_limit(guild_id)
+            cached = (time.monotonic() + self.settings_ttl, settings["churn_limit"], settings["churn_window"])
+            self.settings_cache[guild_id] = cached
+        return cached[1], cached[2]
+
+    def allow(self, member):
+        """
+        Returns True if the member is under their guild's limit.
+        The creation is only counted once the channel exists, see record_channel().
+        """
+        churn_limit, churn_window = self._get_settings(member.guild.id)
+        if not churn_limit:
+            return True
+
+        key = (member.guild.id, member.id)
+        history = self.history.get(key)
+        if not history:
+            return True
+        now = time.monotonic()
+        while history and history[0] <= now - churn_window:
+            history.popleft()
+        self.windows[key] = churn_window
+        return len(history) < churn_limit
+
+    def record_channel(self, member, channel):
+        # Called once a channel has been created for the member
+        key = (member.guild.id, member.id)
+        self.recent_channels[key] = channel.id
+
+        churn_limit, churn_window = self._get_settings(member.guild.id)
+        if not churn_limit:
+            return
+        self.history.setdefault(key, deque()).append(time.monotonic())
+        self.windows[key] = churn_window
+
+    async def suppress(self, member, before, after):
+        """
+        Handles a creator join that was over the limit.
+        Returns the channel the member was moved into, or None.
+        """
+        key = (member.guild.id, member.id)
+        temp_channel_ids = self.bot.repos.temp_channels.get_ids(guild_id=member.guild.id)
+
+        # The channel they just hopped out of, otherwise the last one they made
+        channel = None
+        if before.channel and before.channel.id in temp_channel_ids:
+            channel = before.channel
+        elif self.recent_channels.get(key) in temp_channel_ids:
+            channel = member.guild.get_channel(self.recent_channels[key])
+
+        if channel is not None:
+            try:
+                async with self.bot.RestScheduler.slot(member.guild.id, CRITICAL):
+                    await member.move_to(channel)
+                SUPPRESSED.inc(action="moved")
+            except Exception as e:
+                self.bot.logger.debug(f"Error moving {member} back to their recent channel, handled. {e}")
+            else:
+                # Emptied when they hopped out, so it may be hidden and waiting to expire
+                emptied = self.bot.EmptyChannelGrace.held_entry(channel.id)
+                if emptied:
+                    try:
+                        await self.bot.EmptyChannelGrace.restore(emptied, priority=CRITICAL)
+                    except Exception as e:
+                        self.bot.logger.debug(f"Error unhiding {channel} after moving {member} back, handled. {e}")
+                self.bot.logger.debug(f"{member} is creating channels too quickly, moved back to {channel}")
+                return channel
+
+        SUPPRESSED.inc(action="told_to_wait")
+        history = self.history.get(key)
+        wait = int(history[0] + self.windows[key] - time.monotonic()) + 1 if history else 1
+        try:
+            await after.channel.send(f"Sorry {member.mention}, you are creating channels too quickly. Please wait {wait} seconds and try again.", delete_after=min(wait, 60))
+        except Exception as e:
+            self.bot.logger.debug(f"Error telling {member} to wait, handled. {e}")
+        return None
+
+    def prune(self):
+        # Forgets users with no creations left in their window, and recent channels that no longer exist
+        now = time.monotonic()
+        for key in [key for key, history in self.history.items() if not history or history[-1] <= now - self.windows.get(key, 0)]:
+            self.history.pop(key, None)
+            self.windows.pop(key, None)
+        for key in [key for key, channel_id in self.recent_channels.items() if self.bot.get_channel(channel_id) is None]:
+            self.recent_channels.pop(key)
+
+    def forget_guild(self, guild_id):
+        self.invalidate(guild_id)
+        for key in [key for key in self.history if key[0] == guild_id]:
+            self.history.pop(key)
+            self.windows.pop(key, None)
+        for key in [key for key in self.recent_channels if key[0] == guild_id]:
+            self.recent_channels.pop(key)
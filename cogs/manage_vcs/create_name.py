@@ -14,7 +14,13 @@ def create_temp_channel_name(bot, temp_channel, db_temp_channel_info=None, db_cr
     # Uses guild.get_member rather than bot.get_member to access nicknames
     owner = temp_channel.guild.get_member(db_temp_channel_info.owner_id) if db_temp_channel_info.owner_id else None
 
-    new_channel_name = db_creator_channel_info.child_name
+    return render_temp_channel_name(db_creator_channel_info.child_name, owner, temp_channel.members, db_temp_channel_info.number)
+
+
+# Fills in a name template without needing the channel to exist, so a channel can be created with its final name
+# owner: member or None, members: members in (or about to be in) the channel, number: the channel's {count}
+def render_temp_channel_name(template, owner, members, number):
+    new_channel_name = template
     if "{user}" in str(new_channel_name):
         if owner:
             member_name = owner.nick if owner.nick else owner.display_name
@@ -24,7 +30,7 @@ def create_temp_channel_name(bot, temp_channel, db_temp_channel_info=None, db_cr
 
     if "{activity}" in str(new_channel_name):
         activities = []
-        for member in temp_channel.members:
+        for member in members:
             for activity in member.activities:
                 if activity.type == discord.ActivityType.playing:
                     if activity.name.lower() not in (name.lower() for name in activities):
@@ -38,8 +44,7 @@ def create_temp_channel_name(bot, temp_channel, db_temp_channel_info=None, db_cr
         new_channel_name = new_channel_name.replace("{activity}", activity_text)
 
     if "{count}" in str(new_channel_name):
-        count = db_temp_channel_info.number
-        new_channel_name = new_channel_name.replace("{count}", str(count))
+        new_channel_name = new_channel_name.replace("{count}", str(number))
 
     # Max char is 100, using 98 just in case
     if len(str(new_channel_name)) > 95:
@@ -0,0 +1,68 @@
+from bot.metrics import metrics
+from bot.rest_scheduler import NORMAL
+
+EDITS = metrics.counter("channel_state_edits_total", "Desired state changes applied to channels, by the call used")
+
+
+def overwrites_by_id(overwrites):
+    return {target.id: (target, overwrite) for target, overwrite in overwrites.items()}
+
+
+def diff_channel(channel, name=None, user_limit=None, overwrites=None, overwrite_updates=None):
+    """
+    Compares the desired state to the cached channel.
+    Returns (edit kwargs, {target: overwrite or None} of changed overwrites).
+    name, user_limit: desired value or None to leave as is
+    overwrites: desired full overwrite map or None to leave as is
+    overwrite_updates: {target: overwrite or None to remove} applied on top of the overwrites
+    """
+    edit = {}
+    if name is not None and name != channel.name:
+        edit["name"] = name
+    if user_limit is not None and int(user_limit) != channel.user_limit:
+        edit["user_limit"] = int(user_limit)
+
+    current = overwrites_by_id(channel.overwrites)
+    desired = overwrites_by_id(overwrites) if overwrites is not None else dict(current)
+    for target, overwrite in (overwrite_updates or {}).items():
+        if overwrite is None or overwrite.is_empty():
+            desired.pop(target.id, None)
+        else:
+            desired[target.id] = (target, overwrite)
+
+    changed = {}
+    for target_id, (target, overwrite) in desired.items():
+        if target_id not in current or current[target_id][1] != overwrite:
+            changed[target] = overwrite
+    for target_id, (target, _overwrite) in current.items():
+        if target_id not in desired:
+            changed[target] = None
+
+    if changed:
+        edit["overwrites"] = {target: overwrite for target, overwrite in desired.values()}
+    return edit, changed
+
+
+# Applies the desired name, user limit and overwrites of a channel with the fewest REST calls
+# - Nothing that already matches the cached channel is sent, no change is no call
+# - A change to a single overwrite and nothing else is one set_permissions, otherwise everything is one edit
+# - The call waits for a bot.RestScheduler slot of the given priority
+# - Use: await reconcile_channel(bot, channel, user_limit=5, overwrite_updates={role: overwrite})
+async def reconcile_channel(bot, channel, name=None, user_limit=None, overwrites=None, overwrite_updates=None, priority=NORMAL):
+    """
+    Returns the number of REST calls made, 0 or 1.
+    """
+    edit, changed = diff_channel(channel, name, user_limit, overwrites, overwrite_updates)
+    if not edit:
+        EDITS.inc(call="none")
+        return 0
+
+    async with bot.RestScheduler.slot(channel.guild.id, priority):
+        if len(changed) == 1 and list(edit) == ["overwrites"]:
+            target, overwrite = next(iter(changed.items()))
+            await channel.set_permissions(target, overwrite=overwrite)
+            EDITS.inc(call="set_permissions")
+        else:
+            await channel.edit(**edit)
+            EDITS.inc(call="edit")
+    return 1
@@ -1,22 +1,45 @@
+import time
 from cogs.manage_vcs.lifecycle import create_on_join, delete_on_leave
 from cogs.manage_vcs.update_name import update_channel_name_and_control_msg
+from bot.metrics import metrics
+
+VOICE_EVENTS = metrics.counter("voice_events_total", "Voice state updates received, by what they triggered")
+PRESENCE_EVENTS = metrics.counter("presence_events_total", "Presence updates that triggered a temp channel update")
+CREATE_SECONDS = metrics.histogram("create_on_join_seconds", "Time taken to create a temp channel for a user joining a creator")
+DELETE_SECONDS = metrics.histogram("delete_on_leave_seconds", "Time taken to handle a user leaving a temp channel")
 
 
 async def handle_voice_state_update(bot, member, before, after):
+    started = time.perf_counter()  # Traces measure from when the event arrived
+
     # Filter out normal updates when not switching channels
     if before is not None and after is not None:
         if before.channel == after.channel:
+            VOICE_EVENTS.inc(kind="same_channel")
             return
 
+    moved_back_to = None  # Channel a user over the churn limit was moved back into
     if after.channel:  # If a user joined a channel
         creator_channel_ids = bot.repos.creator_channels.get_ids()
         if after.channel.id in creator_channel_ids:  # Filter to creator channels
-            await create_on_join(member, before, after, bot)
-
-    if before.channel:  # If a user left a channel
+            VOICE_EVENTS.inc(kind="creator_join")
+            if bot.ChurnLimiter.allow(member):
+                trace = bot.Tracer.start("create_on_join", member.guild, started)
+                try:
+                    with CREATE_SECONDS.time():
+                        await bot.GuildActors.run(member.guild.id, "create", create_on_join, member, before, after, bot, trace)
+                finally:
+                    bot.Tracer.finish(trace)  # Failed creations are traced too
+            else:
+                moved_back_to = await bot.GuildActors.run(member.guild.id, "churn", bot.ChurnLimiter.suppress, member, before, after)
+
+    # A user moved straight back into the channel they left hasn't really left it
+    if before.channel and before.channel != moved_back_to:  # If a user left a channel
         temp_channel_ids = bot.repos.temp_channels.get_ids(guild_id=before.channel.guild.id)
         if before.channel.id in temp_channel_ids:  # Filter to temp channels
-            await delete_on_leave(member, before, after, bot)
+            VOICE_EVENTS.inc(kind="temp_leave")
+            with DELETE_SECONDS.time():
+                await bot.GuildActors.run(member.guild.id, "leave", delete_on_leave, member, before, after, bot)
 
             # Update channel names of all temp channels in the guild
             # Technically channel names only need to be updated on activity change and deleting a channel (this), no background task required.
@@ -25,9 +48,15 @@ async def handle_voice_state_update(bot, member, before, after):
 
 
 async def handle_presence_update(bot, before, after):
-    if not hasattr(after, "channel"):
+    # Only a change of activities by a member in a temp channel can change its name
+    if after.voice is None or after.voice.channel is None:
+        return
+    if [activity.name for activity in before.activities] == [activity.name for activity in after.activities]:
+        return
+    temp_channel = after.voice.channel
+    if temp_channel.id not in bot.repos.temp_channels.get_ids(guild_id=temp_channel.guild.id):
         return
-    temp_channel = after.channel
+    PRESENCE_EVENTS.inc()
 
     bot.logger.debug(f"Updating {temp_channel.name} due to activity change")
     await update_channel_name_and_control_msg(bot, [temp_channel.id])
@@ -0,0 +1,131 @@
+import asyncio
+import discord
+from cogs.manage_vcs.lifecycle import delete_temp_channel
+from bot.metrics import metrics
+from bot.rest_scheduler import NORMAL
+from cogs.manage_vcs.desired_state import reconcile_channel
+
+GRACE = metrics.counter("empty_grace_total", "Emptied temp channels held for their owner, by outcome")
+
+
+class EmptiedChannel:
+    def __init__(self, channel, member, creator_id, owner_id, role, saved_overwrite):
+        self.channel = channel
+        self.member = member  # Last member to leave, for the removal log
+        self.creator_id = creator_id
+        self.owner_id = owner_id
+        self.role = role  # Role whose overwrite was changed to hide the channel
+        self.saved_overwrite = saved_overwrite  # That role's overwrite before hiding, None if it had none
+        self.expiry_task = None
+
+
+# - Holds emptied temp channels for a grace period instead of deleting them straight away
+# - Held channels are hidden and leased so the reaper leaves them alone
+# - If the owner rejoins the creator within the grace period they are moved back into their old channel
+# - Otherwise the channel is deleted once the grace period ends
+# - Grace period in settings.json "temp_channels" "empty_grace_seconds" (default 30), 0 deletes channels immediately
+# - Use: if not await bot.EmptyChannelGrace.hold(channel, member): delete now
+class EmptyChannelGrace:
+    def __init__(self, bot):
+        self.bot = bot
+        self.grace_seconds = self.bot.settings.get("temp_channels", {}).get("empty_grace_seconds", 30)
+        self.held = {}  # channel_id - EmptiedChannel()
+
+    async def hold(self, channel, member):
+        """
+        Hides an emptied temp channel and schedules its deletion.
+        Returns False if it should be deleted now instead.
+        """
+        if self.grace_seconds <= 0 or channel.id in self.held:
+            return False
+
+        db_temp_channel_info = self.bot.repos.temp_channels.get_info(channel.id)
+        if db_temp_channel_info is None or not db_temp_channel_info.owner_id:
+            return False
+
+        # Same role the controls hide and lock with
+        role = self.bot.OverwriteTemplates.default_role(db_temp_channel_info.creator_id, channel.guild)
+
+        saved_overwrite = channel.overwrites.get(role)
+        hidden_overwrite = discord.PermissionOverwrite.from_pair(*(saved_overwrite or discord.PermissionOverwrite()).pair())
+        hidden_overwrite.view_channel = False
+
+        self.bot.TempChannelReaper.grant_lease(channel.id, self.grace_seconds + self.bot.TempChannelReaper.lease_seconds)
+        try:
+            await reconcile_channel(self.bot, channel, overwrite_updates={role: hidden_overwrite})
+        except Exception as e:
+            self.bot.TempChannelReaper.release_lease(channel.id)
+            self.bot.logger.debug(f"Failed to hide emptied temp channel {channel.id}, deleting instead. {e}")
+            return False
+
+        entry = EmptiedChannel(channel, member, db_temp_channel_info.creator_id, db_temp_channel_info.owner_id, role, saved_overwrite)
+        entry.expiry_task = self.bot.loop.create_task(self._expire(entry))
+        self.held[channel.id] = entry
+        GRACE.inc(outcome="held")
+        self.bot.logger.debug(f"Holding emptied temp channel {channel.id} for {self.grace_seconds} seconds")
+        return True
+
+    def reclaim(self, creator_id, owner_id):
+        """
+        Returns the held EmptiedChannel() of this owner from this creator, or None.
+        The entry stays held, so if moving the owner in fails it still expires. Once moved in call restore(entry).
+        """
+        for entry in self.held.values():
+            if entry.creator_id == creator_id and entry.owner_id == owner_id:
+                return entry
+        return None
+
+    def held_entry(self, channel_id):
+        """
+        Returns the EmptiedChannel() if this channel is held, or None. Once someone is moved in call restore(entry).
+        """
+        return self.held.get(channel_id)
+
+    async def restore(self, entry, priority=NORMAL):
+        """
+        Stops holding the channel and unhides it, call once someone has been moved into it.
+        """
+        if self.held.get(entry.channel.id) is entry:
+            self.held.pop(entry.channel.id)
+            entry.expiry_task.cancel()
+            # Replaces the grace lease and covers the move, as the voice state update may arrive after move_to returns
+            self.bot.TempChannelReaper.grant_lease(entry.channel.id)
+            GRACE.inc(outcome="reclaimed")
+
+        # Puts back the role's overwrite from before the channel was hidden, None removes it
+        await reconcile_channel(self.bot, entry.channel, overwrite_updates={entry.role: entry.saved_overwrite}, priority=priority)
+
+    async def _expire(self, entry):
+        await asyncio.sleep(self.grace_seconds)
+        await self.bot.GuildActors.run(entry.channel.guild.id, "grace_expire", self._expire_now, entry)
+
+    async def _expire_now(self, entry):
+        if self.held.get(entry.channel.id) is not entry:
+            return
+        self.held.pop(entry.channel.id)
+        self.bot.TempChannelReaper.release_lease(entry.channel.id)
+
+        # Someone found their way in, eg. an admin who can see hidden channels
+        if entry.channel.voice_states:
+            GRACE.inc(outcome="occupied")
+            try:
+                await self.restore(entry)
+            except Exception as e:
+                self.bot.logger.debug(f"Failed to unhide held temp channel {entry.channel.id}, handled. {e}")
+            return
+
+        GRACE.inc(outcome="expired")
+        await delete_temp_channel(self.bot, entry.channel, entry.member)
+
+    def forget(self, channel_id):
+        entry = self.held.pop(channel_id, None)
+        if entry:
+            entry.expiry_task.cancel()
+
+    async def close(self):
+        # Held channels are deleted by startup reconciliation on the next run
+        tasks = [entry.expiry_task for entry in self.held.values()]
+        for task in tasks:
+            task.cancel()
+        self.held.clear()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,19 +1,37 @@
 import datetime
 import discord
 from cogs.control_vc.views.control_view import ControlView
-from cogs.manage_vcs.create_name import create_temp_channel_name
+from cogs.manage_vcs.create_name import render_temp_channel_name
+from bot.tracing import NULL_TRACE
+from bot.logging import log_context
+from bot.rest_scheduler import CRITICAL, NORMAL
+from cogs.manage_vcs.desired_state import reconcile_channel
 
+reserved_numbers = {}  # creator_id - {numbers of temp channels being created}
 
-async def create_on_join(member, before, after, bot):
-    bot.logger.debug(f"{member} joined creator channel {after.channel}")
+
+def get_child_category(bot, creator_channel, db_creator_channel_info):
+    # Category:
+    # 0 -> Creator channel category
+    # id -> Specific category
+    if db_creator_channel_info.child_category_id != 0:
+        return bot.get_channel(db_creator_channel_info.child_category_id)
+    return creator_channel.category
+
+
+async def create_on_join(member, before, after, bot, trace=NULL_TRACE):
+    bot.logger.debug(f"{member} joined creator channel {after.channel}", extra=log_context(after.channel))
 
     # Logic flow:
     # 1. Retrieve child settings from db
-    # 2. Get category & overwrites, both depend on settings
-    # 3. Create channel & move user
-    # 4. Create name
-    # 5. Edit channel w correct name & overwrites and disable permission sync
+    # 2. Get category. If the member's own emptied channel is still held, move them back into it and stop
+    #    Get overwrites, depends on settings
+    # 3. Create name & number, so the channel can be created already finished
+    # 4. Take a spare channel from the creator's warm pool, or create the channel, & move user
+    # 5. Finalize a spare with the name, limit & overwrites. Otherwise only if the category's permissions were
+    #    synced onto the channel, reapply overwrites
     # 6. Send logs and notifications messages
+    # Each step is a span of trace, "final_name" and "moved" are marked once the name is set and the user is in
 
     # SETTINGS from db
     # Category:
@@ -29,152 +47,222 @@ async def create_on_join(member, before, after, bot):
     # int -> that amount
     # Name Template:
     # {user} - replaced by users nickname or display name
-    # {activity} - not implemented
-    # {count} - not implemented
+    # {activity} - replaced by the games being played in the channel
+    # {count} - replaced by the channel's number among the creator's temp channels
+    # Warm Pool Size:
+    # 0 -> off
+    # int -> most hidden spare channels kept ready, see cogs/manage_vcs/warm_pool.py
 
     creator_channel = after.channel
 
-    db_creator_channel_info = bot.repos.creator_channels.get_info(creator_channel.id)
-    if db_creator_channel_info.child_category_id != 0:
-        category = bot.get_channel(db_creator_channel_info.child_category_id)
-    else:
-        category = creator_channel.category
+    with trace.span("db_creator_info"):
+        db_creator_channel_info = bot.repos.creator_channels.get_info(creator_channel.id)
+    category = get_child_category(bot, creator_channel, db_creator_channel_info)
 
-    # 0 -> no overwrites
-    # 1 -> overwrites from creator
-    # 2 -> overwrites from category
-    if db_creator_channel_info.child_overwrites == 1:
-        overwrites = creator_channel.overwrites
-    elif db_creator_channel_info.child_overwrites == 2:
-        if category:
-            overwrites = category.overwrites
+    # The owner's emptied channel may still be held for them, if so move them back in rather than creating another
+    # It stays held until the move succeeds, so if the move fails it still expires as normal
+    emptied = bot.EmptyChannelGrace.reclaim(creator_channel.id, member.id)
+    if emptied:
+        try:
+            with trace.span("move_to"):
+                async with bot.RestScheduler.slot(member.guild.id, CRITICAL):
+                    await member.move_to(emptied.channel)
+            trace.mark("moved")
+        except Exception as e:
+            bot.logger.debug(f"Error moving owner back to held channel, creating a new one. Handled. {e}", extra=log_context(emptied.channel))
         else:
-            overwrites = creator_channel.overwrites
-    else:
-        overwrites = {}
-
-    overwrites[bot.user] = discord.PermissionOverwrite(
-        view_channel=True,
-        manage_channels=True,
-        send_messages=True,
-        manage_messages=True,
-        read_message_history=True,
-        connect=True,
-        move_members=True,
-    )
-    overwrites[member] = discord.PermissionOverwrite(
-        view_channel=True,
-        send_messages=True,
-        read_message_history=True,
-        connect=True,
-    )
+            try:
+                with trace.span("unhide"):
+                    await bot.EmptyChannelGrace.restore(emptied, priority=CRITICAL)
+                trace.mark("final_name")
+            except Exception as e:
+                bot.logger.debug(f"Error unhiding reclaimed channel, handled. {e}", extra=log_context(emptied.channel))
+            bot.logger.debug(f"Moved {member} back to held channel {emptied.channel}", extra=log_context(emptied.channel))
+            return
+
+    # The creator's cached template (none, creator or category overwrites, plus the bot) and the member as owner
+    with trace.span("overwrites"):
+        overwrites = bot.OverwriteTemplates.for_new_channel(creator_channel, db_creator_channel_info, member)
+
+    # The number is reserved until the row is added, as other creations from this creator can run while this one awaits
+    with trace.span("db_counts"):
+        counts = bot.repos.temp_channels.get_counts(creator_channel.id)
+    reserved = reserved_numbers.setdefault(creator_channel.id, set())
+    count = max([*counts, *reserved], default=0) + 1
+    reserved.add(count)
+
+    # The member is the only one in the channel once moved
+    with trace.span("render_name"):
+        channel_name = render_temp_channel_name(db_creator_channel_info.child_name, member, [member], count)
+
+    # Spares are hidden and unnamed, they are finalized with the real name, limit and overwrites before anyone is moved in
+    bot.SpareChannelPool.record_join(creator_channel.id)
+    with trace.span("take_spare"):
+        new_temp_channel = bot.SpareChannelPool.take(creator_channel, category, db_creator_channel_info.warm_pool_size)
+    is_spare = new_temp_channel is not None
+
+    # Written ahead so a crash part way through is completed or rolled back on the next startup, see bot/tasks/startup.py
+    # The added step is committed with the temp_channels row, the entry is deleted once the creation is done or abandoned
+    with trace.span("journal"):
+        op_id = bot.repos.lifecycle_journal.begin(member.guild.id, creator_channel.id, member.id, channel_name,
+                                                  category.id if category else None, new_temp_channel.id if is_spare else None)
+    tracked = False  # Set once the temp_channels row has been added
 
     try:
-        new_temp_channel = await creator_channel.guild.create_voice_channel(
-            name="⌛",
-            category=category,
-            overwrites=overwrites,
-            position=creator_channel.position,
-        )
-    except discord.Forbidden as e:
-        bot.logger.warning(
-            "Missing permissions while creating temp channel",
-            extra={
-                "guild_id": creator_channel.guild.id,
-                "channel_id": creator_channel.id,
-            },
-        )
+        try:
+            if is_spare:
+                try:
+                    with trace.span("finalize_spare"):
+                        await reconcile_channel(bot, new_temp_channel, name=channel_name, user_limit=db_creator_channel_info.user_limit,
+                                                overwrites=overwrites, priority=CRITICAL)
+                    trace.mark("final_name")
+                except Exception as e:
+                    # Nobody is in the spare yet so it is dropped and a channel created instead
+                    # Its journal entry is kept if it couldn't be deleted, so the next startup deletes it
+                    bot.logger.debug(f"Error finalizing spare channel, creating a new one. Handled. {e}", extra=log_context(new_temp_channel))
+                    if await bot.SpareChannelPool.discard(new_temp_channel):
+                        bot.repos.lifecycle_journal.finish(op_id)
+                    op_id = bot.repos.lifecycle_journal.begin(member.guild.id, creator_channel.id, member.id, channel_name,
+                                                              category.id if category else None)
+                    is_spare = False
 
-        embed = discord.Embed()
-        embed.add_field(name="Required",
-                        value="`view_channel`, `manage_channels`, `send_messages`, `manage_messages`, `read_message_history`, `connect`, `move_members`")
-        await creator_channel.send(
-            f"Sorry {member.mention}, I require the following permissions. Make sure they are not overwritten by the category (In this case `{category.name}`).",
-            embed=embed, delete_after=300)
-        return
+            if not is_spare:
+                with trace.span("create_voice_channel"):
+                    async with bot.RestScheduler.slot(member.guild.id, CRITICAL):
+                        new_temp_channel = await creator_channel.guild.create_voice_channel(
+                            name=channel_name,
+                            category=category,
+                            overwrites=overwrites,
+                            position=creator_channel.position,
+                            user_limit=db_creator_channel_info.user_limit,
+                        )
+                trace.mark("final_name")
+        except discord.Forbidden as e:
+            bot.logger.warning(
+                "Missing permissions while creating temp channel",
+                extra=log_context(creator_channel),
+            )
+
+            embed = discord.Embed()
+            embed.add_field(name="Required",
+                            value="`view_channel`, `manage_channels`, `send_messages`, `manage_messages`, `read_message_history`, `connect`, `move_members`")
+            await creator_channel.send(
+                f"Sorry {member.mention}, I require the following permissions. Make sure they are not overwritten by the category (In this case `{category.name if category else 'None'}`).",
+                embed=embed, delete_after=300)
+            return
 
-    counts = bot.repos.temp_channels.get_counts(creator_channel.id)
-    if len(counts) < 1:
-        count = 1
-    else:
-        count = max(counts) + 1
+        # Stops the reaper deleting the channel before the user has been moved in
+        # Left to expire rather than released after the move as the voice state update may arrive after move_to returns
+        bot.TempChannelReaper.grant_lease(new_temp_channel.id)
 
-    bot.repos.temp_channels.add(new_temp_channel.guild.id, new_temp_channel.id, creator_channel.id, member.id, 0, count, False)
+        with trace.span("db_add"):
+            bot.repos.temp_channels.add(new_temp_channel.guild.id, new_temp_channel.id, creator_channel.id, member.id, 0, count, False,
+                                        journal_op_id=op_id)
+        tracked = True
+        bot.ChurnLimiter.record_channel(member, new_temp_channel)
+    finally:
+        reserved.discard(count)
+        if not reserved:
+            reserved_numbers.pop(creator_channel.id, None)
+        # However the creation was cut short before the channel was tracked, its entry goes with it
+        if not tracked:
+            bot.repos.lifecycle_journal.finish(op_id)
 
     try:
-        await member.move_to(new_temp_channel)
-        bot.logger.debug(f"Moved {member} to {new_temp_channel}")
+        with trace.span("move_to"):
+            async with bot.RestScheduler.slot(member.guild.id, CRITICAL):
+                await member.move_to(new_temp_channel)
+        trace.mark("moved")
+        bot.logger.debug(f"Moved {member} to {new_temp_channel}", extra=log_context(new_temp_channel))
     except Exception as e:
-        bot.logger.debug(f"Error creating voice channel, most likely a quick join and leave. Handled. {e}")
+        bot.logger.debug(f"Error creating voice channel, most likely a quick join and leave. Handled. {e}", extra=log_context(creator_channel))
+        bot.repos.lifecycle_journal.finish(op_id)
+        bot.TempChannelReaper.release_lease(new_temp_channel.id)
+        # The row is only removed once the channel is gone, otherwise the reaper deletes it later
+        try:
+            async with bot.RestScheduler.slot(member.guild.id, NORMAL):
+                await new_temp_channel.delete()
+        except discord.NotFound:
+            pass
+        except Exception as e:
+            bot.logger.debug(f"Error deleting unused temp channel, left for the reaper. Handled. {e}", extra=log_context(new_temp_channel))
+            return
         bot.repos.temp_channels.remove(new_temp_channel.id)
-        await new_temp_channel.delete()
         return
 
-    channel_name = create_temp_channel_name(bot, new_temp_channel, db_creator_channel_info=db_creator_channel_info)
-
-    # Disable sync and reapply overwrites. this is because creating a channel in a
-    # category with no overwrites will auto get overwrites of the category even if
-    # {} is passed in overwrites
+    # The channel is kept as a temp channel even if these fail, its row is what lets the reaper delete it once empty
     try:
-        # Could use bot.renamer to avoid rate-limit problems
-        await new_temp_channel.edit(
-            name=channel_name,
-            user_limit=db_creator_channel_info.user_limit,
-            sync_permissions=False,
-            overwrites=overwrites
-        )
+        # Creating a channel in a category can still leave it synced to the category's permissions rather than
+        # the overwrites passed in. Only then is a second call made, sending just what differs
+        if not is_spare:
+            with trace.span("channel_edit"):
+                await reconcile_channel(bot, new_temp_channel, overwrites=overwrites, priority=CRITICAL)
 
         # Send control message in channel chat
-        view = ControlView(bot, new_temp_channel)
-        await view.send_initial_message(member, channel_name=channel_name)
+        with trace.span("control_message"):
+            view = ControlView(bot, new_temp_channel)
+            await view.send_initial_message(member, channel_name=channel_name)
     except Exception as e:
-        bot.logger.debug(f"Error finalizing creation of voice channel, handled. {e}")
-        bot.repos.temp_channels.remove(new_temp_channel.id)
+        bot.logger.debug(f"Error finalizing creation of voice channel, handled. {e}", extra=log_context(new_temp_channel))
+    bot.repos.lifecycle_journal.finish_later(op_id)
 
-    # Sends messages in the guild log channel and the bot's notification channel - uses get_guild_logs_channel_id instead of get_guild_settings for read efficiency
-    embed = discord.Embed(
-        title="TempChannel Create",
-        description="",
-        color=discord.Color.green()
-    )
-    embed.add_field(name="Channel",
-                    value=f"`{new_temp_channel.name}` (`{new_temp_channel.id}`)",
-                    inline=False)
-    embed.add_field(name="User",
-                    value=f"`{member.display_name}` (`{member.display_name}`, `{member.id}`)",
-                    inline=False)
-    embed.timestamp = datetime.datetime.now()
-    if after.channel:
-        await bot.GuildLogService.send(event="channel_create", guild=after.channel.guild, message=f"", embed=embed)
-    await bot.BotLogService.send(event="channel_create", message=f"Temp Channel (`{new_temp_channel.name}`) was made in server (`{member.guild.name}`) by user (`{member}`)")
+    # Sends messages in the guild log channel and the bot's notification channel
+    # Embed is only built if the guild logs the event, sending is queued and batched
+    with trace.span("guild_log"):
+        if bot.GuildLogService.is_enabled("channel_create", creator_channel.guild):
+            embed = discord.Embed(
+                title="TempChannel Create",
+                description="",
+                color=discord.Color.green()
+            )
+            embed.add_field(name="Channel",
+                            value=f"`{new_temp_channel.name}` (`{new_temp_channel.id}`)",
+                            inline=False)
+            embed.add_field(name="User",
+                            value=f"`{member.display_name}` (`{member.display_name}`, `{member.id}`)",
+                            inline=False)
+            embed.timestamp = datetime.datetime.now()
+            await bot.GuildLogService.send(event="channel_create", guild=creator_channel.guild, message=f"", embed=embed)
+    with trace.span("bot_log"):
+        await bot.BotLogService.send(event="channel_create", message=f"Temp Channel (`{new_temp_channel.name}`) was made in server (`{member.guild.name}`) by user (`{member}`)")
 
 
 async def delete_on_leave(member, before, after, bot):
     old_temp_channel = before.channel
 
     if len(old_temp_channel.members) < 1:
-        bot.logger.debug(f"Left temp channel is empty. Deleting...")
+        # Kept hidden for a while in case the owner rejoins through the creator
+        if await bot.EmptyChannelGrace.hold(old_temp_channel, member):
+            return
+        await delete_temp_channel(bot, old_temp_channel, member)
 
-        try:
+
+async def delete_temp_channel(bot, old_temp_channel, member):
+    # Deletes an empty temp channel and logs its removal, member is the last to leave
+    bot.logger.debug(f"Deleting empty temp channel {old_temp_channel.name}...", extra=log_context(old_temp_channel))
+
+    try:
+        async with bot.RestScheduler.slot(old_temp_channel.guild.id, NORMAL):
             await old_temp_channel.delete()
-            bot.repos.temp_channels.remove(old_temp_channel.id)
-            bot.logger.debug(f"Deleted {old_temp_channel.name}")
+        bot.repos.temp_channels.remove(old_temp_channel.id)
+        bot.logger.debug(f"Deleted {old_temp_channel.name}", extra=log_context(old_temp_channel))
 
-        except discord.NotFound as e:
-            bot.repos.temp_channels.remove(old_temp_channel.id)
-            bot.logger.debug(f"Channel not found removing entry in db, handled. {e}")
-            return
+    except discord.NotFound as e:
+        bot.repos.temp_channels.remove(old_temp_channel.id)
+        bot.logger.debug(f"Channel not found removing entry in db, handled. {e}", extra=log_context(old_temp_channel))
+        return
 
-        except discord.Forbidden as e:
-            bot.logger.debug(
-                f"Permission error removing temp channel, handled by sending a message notifying of lack of perms. {e}")
-            await old_temp_channel.send(f"Sorry {member.mention}, I do not have permission to delete this channel.", delete_after=300)
-            return
+    except discord.Forbidden as e:
+        bot.logger.debug(
+            f"Permission error removing temp channel, handled by sending a message notifying of lack of perms. {e}", extra=log_context(old_temp_channel))
+        await old_temp_channel.send(f"Sorry {member.mention}, I do not have permission to delete this channel.", delete_after=300)
+        return
 
-        except Exception as e:
-            bot.logger.error(f"Unknown error removing temp channel. {e}")
-            return
+    except Exception as e:
+        bot.logger.error(f"Unknown error removing temp channel. {e}", extra=log_context(old_temp_channel))
+        return
 
+    if bot.GuildLogService.is_enabled("channel_remove", member.guild):
         embed = discord.Embed(
             title="TempChannel Removed",
             description="",
@@ -188,4 +276,4 @@ async def delete_on_leave(member, before, after, bot):
                         inline=False)
         embed.timestamp = datetime.datetime.now()
         await bot.GuildLogService.send(event="channel_remove", guild=member.guild, message=f"", embed=embed)
-        await bot.BotLogService.send(event="channel_remove", message=f"Temp Channel was removed in server (`{member.guild.name}`) by user (`{member}`)")
+    await bot.BotLogService.send(event="channel_remove", message=f"Temp Channel was removed in server (`{member.guild.name}`) by user (`{member}`)")
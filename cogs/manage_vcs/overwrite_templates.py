@@ -0,0 +1,120 @@
+import discord
+from cogs.manage_vcs.lifecycle import get_child_category
+from bot.metrics import metrics
+
+TEMPLATES = metrics.counter("overwrite_templates_total", "Creator overwrite template lookups and invalidations, by event")
+
+
+def bot_overwrite():
+    # What the bot needs in every temp channel it manages
+    return discord.PermissionOverwrite(
+        view_channel=True,
+        manage_channels=True,
+        send_messages=True,
+        manage_messages=True,
+        read_message_history=True,
+        connect=True,
+        move_members=True,
+    )
+
+
+def owner_overwrite():
+    return discord.PermissionOverwrite(
+        view_channel=True,
+        send_messages=True,
+        read_message_history=True,
+        connect=True,
+    )
+
+
+class CreatorTemplate:
+    def __init__(self, guild_id, source_ids, overwrites, default_role):
+        self.guild_id = guild_id
+        self.source_ids = source_ids  # Ids of the channels the overwrites were copied from
+        self.overwrites = overwrites  # Base overwrites of the creator's temp channels, including the bot's
+        self.default_role = default_role  # Role whose overwrite is changed by lock/hide/public
+
+
+# - Caches each creator's base overwrites for its temp channels and the role lock/hide/public changes
+# - New channels are the template plus their owner, state changes are the template's default role plus the state
+# - A template is dropped when its creator is edited (CreatorChannelsRepository listener), when a channel it was
+#   copied from is updated or deleted, or when a role in its guild changes
+# - Use: overwrites = bot.OverwriteTemplates.for_new_channel(creator_channel, db_creator_channel_info, member)
+class OverwriteTemplates:
+    def __init__(self, bot):
+        self.bot = bot
+        self.templates = {}  # creator_id - CreatorTemplate()
+
+        self.bot.repos.creator_channels.add_listener(self.invalidate)
+
+        metrics.gauge("overwrite_templates", "Cached creator overwrite templates", func=lambda: len(self.templates))
+
+    def get(self, creator_channel, db_creator_channel_info=None):
+        template = self.templates.get(creator_channel.id)
+        if template is not None:
+            TEMPLATES.inc(event="hit")
+            return template
+
+        TEMPLATES.inc(event="miss")
+        if db_creator_channel_info is None:
+            db_creator_channel_info = self.bot.repos.creator_channels.get_info(creator_channel.id)
+
+        # 0 -> no overwrites
+        # 1 -> overwrites from creator
+        # 2 -> overwrites from category
+        category = get_child_category(self.bot, creator_channel, db_creator_channel_info)
+        if db_creator_channel_info.child_overwrites == 2 and category:
+            source_ids = {creator_channel.id, category.id}
+            overwrites = category.overwrites
+        elif db_creator_channel_info.child_overwrites in (1, 2):
+            source_ids = {creator_channel.id}
+            overwrites = creator_channel.overwrites
+        else:
+            source_ids = {creator_channel.id}
+            overwrites = {}
+        overwrites[self.bot.user] = bot_overwrite()
+
+        default_role = None
+        if db_creator_channel_info.default_role_id is not None:
+            default_role = creator_channel.guild.get_role(db_creator_channel_info.default_role_id)
+        if default_role is None:
+            default_role = creator_channel.guild.default_role
+
+        template = CreatorTemplate(creator_channel.guild.id, source_ids, overwrites, default_role)
+        self.templates[creator_channel.id] = template
+        return template
+
+    def for_new_channel(self, creator_channel, db_creator_channel_info, member):
+        """
+        Returns the overwrites for a new temp channel owned by member.
+        """
+        overwrites = dict(self.get(creator_channel, db_creator_channel_info).overwrites)
+        overwrites[member] = owner_overwrite()
+        return overwrites
+
+    def default_role(self, creator_id, guild):
+        """
+        Returns the role lock/hide/public changes apply to for a creator's temp channels.
+        """
+        creator_channel = guild.get_channel(creator_id)
+        if creator_channel is not None:
+            return self.get(creator_channel).default_role
+
+        # Creator deleted while its temp channels live on, nothing to cache against
+        db_creator_channel_info = self.bot.repos.creator_channels.get_info(creator_id)
+        if db_creator_channel_info is not None and db_creator_channel_info.default_role_id is not None:
+            return guild.get_role(db_creator_channel_info.default_role_id) or guild.default_role
+        return guild.default_role
+
+    def invalidate(self, creator_id):
+        if self.templates.pop(creator_id, None) is not None:
+            TEMPLATES.inc(event="invalidated")
+
+    def invalidate_source(self, channel_id):
+        # A creator channel or category whose overwrites were copied
+        for creator_id in [creator_id for creator_id, template in self.templates.items() if channel_id in template.source_ids]:
+            self.invalidate(creator_id)
+
+    def invalidate_guild(self, guild_id):
+        for creator_id in [creator_id for creator_id, template in self.templates.items() if template.guild_id == guild_id]:
+            self.invalidate(creator_id)
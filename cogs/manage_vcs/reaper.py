@@ -0,0 +1,123 @@
+import asyncio
+import time
+import discord
+from bot.metrics import metrics
+from bot.logging import log_context
+from bot.rest_scheduler import NORMAL
+
+REAPED = metrics.counter("reaper_channels_total", "Temp channels handled by the reaper, by outcome")
+
+
+# - Deletes empty temp channels and forgets temp channels that no longer exist
+# - Emptiness is decided from cached voice states so guilds never need to be chunked
+# - Deletes run with bounded parallelism, grouped by guild so one slow guild does not hold up the others
+# - Channels holding a lease (eg. just created and the user is still being moved in) are never reaped
+# - Use: bot.TempChannelReaper.grant_lease(channel_id) right after creating a channel
+class TempChannelReaper:
+    def __init__(self, bot):
+        self.bot = bot
+
+        self.leases = {}  # channel_id - monotonic time the lease expires
+
+        # Default length of a lease. Long enough to cover a slow move_to
+        self.lease_seconds = 30.0
+
+        # Maximum number of guilds being reaped at once
+        self.max_guild_concurrency = 4
+
+        # Maximum number of deletes in flight within a single guild
+        self.max_deletes_per_guild = 2
+
+    def grant_lease(self, channel_id, seconds=None):
+        self.leases[channel_id] = time.monotonic() + (seconds if seconds is not None else self.lease_seconds)
+
+    def release_lease(self, channel_id):
+        self.leases.pop(channel_id, None)
+
+    def has_lease(self, channel_id):
+        expires = self.leases.get(channel_id)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            self.leases.pop(channel_id, None)
+            return False
+        return True
+
+    async def run(self):
+        """
+        Runs one reaping pass over all temp channels.
+        Returns a dict with counts of what was done.
+        """
+        start = time.perf_counter()
+        stats = {"forgotten": 0, "leased": 0, "deleted": 0, "failed": 0}
+
+        # Group empty channels by guild and forget channels that no longer exist
+        empty_by_guild = {}  # guild_id - [channel]
+        for channel_id in self.bot.repos.temp_channels.get_ids():
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                self.bot.logger.debug(f"Removing unfound/deleted temp channel {channel_id} from database", extra={"channel_id": channel_id})
+                self.bot.repos.temp_channels.remove(channel_id)
+                stats["forgotten"] += 1
+                continue
+
+            if channel.voice_states:
+                continue
+
+            if self.has_lease(channel.id):
+                stats["leased"] += 1
+                continue
+
+            empty_by_guild.setdefault(channel.guild.id, []).append(channel)
+
+        results = await self.delete_channels(empty_by_guild)
+        stats["deleted"] = results["deleted"]
+        stats["failed"] = results["failed"]
+
+        for outcome in ("forgotten", "leased", "deleted", "failed"):
+            REAPED.inc(stats[outcome], outcome=outcome)
+
+        stats["duration"] = round(time.perf_counter() - start, 4)
+        self.bot.logger.debug(f"Empty temp channel reap completed {stats}")
+        return stats
+
+    async def delete_channels(self, channels_by_guild, deleted_ids=None):
+        """
+        Deletes temp channels and removes them from the database.
+        channels_by_guild: dict of guild_id - list of channels
+        deleted_ids: optional set the ids of channels deleted (or already gone) are added to
+        """
+        results = {"deleted": 0, "failed": 0}
+        guild_semaphore = asyncio.Semaphore(self.max_guild_concurrency)
+
+        async def delete(channel, channel_semaphore):
+            async with channel_semaphore:
+                # Re-check as a user may have joined while waiting for a slot
+                if channel.voice_states or self.has_lease(channel.id):
+                    return
+                try:
+                    self.bot.logger.debug(f"Deleting empty temp channel \'{channel.name}\'", extra=log_context(channel))
+                    async with self.bot.RestScheduler.slot(channel.guild.id, NORMAL):
+                        await channel.delete()
+                except discord.NotFound:
+                    pass
+                except Exception as e:
+                    results["failed"] += 1
+                    self.bot.logger.debug(f"Failed to delete empty temp channel {channel.id}, handled. {e}", extra=log_context(channel))
+                    return
+                self.bot.repos.temp_channels.remove(channel.id)
+                results["deleted"] += 1
+                if deleted_ids is not None:
+                    deleted_ids.add(channel.id)
+
+        async def reap_guild(channels):
+            channel_semaphore = asyncio.Semaphore(self.max_deletes_per_guild)
+            await asyncio.gather(*(delete(channel, channel_semaphore) for channel in channels))
+
+        # Each guild's deletes run in its actor so they can't overlap a create or leave in that guild
+        async def queue_guild(guild_id, channels):
+            async with guild_semaphore:
+                await self.bot.GuildActors.run(guild_id, "reap", reap_guild, channels)
+
+        await asyncio.gather(*(queue_guild(guild_id, channels) for guild_id, channels in channels_by_guild.items()))
+        return results
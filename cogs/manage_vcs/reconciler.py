@@ -0,0 +1,141 @@
+import asyncio
+import time
+from cogs.control_vc.embeds import ChannelInfoEmbed
+from cogs.control_vc.embed_updates import update_info_embed, embed_fingerprint
+from cogs.manage_vcs.create_name import create_temp_channel_name
+from bot.metrics import metrics
+from bot.logging import log_context
+
+RECONCILED = metrics.counter("reconciler_channels_total", "Temp channels checked by the reconciler, by outcome")
+
+
+class ChannelSnapshot:
+    def __init__(self, fingerprint=None, embed_inputs=None):
+        self.fingerprint = fingerprint  # Fingerprint of the info embed last sent
+        self.embed_inputs = embed_inputs  # (title, owner id, state, user limit) that embed was built from
+
+
+# - Replaces the old global sweep which renamed and edited the control message of every temp channel every 90 seconds
+# - Keeps the desired state last applied to each channel and compares it to what is observed in the cache
+# - Only channels that drifted are acted on. Their work is spread over the interval with bounded concurrency
+# - Event driven updates (update_info_embed) record into the same cache
+# - The info embed is only rebuilt when what it shows has changed, and the first pass after a restart only edits
+#   control messages that really differ, see update_info_embed
+# - Use: stats = await bot.TempChannelReconciler.run()
+class TempChannelReconciler:
+    def __init__(self, bot):
+        self.bot = bot
+
+        self.snapshots = {}  # channel_id - ChannelSnapshot()
+
+        # Maximum number of drifted channels being fixed at once
+        self.max_concurrency = 5
+
+        # Portion of the interval that drifted channel work is spread across
+        self.spread_seconds = 60.0
+
+        # Stats of the most recent run, see run()
+        self.last_stats = {}
+
+    def record_embed(self, channel_id, embed):
+        snapshot = self.snapshots.setdefault(channel_id, ChannelSnapshot())
+        snapshot.fingerprint = embed_fingerprint(embed)
+        snapshot.embed_inputs = None  # Unknown, the next pass rebuilds the embed once to compare
+
+    def forget(self, channel_id):
+        self.snapshots.pop(channel_id, None)
+
+    def _check(self, temp_channel, db_temp_channel_info):
+        """
+        Compares cached desired state with observed state for a single channel.
+        Returns (rename_to, embed, embed_inputs) where rename_to and embed may be None if they have not drifted.
+        """
+        snapshot = self.snapshots.setdefault(temp_channel.id, ChannelSnapshot())
+
+        # Rendered every pass as it is cheap and local, and activities, the creator's template and the
+        # owner's nickname can all change without any event reaching the reconciler
+        name = create_temp_channel_name(self.bot, temp_channel, db_temp_channel_info=db_temp_channel_info)
+
+        rename_to = None
+        if not db_temp_channel_info.is_renamed and temp_channel.voice_states:  # If empty it is going to be deleted, ignore
+            if temp_channel.name != name:
+                rename_to = name
+
+        # Building the embed reads the database, so it is skipped while nothing it shows has changed
+        title = temp_channel.name if db_temp_channel_info.is_renamed else name
+        embed_inputs = (title, db_temp_channel_info.owner_id, db_temp_channel_info.channel_state, temp_channel.user_limit)
+        if snapshot.fingerprint is not None and snapshot.embed_inputs == embed_inputs:
+            return rename_to, None, embed_inputs
+
+        embed = ChannelInfoEmbed(self.bot, temp_channel, title=title)
+        if embed_fingerprint(embed) == snapshot.fingerprint:
+            snapshot.embed_inputs = embed_inputs
+            embed = None
+
+        return rename_to, embed, embed_inputs
+
+    async def run(self):
+        """
+        Runs one reconciliation pass over all temp channels.
+        Returns a dict of drift statistics for the run.
+        """
+        start = time.perf_counter()
+        stats = {"checked": 0, "missing": 0, "in_sync": 0, "name_drift": 0, "embed_drift": 0, "errors": 0}
+
+        # Name update will reflect the db, so we fix it first
+        self.bot.repos.temp_channels.fix_count()
+
+        temp_channel_ids = self.bot.repos.temp_channels.get_ids()
+
+        # Drop cached state of channels no longer tracked
+        for channel_id in set(self.snapshots) - set(temp_channel_ids):
+            self.forget(channel_id)
+
+        drifted = []
+        for temp_channel_id in temp_channel_ids:
+            temp_channel = self.bot.get_channel(temp_channel_id)
+            db_temp_channel_info = self.bot.repos.temp_channels.get_info(temp_channel_id)
+            if temp_channel is None or db_temp_channel_info is None or not db_temp_channel_info.creator_id:
+                stats["missing"] += 1
+                continue
+            stats["checked"] += 1
+
+            rename_to, embed, embed_inputs = self._check(temp_channel, db_temp_channel_info)
+            if rename_to is None and embed is None:
+                stats["in_sync"] += 1
+                continue
+            if rename_to is not None:
+                stats["name_drift"] += 1
+            if embed is not None:
+                stats["embed_drift"] += 1
+            drifted.append((temp_channel, rename_to, embed, embed_inputs))
+
+        # Spread the drifted channels evenly over the spread window
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        step = self.spread_seconds / len(drifted) if drifted else 0
+
+        async def fix(index, temp_channel, rename_to, embed, embed_inputs):
+            await asyncio.sleep(index * step)
+            async with semaphore:
+                try:
+                    if rename_to is not None:
+                        self.bot.logger.debug(f"Reconciler renaming drifted channel {temp_channel.name} to {rename_to}", extra=log_context(temp_channel))
+                        await self.bot.TempChannelRenamer.schedule(temp_channel, rename_to)
+                    if embed is not None:
+                        await update_info_embed(self.bot, temp_channel, embed=embed)
+                        snapshot = self.snapshots.get(temp_channel.id)
+                        if snapshot is not None:
+                            snapshot.embed_inputs = embed_inputs
+                except Exception as e:
+                    stats["errors"] += 1
+                    self.bot.logger.debug(f"Reconciler failed to fix channel {temp_channel.id}, handled. {e}", extra=log_context(temp_channel))
+
+        await asyncio.gather(*(fix(i, *item) for i, item in enumerate(drifted)))
+
+        for outcome in ("missing", "in_sync", "name_drift", "embed_drift", "errors"):
+            RECONCILED.inc(stats[outcome], outcome=outcome)
+
+        stats["duration"] = round(time.perf_counter() - start, 4)
+        self.last_stats = stats
+        self.bot.logger.debug(f"Temp channel reconcile completed {stats}")
+        return stats
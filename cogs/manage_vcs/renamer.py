@@ -1,6 +1,12 @@
 import asyncio
 import time
 import discord
+from bot.metrics import metrics
+from bot.logging import log_context
+from bot.rest_scheduler import COSMETIC
+from cogs.manage_vcs.desired_state import reconcile_channel
+
+RENAMES = metrics.counter("renames_total", "Channel renames processed by TempChannelRenamer, by result")
 
 
 # - This class fixes rate-limit renaming problems
@@ -24,6 +30,9 @@ class TempChannelRenamer:
         # Minimum safe time between renames (10 minutes)
         self.minimum_interval = 600.0
 
+        metrics.gauge("renamer_pending", "Channels waiting on TempChannelRenamer", func=lambda: len(self.pending_name))
+        metrics.gauge("renamer_workers", "Running TempChannelRenamer workers", func=lambda: len(self.rename_workers))
+
     async def schedule(self, channel: discord.abc.GuildChannel, new_name: str):
         """
         Request that a channel be renamed.
@@ -32,12 +41,12 @@ class TempChannelRenamer:
 
         # Create a queue for this channel if needed
         self.pending_name[channel.id] = new_name
-        self.bot.logger.debug(f"[RENAMER] Queued rename request for channel {channel.name} ({channel.id}): '{new_name}'.")
+        self.bot.logger.debug(f"[RENAMER] Queued rename request for channel {channel.name} ({channel.id}): '{new_name}'.", extra=log_context(channel))
 
         # Start a worker for this channel if none exists
         if (channel.id not in self.rename_workers or self.rename_workers[channel.id].done()):
             self.rename_workers[channel.id] = asyncio.create_task(self._worker(channel))
-            self.bot.logger.debug(f"[RENAMER] Started worker task for channel {channel.name} ({channel.id})")
+            self.bot.logger.debug(f"[RENAMER] Started worker task for channel {channel.name} ({channel.id})", extra=log_context(channel))
 
     async def _worker(self, channel):
         """
@@ -49,7 +58,7 @@ class TempChannelRenamer:
 
         while True:
             self.bot.logger.debug(
-                f"[RENAMER] Worker for channel {channel.name} ({channel.id}) received rename request '{new_name}'.")
+                f"[RENAMER] Worker for channel {channel.name} ({channel.id}) received rename request '{new_name}'.", extra=log_context(channel))
 
             # Small delay to collect multiple rapid rename requests
             await asyncio.sleep(1.0)
@@ -60,30 +69,32 @@ class TempChannelRenamer:
             time_remaining = self.minimum_interval - time_since_last
             if time_remaining > 0:
                 self.bot.logger.debug(
-                    f"[RENAMER] Channel {channel.name} ({channel.id}) must wait {time_remaining:.2f} seconds before renaming again.")
+                    f"[RENAMER] Channel {channel.name} ({channel.id}) must wait {time_remaining:.2f} seconds before renaming again.", extra=log_context(channel))
                 await asyncio.sleep(time_remaining)
 
             # Get new name which may have changed while waiting
             new_name = self.pending_name[channel.id]
 
-            self.bot.logger.debug(f"[RENAMER] Renaming channel {channel.name} ({channel.id}) to '{new_name}'.")
+            self.bot.logger.debug(f"[RENAMER] Renaming channel {channel.name} ({channel.id}) to '{new_name}'.", extra=log_context(channel))
 
         # Try to perform the rename
             try:
-                if channel.name != new_name:
-                    await channel.edit(name=new_name)
-                    self.bot.logger.debug(f"[RENAMER] Successfully renamed channel {channel.name} ({channel.id}) to '{new_name}'.")
+                if await reconcile_channel(self.bot, channel, name=new_name, priority=COSMETIC):
+                    RENAMES.inc(result="renamed")
+                    self.bot.logger.debug(f"[RENAMER] Successfully renamed channel {channel.name} ({channel.id}) to '{new_name}'.", extra=log_context(channel))
                     self.last_rename_time[channel.id] = time.time()
                 else:
-                    self.bot.logger.debug(f"[RENAMER] Channel {channel.name} ({channel.id}) is already named '{new_name}'.")
+                    self.bot.logger.debug(f"[RENAMER] Channel {channel.name} ({channel.id}) is already named '{new_name}'.", extra=log_context(channel))
+                    RENAMES.inc(result="unchanged")
                 new_name = None
 
             except discord.HTTPException as error:
                 if error.status == 429:
+                    RENAMES.inc(result="rate_limited")
                     # The library almost never throws this.
                     retry_seconds = getattr(error, "retry_after", 10)
                     self.bot.logger.warning(
-                        f"[RENAMER] Channel {channel.name} ({channel.id}) hit a rate limit. Retrying in {retry_seconds + 1} seconds.")
+                        f"[RENAMER] Channel {channel.name} ({channel.id}) hit a rate limit. Retrying in {retry_seconds + 1} seconds.", extra=log_context(channel))
                     await asyncio.sleep(retry_seconds + 1)
                     continue
                 else:
@@ -91,9 +102,17 @@ class TempChannelRenamer:
 
             # If there are no pending rename requests, exit the worker
             if new_name is None:
-                self.bot.logger.debug(f"[RENAMER] Worker has renamed {channel.name} ({channel.id}). Exiting.")
+                self.bot.logger.debug(f"[RENAMER] Worker has renamed {channel.name} ({channel.id}). Exiting.", extra=log_context(channel))
                 break
 
         # Cleanup after the worker finishes
         self.pending_name.pop(channel.id, None)
         self.rename_workers.pop(channel.id, None)
+
+    def forget(self, channel_id):
+        # Drops a pending rename of a channel the bot can no longer reach
+        worker = self.rename_workers.pop(channel_id, None)
+        if worker and not worker.done():
+            worker.cancel()
+        self.pending_name.pop(channel_id, None)
+        self.last_rename_time.pop(channel_id, None)
@@ -0,0 +1,214 @@
+import asyncio
+import math
+import time
+import discord
+from cogs.manage_vcs.lifecycle import get_child_category
+from cogs.manage_vcs.overwrite_templates import bot_overwrite
+from bot.metrics import metrics
+from bot.rest_scheduler import COSMETIC, NORMAL
+
+SPARES = metrics.counter("spare_channels_total", "Spare channel pool events, by event")
+
+
+# - Keeps hidden, pre-created spare channels for creators with a warm pool so joining users skip create_voice_channel
+# - A creator's pool size (creator_channels.warm_pool_size) is the most spares it may hold, 0 is off
+# - The number actually kept follows that creator's recent join rate, idle creators keep none
+# - Spares are refilled in the background after one is taken and topped up or reaped by run() on a schedule
+# - Spares are not temp channels until taken, so the reaper and the reconciler never see them
+# - Use: channel = bot.SpareChannelPool.take(creator_channel, category, pool_size)
+class SpareChannelPool:
+    def __init__(self, bot):
+        self.bot = bot
+
+        self.spares = {}  # creator_id - [channel_id], oldest first
+        self.joins = {}  # creator_id - [monotonic time of each recent join]
+        self.refill_tasks = {}  # creator_id - asyncio.Task()
+
+        # Joins further back than this are forgotten, a creator with none is idle and its spares are reaped
+        self.rate_window = 600.0
+
+        # Roughly how long a used spare takes to be replaced. Spares are kept for the joins expected in this time
+        self.refill_seconds = 60.0
+
+    def load(self):
+        """
+        Adopts spares left from the last run, forgetting any whose channel no longer exists.
+        Returns the number of rows forgotten.
+        """
+        self.spares.clear()
+        missing = []
+        for guild_id, channel_id, creator_id in self.bot.repos.spare_channels.get_all():
+            guild = self.bot.get_guild(guild_id)
+            if guild is None or (not guild.unavailable and guild.get_channel(channel_id) is None):
+                missing.append(channel_id)
+                continue
+            self.spares.setdefault(creator_id, []).append(channel_id)
+        self.bot.repos.spare_channels.remove_many(missing)
+        return len(missing)
+
+    def record_join(self, creator_id):
+        now = time.monotonic()
+        joins = self.joins.setdefault(creator_id, [])
+        joins.append(now)
+        while joins and joins[0] < now - self.rate_window:
+            joins.pop(0)
+
+    def target_size(self, creator_id, pool_size):
+        """
+        Number of spares worth keeping for a creator: its expected joins within refill_seconds, at least one
+        while it is active and never more than pool_size.
+        """
+        now = time.monotonic()
+        joins = [joined for joined in self.joins.get(creator_id, []) if joined >= now - self.rate_window]
+        self.joins[creator_id] = joins
+        if not joins or pool_size <= 0:
+            return 0
+        rate = len(joins) / self.rate_window
+        return min(pool_size, max(1, math.ceil(rate * self.refill_seconds)))
+
+    def take(self, creator_channel, category, pool_size):
+        """
+        Returns a spare channel for this creator, or None if it has none ready.
+        The spare is removed from the pool and a refill is started in the background.
+        """
+        if pool_size <= 0:
+            return None
+
+        spare = None
+        channel_ids = self.spares.get(creator_channel.id, [])
+        while channel_ids and spare is None:
+            channel_id = channel_ids.pop()
+            channel = self.bot.get_channel(channel_id)
+            # Spares in an old category (creator settings changed) or that someone got into are not handed out
+            if channel is None or channel.voice_states or channel.category != category:
+                if channel is not None:
+                    self.bot.loop.create_task(self._delete(channel))
+                else:
+                    self.bot.repos.spare_channels.remove(channel_id)
+                continue
+            spare = channel
+
+        if spare is None:
+            SPARES.inc(event="miss")
+        else:
+            SPARES.inc(event="hit")
+            self.bot.repos.spare_channels.remove(spare.id)
+        self.refill(creator_channel, pool_size)
+        return spare
+
+    def refill(self, creator_channel, pool_size):
+        # Only one refill per creator at a time
+        task = self.refill_tasks.get(creator_channel.id)
+        if task and not task.done():
+            return
+        self.refill_tasks[creator_channel.id] = self.bot.loop.create_task(self._refill(creator_channel, pool_size))
+
+    async def _refill(self, creator_channel, pool_size):
+        channel_ids = self.spares.setdefault(creator_channel.id, [])
+        missing = self.target_size(creator_channel.id, pool_size) - len(channel_ids)
+        if missing <= 0:
+            return
+
+        db_creator_channel_info = self.bot.repos.creator_channels.get_info(creator_channel.id)
+        if db_creator_channel_info is None:
+            return
+        category = get_child_category(self.bot, creator_channel, db_creator_channel_info)
+
+        # Hidden from everyone until taken, then finalized with the creator's real overwrites
+        overwrites = {
+            creator_channel.guild.default_role: discord.PermissionOverwrite(view_channel=False, connect=False),
+            self.bot.user: bot_overwrite(),
+        }
+
+        for _ in range(missing):
+            try:
+                async with self.bot.RestScheduler.slot(creator_channel.guild.id, COSMETIC):
+                    channel = await creator_channel.guild.create_voice_channel(
+                        name="⌛",
+                        category=category,
+                        overwrites=overwrites,
+                        position=creator_channel.position,
+                    )
+            except Exception as e:
+                self.bot.logger.debug(f"Failed to create spare channel for creator {creator_channel.id}, handled. {e}")
+                return
+            self.bot.repos.spare_channels.add(channel.guild.id, channel.id, creator_channel.id)
+            channel_ids.append(channel.id)
+            SPARES.inc(event="created")
+
+    async def discard(self, channel):
+        """
+        Deletes a taken spare that couldn't be finalized.
+        Returns True if the channel is gone.
+        """
+        try:
+            async with self.bot.RestScheduler.slot(channel.guild.id, NORMAL):
+                await channel.delete()
+        except discord.NotFound:
+            pass
+        except Exception as e:
+            self.bot.logger.debug(f"Failed to delete unfinalized spare channel {channel.id}, handled. {e}")
+            return False
+        SPARES.inc(event="discarded")
+        return True
+
+    async def _delete(self, channel):
+        self.bot.repos.spare_channels.remove(channel.id)
+        try:
+            async with self.bot.RestScheduler.slot(channel.guild.id, COSMETIC):
+                await channel.delete()
+            SPARES.inc(event="deleted")
+        except discord.NotFound:
+            pass
+        except Exception as e:
+            self.bot.logger.debug(f"Failed to delete spare channel {channel.id}, handled. {e}")
+
+    async def run(self):
+        """
+        Tops up active creators' pools and reaps spares of idle or removed creators.
+        Returns a dict with counts of what was done.
+        """
+        stats = {"refilled": 0, "reaped": 0}
+        pool_sizes = self.bot.repos.creator_channels.get_warm_pool_sizes()
+
+        for creator_id in list(self.spares):
+            pool_size = pool_sizes.get(creator_id, 0)
+            channel_ids = self.spares[creator_id]
+            excess = len(channel_ids) - self.target_size(creator_id, pool_size)
+            # Oldest spares are reaped first
+            while excess > 0 and channel_ids:
+                channel_id = channel_ids.pop(0)
+                channel = self.bot.get_channel(channel_id)
+                if channel is None:
+                    self.bot.repos.spare_channels.remove(channel_id)
+                elif not channel.voice_states:
+                    await self._delete(channel)
+                    stats["reaped"] += 1
+                excess -= 1
+            if not channel_ids:
+                self.spares.pop(creator_id, None)
+
+        for creator_id, pool_size in pool_sizes.items():
+            creator_channel = self.bot.get_channel(creator_id)
+            if creator_channel is None:
+                continue
+            if self.target_size(creator_id, pool_size) > len(self.spares.get(creator_id, [])):
+                self.refill(creator_channel, pool_size)
+                stats["refilled"] += 1
+
+        self.bot.logger.debug(f"Spare channel pool maintenance completed {stats}")
+        return stats
+
+    def forget(self, creator_id):
+        # Drops a creator's pool without deleting its channels, eg. the bot left the guild
+        task = self.refill_tasks.pop(creator_id, None)
+        if task and not task.done():
+            task.cancel()
+        self.spares.pop(creator_id, None)
+        self.joins.pop(creator_id, None)
+
+    async def close(self):
+        tasks = [task for task in self.refill_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -16,6 +16,25 @@ class ManageVcsCog(commands.Cog):
     async def on_presence_update(self, before: discord.Member, after: discord.Member):
         await handle_presence_update(self.bot, before, after)
 
+    # Creator overwrite templates copied from a channel or referencing a role are rebuilt on next use
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if before.overwrites != after.overwrites or getattr(before, "category_id", None) != getattr(after, "category_id", None):
+            self.bot.OverwriteTemplates.invalidate_source(after.id)
+            self.bot.OverwriteTemplates.invalidate(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.bot.OverwriteTemplates.invalidate_source(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        self.bot.OverwriteTemplates.invalidate_guild(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.bot.OverwriteTemplates.invalidate_guild(role.guild.id)
+
 
 def setup(bot):
     bot.add_cog(ManageVcsCog(bot))
@@ -190,5 +190,6 @@ class LogsModal(discord.ui.DesignerModal):
 
         self._save_log_channel(interaction.guild_id, embed)
         self._save_log_events(interaction.guild_id, embed)
+        self.bot.GuildLogService.invalidate(interaction.guild_id)
 
         await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=60)
@@ -54,10 +54,44 @@ class SettingsMenuCog(commands.Cog):
         )
     ):
         self.bot.repos.guild_settings.edit(ctx.guild_id, profanity_filter=mode)
+        stats = self.bot.ProfanityFilter.stats()
         await ctx.respond(
-            f"profanity filter set to `{mode}`"
+            f"profanity filter set to `{mode}`\n"
+            f"-# Profanity service `{stats['breaker_state']}`, cache hit rate `{stats['cache_hit_rate']:.0%}`"
         )
 
+    @settings.command(description="Keep hidden spare channels ready so users joining a busy creator are moved in faster")
+    async def warm_pool(
+        self,
+        ctx: discord.ApplicationContext,
+        creator: discord.Option(discord.VoiceChannel, description="The creator channel"),
+        size: discord.Option(int, min_value=0, max_value=5, description="Most spare channels to keep, 0 turns it off")
+    ):
+        if creator.id not in self.bot.repos.creator_channels.get_ids(guild_id=ctx.guild_id):
+            await ctx.respond(f"{creator.mention} is not a creator channel.", ephemeral=True)
+            return
+
+        self.bot.repos.creator_channels.edit(creator.id, warm_pool_size=size)
+        await ctx.respond(
+            f"warm pool for {creator.mention} set to `{size}`\n"
+            f"-# Spares are only kept while the creator is busy and are removed when it goes quiet"
+        )
+
+    @settings.command(description="Limit how many channels one user can create in a short time")
+    async def churn_limit(
+        self,
+        ctx: discord.ApplicationContext,
+        channels: discord.Option(int, min_value=0, max_value=50, description="Channels a user may create within the window, 0 is unlimited"),
+        seconds: discord.Option(int, min_value=10, max_value=3600, description="Length of the window in seconds", default=60)
+    ):
+        self.bot.repos.guild_settings.edit(ctx.guild_id, churn_limit=channels, churn_window=seconds)
+        self.bot.ChurnLimiter.invalidate(ctx.guild_id)
+        if channels:
+            message = f"churn limit set to `{channels}` channels per `{seconds}` seconds\n-# Users over the limit are moved back into their last channel or asked to wait"
+        else:
+            message = "churn limit turned `off`"
+        await ctx.respond(message)
+
 
 def setup(bot):
     bot.add_cog(SettingsMenuCog(bot))
@@ -6,3 +6,4 @@ ENV_PATH = ROOT / ".env"
 SETTINGS_PATH = ROOT / "settings.json"
 DEFAULT_SETTINGS_PATH = ROOT / "default_settings.json"
 DB_PATH = ROOT / "database.db"
+BACKUP_DIR = ROOT / "backups"
@@ -3,6 +3,15 @@ class CreatorChannelsRepository:  # bot.repos.creator_channels
     def __init__(self, db, repos):
         self.db = db
         self.repos = repos
+        self.listeners = []  # func(channel_id) called after a creator channel is added, edited or removed
+
+    def add_listener(self, func):
+        self.listeners.append(func)
+
+    def _changed(self, channel_ids):
+        for func in self.listeners:
+            for channel_id in channel_ids:
+                func(channel_id)
 
     def get_ids(self, guild_id: int = None, child_category_id: int = None):
         """
@@ -29,6 +38,13 @@ class CreatorChannelsRepository:  # bot.repos.creator_channels
         rows = self.db.cursor.fetchall()
         return [row[0] for row in rows]
 
+    def get_guild_channel_ids(self):
+        """
+        Returns a list of (guild_id, channel_id) for every creator channel.
+        """
+        self.db.cursor.execute("SELECT guild_id, channel_id FROM creator_channels")
+        return self.db.cursor.fetchall()
+
     def edit(
             self,
             channel_id: int,
@@ -36,7 +52,8 @@ class CreatorChannelsRepository:  # bot.repos.creator_channels
             user_limit: int = None,
             child_category_id: int = None,
             child_overwrites: int = None,
-            default_role_id: int = None
+            default_role_id: int = None,
+            warm_pool_size: int = None
     ):
         """
         Update a creator channel's attributes in the database.
@@ -67,6 +84,10 @@ class CreatorChannelsRepository:  # bot.repos.creator_channels
             fields.append("default_role_id = ?")
             values.append(default_role_id)
 
+        if warm_pool_size is not None:
+            fields.append("warm_pool_size = ?")
+            values.append(warm_pool_size)
+
         if not fields:
             # Nothing to update
             return False
@@ -82,12 +103,14 @@ class CreatorChannelsRepository:  # bot.repos.creator_channels
 
         self.db.cursor.execute(query, tuple(values))
         self.db.connection.commit()
+        updated = self.db.cursor.rowcount > 0
+        self._changed([channel_id])
 
-        return self.db.cursor.rowcount > 0  # Returns True if a row was updated
+        return updated  # Returns True if a row was updated
 
     def get_info(self, channel_id):
         self.db.cursor.execute("""
-            SELECT guild_id, channel_id, child_name, user_limit, child_category_id, child_overwrites, default_role_id
+            SELECT guild_id, channel_id, child_name, user_limit, child_category_id, child_overwrites, default_role_id, warm_pool_size
             FROM creator_channels
             WHERE channel_id = ?
         """, (channel_id,))
@@ -96,7 +119,7 @@ class CreatorChannelsRepository:  # bot.repos.creator_channels
             return None
 
         class CreatorInfo:
-            def __init__(self, guild_id, channel_id, child_name, user_limit, child_category_id, child_overwrites, default_role_id):
+            def __init__(self, guild_id, channel_id, child_name, user_limit, child_category_id, child_overwrites, default_role_id, warm_pool_size):
                 self.guild_id = guild_id
                 self.channel_id = channel_id
                 self.child_name = child_name
@@ -104,8 +127,16 @@ class CreatorChannelsRepository:  # bot.repos.creator_channels
                 self.child_category_id = child_category_id
                 self.child_overwrites = child_overwrites
                 self.default_role_id = default_role_id
+                self.warm_pool_size = warm_pool_size or 0  # Maximum spare channels kept, 0 is off
         return CreatorInfo(*row)
 
+    def get_warm_pool_sizes(self):
+        """
+        Returns a dict of channel_id - warm_pool_size for every creator channel with a warm pool.
+        """
+        self.db.cursor.execute("SELECT channel_id, warm_pool_size FROM creator_channels WHERE warm_pool_size > 0")
+        return dict(self.db.cursor.fetchall())
+
     def add(self, guild_id, channel_id, child_name, user_limit, child_category_id, child_overwrites, default_role_id):
         """
         Insert or replace a creator channel record into creator_channels.
@@ -116,6 +147,7 @@ class CreatorChannelsRepository:  # bot.repos.creator_channels
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (guild_id, channel_id, child_name, user_limit, child_category_id, child_overwrites, default_role_id))
         self.db.connection.commit()
+        self._changed([channel_id])
 
     def remove(self, channel_id):
         """
@@ -126,3 +158,36 @@ class CreatorChannelsRepository:  # bot.repos.creator_channels
             (channel_id,)
         )
         self.db.connection.commit()
+        self._changed([channel_id])
+
+    def remove_many(self, channel_ids):
+        """
+        Remove many creator channel records in a single transaction.
+        """
+        self.db.cursor.executemany(
+            "DELETE FROM creator_channels WHERE channel_id = ?",
+            [(channel_id,) for channel_id in channel_ids]
+        )
+        self.db.connection.commit()
+        self._changed(channel_ids)
+
+    def get_guild_ids(self):
+        """
+        Returns the set of guild_id values that have creator channels.
+        """
+        self.db.cursor.execute("SELECT DISTINCT guild_id FROM creator_channels")
+        return {row[0] for row in self.db.cursor.fetchall()}
+
+    def remove_guilds(self, guild_ids):
+        """
+        Remove every creator channel record of these guilds in a single transaction.
+        """
+        channel_ids = []
+        for guild_id in guild_ids:
+            channel_ids.extend(self.get_ids(guild_id=guild_id))
+        self.db.cursor.executemany(
+            "DELETE FROM creator_channels WHERE guild_id = ?",
+            [(guild_id,) for guild_id in guild_ids]
+        )
+        self.db.connection.commit()
+        self._changed(channel_ids)
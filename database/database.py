@@ -1,13 +1,81 @@
+import re
 import sqlite3
+import time
 from config.paths import DB_PATH
+from bot.metrics import metrics
+
+QUERY_SECONDS = metrics.histogram(
+    "db_query_seconds", "Time taken by SQLite statements, by statement type and table",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+COMMIT_SECONDS = metrics.histogram(
+    "db_commit_seconds", "Time taken by SQLite commits",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+TABLE_PATTERN = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+(\w+)", re.IGNORECASE)
+
+
+class TimedCursor:
+    """
+    Wraps a sqlite3 cursor so every statement made by the repositories is timed.
+    Only used when metrics are enabled.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._labels = {}  # sql - labels, statements are reused so this stays small
+
+    def _labels_for(self, sql):
+        labels = self._labels.get(sql)
+        if labels is None:
+            table = TABLE_PATTERN.search(sql)
+            labels = {"op": sql.split(None, 1)[0].lower(), "table": table.group(1) if table else ""}
+            self._labels[sql] = labels
+        return labels
+
+    def execute(self, sql, params=()):
+        start = time.perf_counter()
+        result = self._cursor.execute(sql, params)
+        QUERY_SECONDS.observe(time.perf_counter() - start, **self._labels_for(sql))
+        return result
+
+    def executemany(self, sql, params):
+        start = time.perf_counter()
+        result = self._cursor.executemany(sql, params)
+        QUERY_SECONDS.observe(time.perf_counter() - start, **self._labels_for(sql))
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class TimedConnection:
+    def __init__(self, connection):
+        self._connection = connection
+
+    def commit(self):
+        start = time.perf_counter()
+        self._connection.commit()
+        COMMIT_SECONDS.observe(time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
 
 
 class Database:
     def __init__(self):
         self.connection = sqlite3.connect(DB_PATH)
         self.cursor = self.connection.cursor()
+        # Lets pages freed by deleted rows be returned to the filesystem a few at a time, see database/maintenance.py
+        # Takes effect straight away on a new database, an existing one is converted by DatabaseMaintenance.optimize()
+        self.cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
         self._ensure_tables()
 
+        # Wrapped after setup so only the repositories' statements are timed
+        if metrics.enabled:
+            self.connection = TimedConnection(self.connection)
+            self.cursor = TimedCursor(self.cursor)
+
     def _ensure_tables(self):
         tables = {
             "temp_channels": {
@@ -27,6 +95,23 @@ class Database:
                 "child_category_id": "INTEGER",
                 "child_overwrites": "INTEGER",
                 "default_role_id": "INTEGER",
+                "warm_pool_size": "INTEGER",
+            },
+            "spare_channels": {
+                "guild_id": "INTEGER",
+                "channel_id": "INTEGER",
+                "creator_id": "INTEGER",
+            },
+            "lifecycle_journal": {
+                "op_id": "INTEGER PRIMARY KEY",
+                "guild_id": "INTEGER",
+                "creator_id": "INTEGER",
+                "member_id": "INTEGER",
+                "channel_id": "INTEGER",
+                "step": "TEXT",
+                "planned_name": "TEXT",
+                "category_id": "INTEGER",
+                "started": "REAL",
             },
             "guild_settings": {
                 "guild_id": "INTEGER",
@@ -36,6 +121,8 @@ class Database:
                 "enabled_controls": "TEXT",
                 "control_options": "TEXT",
                 "enabled_log_events": "TEXT",
+                "churn_limit": "INTEGER",
+                "churn_window": "INTEGER",
             },
         }
 
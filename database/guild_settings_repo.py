@@ -8,6 +8,8 @@ defaults = {
     "profanity_filter": "alert & block",
     "enabled_log_events": ["channel_create", "channel_rename", "channel_remove", "profanity_block"],
     "control_options": ["dropdown", "labels"],
+    "churn_limit": 0,  # Channels a user may create within churn_window seconds, 0 is unlimited
+    "churn_window": 60,
 }
 
 
@@ -61,6 +63,8 @@ class GuildSettingsRepository:  # bot.repos.guild_settings
             profanity_filter: str = None,
             enabled_log_events: list = None,
             control_options: list = None,
+            churn_limit: int = None,
+            churn_window: int = None,
         ):
         # Check if the server has an entry
         self.db.cursor.execute("""
@@ -101,6 +105,14 @@ class GuildSettingsRepository:  # bot.repos.guild_settings
             fields.append("control_options = ?")
             values.append(json.dumps(control_options))
 
+        if churn_limit is not None:
+            fields.append("churn_limit = ?")
+            values.append(churn_limit)
+
+        if churn_window is not None:
+            fields.append("churn_window = ?")
+            values.append(churn_window)
+
         if not fields:
             # Nothing to update
             return False
@@ -163,6 +175,22 @@ class GuildSettingsRepository:  # bot.repos.guild_settings
             "profanity_filter": profanity_filter,
         }
 
+    def get_churn_limit(self, guild_id):
+        self.db.cursor.execute("""
+                            SELECT churn_limit, churn_window
+                            FROM guild_settings
+                            WHERE guild_id = ?
+                            """, (guild_id,))
+        row = self.db.cursor.fetchone()
+
+        # Default settings, also for guilds saved before these columns existed
+        churn_limit, churn_window = row if row else (None, None)
+        return {
+            "guild_id": guild_id,
+            "churn_limit": defaults["churn_limit"] if churn_limit is None else churn_limit,
+            "churn_window": defaults["churn_window"] if churn_window is None else churn_window,
+        }
+
     def add(self, guild_id):
         logs_channel_id = defaults["logs_channel_id"]
         enabled_controls_json = json.dumps(defaults["enabled_controls"])
@@ -177,3 +205,20 @@ class GuildSettingsRepository:  # bot.repos.guild_settings
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (guild_id, logs_channel_id, enabled_controls_json, bool(mention_owner_bool), profanity_filter, enabled_log_events_json, control_options_json))
         self.db.connection.commit()
+
+    def get_guild_ids(self):
+        """
+        Returns the set of guild_id values that have saved settings.
+        """
+        self.db.cursor.execute("SELECT DISTINCT guild_id FROM guild_settings")
+        return {row[0] for row in self.db.cursor.fetchall()}
+
+    def remove_guilds(self, guild_ids):
+        """
+        Remove the settings of these guilds in a single transaction.
+        """
+        self.db.cursor.executemany(
+            "DELETE FROM guild_settings WHERE guild_id = ?",
+            [(guild_id,) for guild_id in guild_ids]
+        )
+        self.db.connection.commit()
@@ -0,0 +1,90 @@
+import time
+
+CREATING = "creating"  # Intent recorded, the channel may or may not exist yet
+ADDED = "added"  # Channel created and tracked in temp_channels, the control message may not have been sent
+
+
+# A creation costs one extra commit, begin(). Completed entries are deleted by finish_later() in the transaction of
+# the next begin() or flush(), one left behind by a crash only makes startup check for a control message it already has
+class LifecycleJournalRepository:  # bot.repos.lifecycle_journal
+    def __init__(self, db, repos):
+        self.db = db
+        self.repos = repos
+
+        self.finished = []  # op_ids of completed creations whose entries are deleted with the next write
+
+    def begin(self, guild_id, creator_id, member_id, planned_name, category_id, channel_id=None):
+        """
+        Records a temp channel creation before any REST call is made.
+        Entries of completed creations are deleted in the same transaction.
+        channel_id: known up front when a spare channel is used
+        Returns the op_id used for the later steps.
+        """
+        self._delete_finished()
+        self.db.cursor.execute("""
+            INSERT INTO lifecycle_journal
+            (guild_id, creator_id, member_id, channel_id, step, planned_name, category_id, started)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (guild_id, creator_id, member_id, channel_id, CREATING, planned_name, category_id, time.time()))
+        self.db.connection.commit()
+        return self.db.cursor.lastrowid
+
+    def set_added(self, op_id, channel_id):
+        """
+        Only called by temp_channels.add(journal_op_id=...), which commits it in the same transaction as the row.
+        """
+        self.db.cursor.execute("""UPDATE lifecycle_journal SET channel_id = ?, step = ? WHERE op_id = ?""", (channel_id, ADDED, op_id,))
+
+    def finish(self, op_id):
+        """
+        Deletes the entry of an abandoned creation straight away.
+        """
+        self.db.cursor.execute("""DELETE FROM lifecycle_journal WHERE op_id = ?""", (op_id,))
+        self.db.connection.commit()
+
+    def finish_later(self, op_id):
+        """
+        Marks a completed creation, its entry is deleted with the next begin() or flush().
+        """
+        self.finished.append(op_id)
+
+    def flush(self):
+        # Run on shutdown so completed entries aren't left for the next startup
+        if self.finished:
+            self._delete_finished()
+            self.db.connection.commit()
+
+    def _delete_finished(self):
+        if self.finished:
+            self.db.cursor.executemany("DELETE FROM lifecycle_journal WHERE op_id = ?", [(op_id,) for op_id in self.finished])
+            self.finished.clear()
+
+    def get_all(self):
+        """
+        Returns a list of (op_id, guild_id, creator_id, member_id, channel_id, step, planned_name, category_id, started).
+        """
+        self.db.cursor.execute("""
+            SELECT op_id, guild_id, creator_id, member_id, channel_id, step, planned_name, category_id, started
+            FROM lifecycle_journal
+        """)
+        return self.db.cursor.fetchall()
+
+    def remove_many(self, op_ids):
+        """
+        Remove many journal entries in a single transaction.
+        """
+        self.db.cursor.executemany(
+            "DELETE FROM lifecycle_journal WHERE op_id = ?",
+            [(op_id,) for op_id in op_ids]
+        )
+        self.db.connection.commit()
+
+    def remove_guilds(self, guild_ids):
+        """
+        Remove every journal entry of these guilds in a single transaction.
+        """
+        self.db.cursor.executemany(
+            "DELETE FROM lifecycle_journal WHERE guild_id = ?",
+            [(guild_id,) for guild_id in guild_ids]
+        )
+        self.db.connection.commit()
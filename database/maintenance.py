@@ -0,0 +1,137 @@
+import asyncio
+import datetime
+import sqlite3
+import time
+from config.paths import DB_PATH, BACKUP_DIR
+from bot.metrics import metrics
+
+STEP_SECONDS = metrics.histogram(
+    "db_maintenance_seconds", "Time taken by each database maintenance step",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0),
+)
+
+BACKUP_PREFIX = "database-"
+
+
+# - Online backups, incremental vacuum and ANALYZE of database.db
+# - A database made before auto_vacuum = INCREMENTAL is converted with one full VACUUM on the first optimize()
+# - All work runs in a thread on its own connection, so the event loop and the repositories' connection carry on
+# - Backups copy a few pages at a time with SQLite's backup API, writes made meanwhile are picked up before it ends
+# - Backups are written to backups/ under a temporary name and renamed once complete, the newest backups_kept are kept
+# - Each step's duration is logged, returned and observed in db_maintenance_seconds
+# - Settings in settings.json "database_maintenance"
+# - Use: await bot.DatabaseMaintenance.backup(), await bot.DatabaseMaintenance.optimize()
+class DatabaseMaintenance:
+    def __init__(self, bot):
+        self.bot = bot
+        settings = self.bot.settings.get("database_maintenance", {})
+
+        self.backup_interval = settings.get("backup_interval_hours", 24) * 3600
+        self.backups_kept = settings.get("backups_kept", 7)
+        self.pages_per_step = settings.get("pages_per_step", 64)
+        self.step_sleep = settings.get("step_sleep_seconds", 0.005)
+
+        self.lock = asyncio.Lock()  # One maintenance job at a time
+        self.incremental = False  # Set once database.db is known to use auto_vacuum = INCREMENTAL
+
+    def _connect(self):
+        # Waits on the repositories' connection rather than failing while it holds a write lock
+        return sqlite3.connect(DB_PATH, timeout=30.0)
+
+    async def backup(self):
+        """
+        Writes a rotated backup of the database.
+        Returns a dict of each step's duration and the backup's path.
+        """
+        async with self.lock:
+            timings = {}
+            path = await self._timed(timings, "backup", self._backup)
+            removed = await self._timed(timings, "rotate", self._rotate)
+            self.bot.logger.info(f"Database backup completed {path.name} rotated={len(removed)} {timings}")
+            return {"path": str(path), "rotated": len(removed), **timings}
+
+    async def optimize(self):
+        """
+        Returns free pages to the filesystem and refreshes the query planner's statistics.
+        Returns a dict of each step's duration and the pages freed.
+        """
+        async with self.lock:
+            timings = {}
+            if not self.incremental:
+                self.incremental = await self._timed(timings, "convert", self._ensure_incremental_vacuum)
+            pages_freed = await self._timed(timings, "incremental_vacuum", self._incremental_vacuum)
+            await self._timed(timings, "analyze", self._analyze)
+            self.bot.logger.info(f"Database optimize completed pages_freed={pages_freed} {timings}")
+            return {"pages_freed": pages_freed, **timings}
+
+    async def _timed(self, timings, step, func):
+        start = time.perf_counter()
+        result = await asyncio.to_thread(func)
+        duration = time.perf_counter() - start
+        STEP_SECONDS.observe(duration, step=step)
+        timings[step] = round(duration, 4)
+        return result
+
+    # Blocking, run in a thread
+
+    def _backup(self):
+        BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d-%H%M%S")
+        path = BACKUP_DIR / f"{BACKUP_PREFIX}{stamp}.db"
+        partial = path.with_suffix(".db.partial")
+
+        source = self._connect()
+        destination = sqlite3.connect(partial)
+        try:
+            source.backup(destination, pages=self.pages_per_step, sleep=self.step_sleep)
+        finally:
+            destination.close()
+            source.close()
+        partial.replace(path)
+        return path
+
+    def _rotate(self):
+        # Names sort by time, so the oldest come first
+        backups = sorted(BACKUP_DIR.glob(f"{BACKUP_PREFIX}*.db"))
+        removed = backups[:max(len(backups) - self.backups_kept, 0)]
+        for path in removed:
+            path.unlink(missing_ok=True)
+        for path in BACKUP_DIR.glob(f"{BACKUP_PREFIX}*.db.partial"):  # Left by a backup that was cut off
+            path.unlink(missing_ok=True)
+        return removed
+
+    def _ensure_incremental_vacuum(self):
+        connection = self._connect()
+        try:
+            if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                # The mode only takes effect on an existing database after a full VACUUM, which rewrites the file
+                # and holds the write lock until done. Only ever needed once
+                connection.executescript("PRAGMA auto_vacuum = INCREMENTAL; VACUUM;")
+                self.bot.logger.info("Converted database to auto_vacuum = INCREMENTAL")
+            return True
+        finally:
+            connection.close()
+
+    def _incremental_vacuum(self):
+        connection = self._connect()
+        try:
+            free_before = connection.execute("PRAGMA freelist_count").fetchone()[0]
+            # Each freed page is a step of the statement. execute() only takes the first step, executescript() runs
+            # it to completion. Done a few pages at a time so the write lock is never held for long
+            free = free_before
+            while free > 0:
+                connection.executescript(f"PRAGMA incremental_vacuum({self.pages_per_step});")
+                remaining = connection.execute("PRAGMA freelist_count").fetchone()[0]
+                if remaining >= free:
+                    break
+                free = remaining
+            return free_before - free
+        finally:
+            connection.close()
+
+    def _analyze(self):
+        connection = self._connect()
+        try:
+            connection.executescript("ANALYZE;")
+        finally:
+            connection.close()
@@ -1,6 +1,8 @@
 from database.creator_channels_repo import CreatorChannelsRepository
 from database.guild_settings_repo import GuildSettingsRepository
 from database.temp_channels_repo import TempChannelsRepository
+from database.spare_channels_repo import SpareChannelsRepository
+from database.lifecycle_journal_repo import LifecycleJournalRepository
 
 
 class Repositories:
@@ -8,3 +10,5 @@ class Repositories:
         self.guild_settings = GuildSettingsRepository(database, repos=self)
         self.creator_channels = CreatorChannelsRepository(database, repos=self)
         self.temp_channels = TempChannelsRepository(database, repos=self)
+        self.spare_channels = SpareChannelsRepository(database, repos=self)
+        self.lifecycle_journal = LifecycleJournalRepository(database, repos=self)
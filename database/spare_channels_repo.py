@@ -0,0 +1,59 @@
+class SpareChannelsRepository:  # bot.repos.spare_channels
+    def __init__(self, db, repos):
+        self.db = db
+        self.repos = repos
+
+    def add(self, guild_id, channel_id, creator_id):
+        """
+        Insert or replace a spare channel record.
+        """
+        self.db.cursor.execute("""
+            INSERT OR REPLACE INTO spare_channels
+            (guild_id, channel_id, creator_id)
+            VALUES (?, ?, ?)
+        """, (guild_id, channel_id, creator_id))
+        self.db.connection.commit()
+
+    def remove(self, channel_id):
+        """
+        Remove a spare channel record by its channel_id.
+        """
+        self.db.cursor.execute(
+            "DELETE FROM spare_channels WHERE channel_id = ?",
+            (channel_id,)
+        )
+        self.db.connection.commit()
+
+    def remove_many(self, channel_ids):
+        """
+        Remove many spare channel records in a single transaction.
+        """
+        self.db.cursor.executemany(
+            "DELETE FROM spare_channels WHERE channel_id = ?",
+            [(channel_id,) for channel_id in channel_ids]
+        )
+        self.db.connection.commit()
+
+    def get_all(self):
+        """
+        Returns a list of (guild_id, channel_id, creator_id) for every spare channel.
+        """
+        self.db.cursor.execute("SELECT guild_id, channel_id, creator_id FROM spare_channels")
+        return self.db.cursor.fetchall()
+
+    def get_guild_ids(self):
+        """
+        Returns the set of guild_id values that have spare channels.
+        """
+        self.db.cursor.execute("SELECT DISTINCT guild_id FROM spare_channels")
+        return {row[0] for row in self.db.cursor.fetchall()}
+
+    def remove_guilds(self, guild_ids):
+        """
+        Remove every spare channel record of these guilds in a single transaction.
+        """
+        self.db.cursor.executemany(
+            "DELETE FROM spare_channels WHERE guild_id = ?",
+            [(guild_id,) for guild_id in guild_ids]
+        )
+        self.db.connection.commit()
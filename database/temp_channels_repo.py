@@ -18,6 +18,7 @@ class TempChannelsRepository:  # bot.repos.temp_channels
 
     def change_state(self, channel_id, state_value):
         self.db.cursor.execute("""UPDATE temp_channels SET channel_state = ? WHERE channel_id = ?""", (state_value, channel_id,))
+        self.db.connection.commit()
 
     def get_info(self, channel_id):
         self.db.cursor.execute("""
@@ -118,15 +119,28 @@ class TempChannelsRepository:  # bot.repos.temp_channels
         )
         self.db.connection.commit()
 
-    def add(self, guild_id, channel_id, creator_id, owner_id, channel_state, number, is_renamed):
+    def remove_many(self, channel_ids):
+        """
+        Remove many temporary channel records in a single transaction.
+        """
+        self.db.cursor.executemany(
+            "DELETE FROM temp_channels WHERE channel_id = ?",
+            [(channel_id,) for channel_id in channel_ids]
+        )
+        self.db.connection.commit()
+
+    def add(self, guild_id, channel_id, creator_id, owner_id, channel_state, number, is_renamed, journal_op_id=None):
         """
         Insert or replace a temporary channel record.
+        journal_op_id: lifecycle journal entry of the creation, marked added in the same transaction
         """
         self.db.cursor.execute("""
                 INSERT OR REPLACE INTO temp_channels 
                 (guild_id, channel_id, creator_id, owner_id, channel_state, number, is_renamed)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (guild_id, channel_id, creator_id, owner_id, channel_state, number, is_renamed))
+        if journal_op_id is not None:
+            self.repos.lifecycle_journal.set_added(journal_op_id, channel_id)
         self.db.connection.commit()
 
     def get_ids(self, guild_id: int = None):
@@ -143,6 +157,13 @@ class TempChannelsRepository:  # bot.repos.temp_channels
         rows = self.db.cursor.fetchall()
         return [row[0] for row in rows]
 
+    def get_guild_channel_ids(self):
+        """
+        Returns a list of (guild_id, channel_id) for every temp channel.
+        """
+        self.db.cursor.execute("SELECT guild_id, channel_id FROM temp_channels")
+        return self.db.cursor.fetchall()
+
     def get_counts(self, creator_id):
         """
         Returns a list of all number values from all temp channels of a creator.
@@ -153,3 +174,20 @@ class TempChannelsRepository:  # bot.repos.temp_channels
         )
         rows = self.db.cursor.fetchall()
         return [row[0] for row in rows]
+
+    def get_guild_ids(self):
+        """
+        Returns the set of guild_id values that have temporary channels.
+        """
+        self.db.cursor.execute("SELECT DISTINCT guild_id FROM temp_channels")
+        return {row[0] for row in self.db.cursor.fetchall()}
+
+    def remove_guilds(self, guild_ids):
+        """
+        Remove every temporary channel record of these guilds in a single transaction.
+        """
+        self.db.cursor.executemany(
+            "DELETE FROM temp_channels WHERE guild_id = ?",
+            [(guild_id,) for guild_id in guild_ids]
+        )
+        self.db.connection.commit()
@@ -0,0 +1,75 @@
+import pathlib
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from cogs.control_vc.profanity_matcher import ProfanityMatcher, Verdict, load_words
+
+
+# Measures ProfanityMatcher throughput over synthetic channel names
+# - Names mix everyday words, game titles, usernames, leetspeak, fancy unicode and a few listed words
+# - Reports the automaton build time, time per name, names per second and the share of each verdict.
+#   CLEAN and UNSURE names go on to the remote API, PROFANE ones are blocked locally
+# - Run from the repository root: python scripts/bench_profanity_matcher.py [names]
+
+NAMES = 100_000
+SEED = 1234
+
+WORDS = [
+    "gaming", "chill", "lounge", "squad", "room", "music", "study", "chat", "hangout", "vibes", "duo", "trio",
+    "ranked", "casual", "late", "night", "team", "party", "afk", "coffee", "homework", "movie", "stream", "class",
+    "assemble", "classic", "scunthorpe", "cockpit", "analysis", "therapist", "bass", "shitake", "grape",
+]
+GAMES = ["Minecraft", "Valorant", "Fortnite", "Apex Legends", "League", "Overwatch", "Rocket League", "CS2", "Among Us"]
+USERS = ["Alex", "Sam", "xXShadowXx", "Dick", "Jordan", "kai_99", "Mia", "Zed", "Noor", "Luca"]
+FANCY = str.maketrans("abcdefghijklmnopqrstuvwxyz", "𝕒𝕓𝕔𝕕𝕖𝕗𝕘𝕙𝕚𝕛𝕜𝕝𝕞𝕟𝕠𝕡𝕢𝕣𝕤𝕥𝕦𝕧𝕨𝕩𝕪𝕫")
+LEET = str.maketrans("aeiost", "431057")
+
+
+def make_names(count, rng):
+    listed = sorted(load_words("profanity_words.txt") | load_words("profanity_ambiguous.txt"))
+    names = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.35:
+            name = f"{rng.choice(USERS)}'s {rng.choice(WORDS)}"
+        elif roll < 0.6:
+            name = f"{rng.choice(GAMES)} {rng.choice(WORDS)} #{rng.randint(1, 20)}"
+        elif roll < 0.8:
+            name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        elif roll < 0.9:
+            name = " ".join(rng.choice(WORDS) for _ in range(2)).translate(LEET)
+        elif roll < 0.97:
+            name = " ".join(rng.choice(WORDS) for _ in range(2)).translate(FANCY)
+        else:
+            name = f"{rng.choice(WORDS)} {rng.choice(listed)}"
+        names.append(name)
+    return names
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else NAMES
+    names = make_names(count, random.Random(SEED))
+
+    start = time.perf_counter()
+    matcher = ProfanityMatcher()
+    build = time.perf_counter() - start
+
+    verdicts = Counter()
+    start = time.perf_counter()
+    for name in names:
+        verdicts[matcher.check(name)[0]] += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"Python {sys.version.split()[0]}, {count} names, automaton of {len(matcher.automaton.goto)} states")
+    print(f"Build {build * 1000:.1f}ms")
+    print(f"Check {elapsed / count * 1e6:.1f}us/name, {count / elapsed:,.0f} names/s")
+    for verdict in Verdict:
+        print(f"{verdict.name:<8} {verdicts[verdict] / count:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import logging
+from cogs.control_vc.profanity import CircuitBreaker
+
+
+# CircuitBreaker state machine: closed - open - half open - closed or open again
+# reset_timeout=0 lets the breaker go half open straight away, a long one keeps it open
+
+
+def make_breaker(reset_timeout):
+    return CircuitBreaker(logging.getLogger("tests"), failure_threshold=3, reset_timeout=reset_timeout)
+
+
+def test_opens_after_threshold_failures_in_a_row():
+    breaker = make_breaker(reset_timeout=60.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = make_breaker(reset_timeout=60.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 1
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = make_breaker(reset_timeout=0.0)
+    for _ in range(3):
+        breaker.record_failure()
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # Only the one trial until it is resolved
+
+
+def test_half_open_trial_success_closes():
+    breaker = make_breaker(reset_timeout=0.0)
+    for _ in range(3):
+        breaker.record_failure()
+    breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_half_open_trial_failure_reopens():
+    breaker = make_breaker(reset_timeout=60.0)
+    for _ in range(3):
+        breaker.record_failure()
+    breaker.reset_timeout = 0.0
+    breaker.allow()
+    breaker.reset_timeout = 60.0
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
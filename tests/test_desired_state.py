@@ -0,0 +1,70 @@
+from discord import PermissionOverwrite
+from cogs.manage_vcs.desired_state import diff_channel
+
+
+# diff_channel() against stand-in channels, only differences from the cached channel may be sent
+
+
+class StandInTarget:
+    def __init__(self, id):
+        self.id = id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, StandInTarget) and other.id == self.id
+
+
+class StandInChannel:
+    def __init__(self, name="Alex's channel", user_limit=0, overwrites=None):
+        self.name = name
+        self.user_limit = user_limit
+        self.overwrites = overwrites or {}
+
+
+EVERYONE = StandInTarget(1)
+OWNER = StandInTarget(2)
+HIDDEN = PermissionOverwrite(view_channel=False)
+OWNER_OVERWRITE = PermissionOverwrite(connect=True, manage_channels=True)
+
+
+def test_matching_state_is_no_change():
+    channel = StandInChannel(user_limit=5, overwrites={EVERYONE: HIDDEN})
+    edit, changed = diff_channel(channel, name="Alex's channel", user_limit="5", overwrites={StandInTarget(1): PermissionOverwrite(view_channel=False)})
+    assert edit == {}
+    assert changed == {}
+
+
+def test_name_and_limit_changes():
+    channel = StandInChannel(user_limit=5)
+    edit, changed = diff_channel(channel, name="Renamed", user_limit=2)
+    assert edit == {"name": "Renamed", "user_limit": 2}
+    assert changed == {}
+
+
+def test_overwrite_update_is_applied_on_top_of_the_current_overwrites():
+    channel = StandInChannel(overwrites={OWNER: OWNER_OVERWRITE})
+    edit, changed = diff_channel(channel, overwrite_updates={EVERYONE: HIDDEN})
+    assert changed == {EVERYONE: HIDDEN}
+    assert edit == {"overwrites": {OWNER: OWNER_OVERWRITE, EVERYONE: HIDDEN}}
+
+
+def test_none_or_empty_overwrite_update_removes_it():
+    channel = StandInChannel(overwrites={OWNER: OWNER_OVERWRITE, EVERYONE: HIDDEN})
+    for removal in (None, PermissionOverwrite()):
+        edit, changed = diff_channel(channel, overwrite_updates={EVERYONE: removal})
+        assert changed == {EVERYONE: None}
+        assert edit == {"overwrites": {OWNER: OWNER_OVERWRITE}}
+
+
+def test_removing_a_missing_overwrite_is_no_change():
+    channel = StandInChannel(overwrites={OWNER: OWNER_OVERWRITE})
+    assert diff_channel(channel, overwrite_updates={EVERYONE: None}) == ({}, {})
+
+
+def test_full_overwrite_map_drops_targets_not_in_it():
+    channel = StandInChannel(overwrites={OWNER: OWNER_OVERWRITE, EVERYONE: HIDDEN})
+    edit, changed = diff_channel(channel, name="Renamed", overwrites={EVERYONE: HIDDEN})
+    assert changed == {OWNER: None}
+    assert edit == {"name": "Renamed", "overwrites": {EVERYONE: HIDDEN}}
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import database.database
+from bot.tasks import startup
+from database.database import Database
+from database.repositories import Repositories
+
+
+# recover_lifecycle_journal() with a temporary database and stand-in guilds, channels and reaper
+
+
+GUILD_ID = 10
+CREATOR_ID = 20
+MEMBER_ID = 30
+CATEGORY_ID = 40
+
+
+class StandInChannel:
+    def __init__(self, id, name="Alex's channel", members=(), created_at=None, bot_message=False):
+        self.id = id
+        self.name = name
+        self.category_id = CATEGORY_ID
+        self.created_at = created_at or datetime.now(timezone.utc)
+        self.members = list(members)
+        self.voice_states = {member.id: object() for member in self.members}
+        self.messages = [SimpleNamespace(author=SimpleNamespace(id=1))] if bot_message else []
+
+    async def history(self, limit, oldest_first):
+        for message in self.messages[:limit]:
+            yield message
+
+
+class StandInGuild:
+    def __init__(self, channels=(), members=(), unavailable=False):
+        self.id = GUILD_ID
+        self.unavailable = unavailable
+        self.channels = {channel.id: channel for channel in channels}
+        self.members = {member.id: member for member in members}
+
+    @property
+    def voice_channels(self):
+        return list(self.channels.values())
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_member(self, member_id):
+        return self.members.get(member_id)
+
+
+class StandInReaper:
+    def __init__(self, failing=()):
+        self.failing = set(failing)  # Channel ids whose delete fails
+        self.deleted = []
+
+    async def delete_channels(self, channels_by_guild, deleted_ids=None):
+        results = {"deleted": 0, "failed": 0}
+        for channels in channels_by_guild.values():
+            for channel in channels:
+                if channel.id in self.failing:
+                    results["failed"] += 1
+                    continue
+                self.deleted.append(channel.id)
+                results["deleted"] += 1
+                deleted_ids.add(channel.id)
+        return results
+
+
+class StandInControlView:
+    sent = []
+
+    def __init__(self, bot, channel):
+        self.channel = channel
+
+    async def send_initial_message(self, owner):
+        self.sent.append((self.channel.id, owner.id))
+
+
+def make_bot(tmp_path, monkeypatch, guild, reaper=None):
+    monkeypatch.setattr(database.database, "DB_PATH", tmp_path / "database.db")
+    monkeypatch.setattr(startup, "ControlView", StandInControlView)
+    StandInControlView.sent = []
+    db = Database()
+    return SimpleNamespace(
+        db=db,
+        repos=Repositories(db),
+        user=SimpleNamespace(id=1),
+        logger=logging.getLogger("tests"),
+        TempChannelReaper=reaper or StandInReaper(),
+        get_guild=lambda guild_id: guild if guild and guild_id == guild.id else None,
+    )
+
+
+def recover(bot):
+    summary = {"journal_entries": 0, "journal_completed": 0, "journal_adopted": 0, "journal_rolled_back": 0}
+    asyncio.run(startup.recover_lifecycle_journal(bot, summary))
+    return summary
+
+
+def begin(bot, planned_name="Alex's channel", channel_id=None):
+    return bot.repos.lifecycle_journal.begin(GUILD_ID, CREATOR_ID, MEMBER_ID, planned_name, CATEGORY_ID, channel_id=channel_id)
+
+
+def test_tracked_creation_gets_its_missing_control_message(tmp_path, monkeypatch):
+    member = SimpleNamespace(id=MEMBER_ID)
+    channel = StandInChannel(100, members=[member])
+    bot = make_bot(tmp_path, monkeypatch, StandInGuild([channel], [member]))
+    op_id = begin(bot)
+    bot.repos.temp_channels.add(GUILD_ID, 100, CREATOR_ID, MEMBER_ID, 0, 1, False, journal_op_id=op_id)
+
+    summary = recover(bot)
+
+    assert summary["journal_completed"] == 1
+    assert StandInControlView.sent == [(100, MEMBER_ID)]
+    assert bot.repos.lifecycle_journal.get_all() == []
+
+
+def test_control_message_already_sent_is_not_sent_again(tmp_path, monkeypatch):
+    member = SimpleNamespace(id=MEMBER_ID)
+    channel = StandInChannel(100, members=[member], bot_message=True)
+    bot = make_bot(tmp_path, monkeypatch, StandInGuild([channel], [member]))
+    op_id = begin(bot)
+    bot.repos.temp_channels.add(GUILD_ID, 100, CREATOR_ID, MEMBER_ID, 0, 1, False, journal_op_id=op_id)
+
+    summary = recover(bot)
+
+    assert summary["journal_completed"] == 0
+    assert StandInControlView.sent == []
+    assert bot.repos.lifecycle_journal.get_all() == []
+
+
+def test_empty_untracked_channel_found_by_planned_name_is_rolled_back(tmp_path, monkeypatch):
+    orphan = StandInChannel(100)
+    older = StandInChannel(101, created_at=datetime.fromtimestamp(time.time() - 3600, timezone.utc))
+    other_name = StandInChannel(102, name="Someone else's channel")
+    reaper = StandInReaper()
+    bot = make_bot(tmp_path, monkeypatch, StandInGuild([orphan, older, other_name]), reaper)
+    begin(bot)
+
+    summary = recover(bot)
+
+    assert reaper.deleted == [100]
+    assert summary["journal_rolled_back"] == 1
+    assert bot.repos.lifecycle_journal.get_all() == []
+
+
+def test_occupied_untracked_channel_is_adopted(tmp_path, monkeypatch):
+    member = SimpleNamespace(id=MEMBER_ID)
+    channel = StandInChannel(100, members=[member])
+    bot = make_bot(tmp_path, monkeypatch, StandInGuild([channel], [member]))
+    begin(bot, channel_id=100)  # A spare, known by id
+
+    summary = recover(bot)
+
+    assert summary["journal_adopted"] == 1
+    assert bot.repos.temp_channels.get_ids() == [100]
+    assert bot.repos.temp_channels.get_info(100).owner_id == MEMBER_ID
+    assert StandInControlView.sent == [(100, MEMBER_ID)]
+    assert bot.repos.lifecycle_journal.get_all() == []
+
+
+def test_entry_is_kept_while_its_orphan_survives(tmp_path, monkeypatch):
+    orphan = StandInChannel(100)
+    bot = make_bot(tmp_path, monkeypatch, StandInGuild([orphan]), StandInReaper(failing=[100]))
+    op_id = begin(bot)
+
+    summary = recover(bot)
+
+    assert summary["journal_rolled_back"] == 0
+    assert [entry[0] for entry in bot.repos.lifecycle_journal.get_all()] == [op_id]
+
+
+def test_entries_of_unavailable_guilds_are_kept_and_left_guilds_cleared(tmp_path, monkeypatch):
+    bot = make_bot(tmp_path, monkeypatch, StandInGuild(unavailable=True))
+    op_id = begin(bot)
+    recover(bot)
+    assert [entry[0] for entry in bot.repos.lifecycle_journal.get_all()] == [op_id]
+
+    bot.get_guild = lambda guild_id: None
+    recover(bot)
+    assert bot.repos.lifecycle_journal.get_all() == []
+
+
+def test_finished_entries_are_deleted_with_the_next_begin(tmp_path, monkeypatch):
+    bot = make_bot(tmp_path, monkeypatch, StandInGuild())
+    first = begin(bot)
+    bot.repos.lifecycle_journal.finish_later(first)
+    assert [entry[0] for entry in bot.repos.lifecycle_journal.get_all()] == [first]
+
+    second = begin(bot)
+    assert [entry[0] for entry in bot.repos.lifecycle_journal.get_all()] == [second]
+
+    bot.repos.lifecycle_journal.finish_later(second)
+    bot.repos.lifecycle_journal.flush()
+    assert bot.repos.lifecycle_journal.get_all() == []
@@ -0,0 +1,53 @@
+from cogs.control_vc.profanity_matcher import ProfanityMatcher, Verdict, normalize
+
+
+# ProfanityMatcher verdicts against small word lists, and the shipped lists for names it must not block
+
+
+def make_matcher():
+    return ProfanityMatcher(words={"fuck", "shit", "cunt"}, allowed={"scunthorpe"}, ambiguous={"dick", "nazi"})
+
+
+def test_normalize_folds_fancy_letters_accents_and_leetspeak():
+    assert normalize("𝕗𝕒𝕟𝕔𝕪 Ünïcödé") == "fancy unicode"
+    assert normalize("sh1t--p0st") == "shit post"
+
+
+def test_whole_listed_words_are_profane():
+    matcher = make_matcher()
+    assert matcher.check("fuck off") == (Verdict.PROFANE, "fuck")
+    assert matcher.check("SH1T posting") == (Verdict.PROFANE, "shit")
+    assert matcher.check("𝕗𝕦𝕔𝕜") == (Verdict.PROFANE, "fuck")
+    assert matcher.check("fuuuuck") == (Verdict.PROFANE, "fuck")
+
+
+def test_spelt_out_words_are_profane():
+    matcher = make_matcher()
+    assert matcher.check("f u c k") == (Verdict.PROFANE, "fuck")
+    assert matcher.check("s.h.i.t room") == (Verdict.PROFANE, "shit")
+
+
+def test_ambiguous_words_are_left_to_the_api():
+    matcher = make_matcher()
+    assert matcher.check("Dick's room") == (Verdict.UNSURE, "dick")
+    assert matcher.check("Nazi Zombies") == (Verdict.UNSURE, "nazi")
+    assert matcher.check("d i c k") == (Verdict.UNSURE, "dick")
+
+
+def test_words_hidden_inside_other_words_are_unsure():
+    matcher = make_matcher()
+    assert matcher.check("shitake risotto") == (Verdict.UNSURE, "shit")
+    assert matcher.check("the fuuuckers") == (Verdict.UNSURE, "fuck")
+
+
+def test_allowed_and_unlisted_names_are_clean():
+    matcher = make_matcher()
+    assert matcher.check("Scunthorpe United") == (Verdict.CLEAN, None)
+    assert matcher.check("Minecraft squad #3") == (Verdict.CLEAN, None)
+    assert matcher.check("") == (Verdict.CLEAN, None)
+
+
+def test_shipped_lists_never_block_ambiguous_names():
+    matcher = ProfanityMatcher()
+    for name in ("Dick's room", "Nazi Zombies", "Scunthorpe", "classic assemble", "cockpit"):
+        assert matcher.check(name)[0] != Verdict.PROFANE, name
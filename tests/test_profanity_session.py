@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import time
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from bot.http_session import HttpSession
+from cogs.control_vc import profanity
+
+
+# check_profanity() and the shared HttpSession against a local stand-in for the profanity API
+
+
+class StandInBot:
+    def __init__(self):
+        self.logger = logging.getLogger("tests")
+        self.HttpSession = HttpSession(self)
+
+
+class StandInAPI:
+    def __init__(self, delay=0.0):
+        self.delay = delay  # Seconds each response is held back
+        self.connections = set()  # Client (host, port) of every connection that made a request
+
+    async def handle(self, request):
+        self.connections.add(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(self.delay)
+        return web.json_response({"isProfanity": False, "score": 0.0})
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post("/", self.handle)
+        return app
+
+
+async def run_against(api, monkeypatch, func):
+    server = TestServer(api.app())
+    await server.start_server()
+    monkeypatch.setattr(profanity, "PROFANITY_API_URL", str(server.make_url("/")))
+    bot = StandInBot()
+    try:
+        return await func(bot)
+    finally:
+        await bot.HttpSession.close()
+        await server.close()
+
+
+def test_sequential_checks_reuse_one_connection(monkeypatch):
+    api = StandInAPI()
+
+    async def checks(bot):
+        return [await profanity.check_profanity(bot, "hello") for _ in range(20)]
+
+    results = asyncio.run(run_against(api, monkeypatch, checks))
+
+    assert all(result == {"isProfanity": False, "score": 0.0} for result in results)
+    assert len(api.connections) == 1
+
+
+def test_stalled_api_times_out_without_blocking_the_loop(monkeypatch):
+    api = StandInAPI(delay=2.0)
+
+    async def stalled_check(bot):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        result = await profanity.check_profanity(bot, "hello", timeout=0.5)
+        elapsed = time.perf_counter() - start
+        ticker_task.cancel()
+        return result, elapsed, ticks
+
+    result, elapsed, ticks = asyncio.run(run_against(api, monkeypatch, stalled_check))
+
+    assert result is None
+    assert elapsed < 1.5
+    assert ticks >= 20  # The loop kept running while the request waited
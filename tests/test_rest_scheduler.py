@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+from bot.rest_scheduler import CRITICAL, NORMAL, COSMETIC, RestScheduler
+
+
+# RestScheduler ordering: priority first, then weighted fair queuing between guilds
+
+
+def make_scheduler(**settings):
+    return RestScheduler(SimpleNamespace(settings={"rest_scheduler": settings}))
+
+
+async def grant_order(scheduler, calls):
+    """
+    Holds every slot, queues calls [(label, guild_id, priority)] in order, then releases.
+    Returns the labels in the order they were granted a slot.
+    """
+    order = []
+
+    async def call(label, guild_id, priority):
+        async with scheduler.slot(guild_id, priority):
+            order.append(label)
+            await asyncio.sleep(0)
+
+    for _ in range(scheduler.concurrency):
+        await scheduler.acquire(0, CRITICAL)
+    tasks = []
+    for label, guild_id, priority in calls:
+        tasks.append(asyncio.create_task(call(label, guild_id, priority)))
+        await asyncio.sleep(0)  # Let it queue before the next one
+    for _ in range(scheduler.concurrency):
+        scheduler.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_higher_priority_goes_first():
+    scheduler = make_scheduler(concurrency=1, critical_reserved=0)
+    calls = [("cosmetic", 1, COSMETIC), ("normal", 1, NORMAL), ("critical", 1, CRITICAL)]
+    assert asyncio.run(grant_order(scheduler, calls)) == ["critical", "normal", "cosmetic"]
+
+
+def test_a_burst_from_one_guild_does_not_starve_another():
+    scheduler = make_scheduler(concurrency=1, critical_reserved=0)
+    calls = [("a1", 1, NORMAL), ("a2", 1, NORMAL), ("a3", 1, NORMAL), ("b1", 2, NORMAL)]
+    assert asyncio.run(grant_order(scheduler, calls)) == ["a1", "b1", "a2", "a3"]
+
+
+def test_guild_weights_give_a_larger_share():
+    scheduler = make_scheduler(concurrency=1, critical_reserved=0, guild_weights={"2": 2})
+    calls = [("a1", 1, NORMAL), ("a2", 1, NORMAL), ("b1", 2, NORMAL), ("b2", 2, NORMAL), ("b3", 2, NORMAL)]
+    assert asyncio.run(grant_order(scheduler, calls)) == ["b1", "a1", "b2", "b3", "a2"]
+
+
+def test_reserved_slots_only_go_to_critical_calls():
+    scheduler = make_scheduler(concurrency=2, critical_reserved=1)
+
+    async def run():
+        await scheduler.acquire(1, NORMAL)
+        waiting = asyncio.create_task(scheduler.acquire(1, COSMETIC))
+        await asyncio.sleep(0)
+        queued = not waiting.done()
+
+        await scheduler.acquire(1, CRITICAL)  # Takes the reserved slot without queueing
+        running = scheduler.running
+
+        scheduler.release()
+        scheduler.release()
+        await waiting
+        return queued, running
+
+    assert asyncio.run(run()) == (True, 2)